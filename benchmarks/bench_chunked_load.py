@@ -0,0 +1,97 @@
+"""
+Solvra - Chunked loading benchmark
+Inflates train.csv and test.csv by resampling, then compares whole-file
+load + preprocess + save with the chunked path (preprocess_chunked) at a
+few chunk sizes: wall time and peak resident memory (each run in a fresh
+process), and checks both write identical preprocessed CSVs
+
+Run from the repository root:
+    python benchmarks/bench_chunked_load.py [factor]
+"""
+
+import io
+import sys
+import time
+import shutil
+import filecmp
+import resource
+import tempfile
+import contextlib
+import subprocess
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+
+
+def whole(data_dir: Path):
+    preprocessor = DataPreprocessor(data_dir=str(data_dir))
+    preprocessor.load_data()
+    preprocessor.preprocess_training_data()
+    preprocessor.preprocess_test_data()
+    preprocessor.save_preprocessed_data()
+
+
+def chunked(data_dir: Path, chunksize: int):
+    DataPreprocessor(data_dir=str(data_dir)).preprocess_chunked(chunksize)
+
+
+def measure(data_dir: Path, chunksize: int = 0):
+    """(seconds, peak RSS MB) of one run in a fresh interpreter; chunksize 0 = whole file"""
+    output = subprocess.run([sys.executable, __file__, "--run", str(data_dir), str(chunksize)],
+                            capture_output=True, text=True, check=True).stdout
+    elapsed, peak = output.split()
+    return float(elapsed), float(peak)
+
+
+def run_once(data_dir: Path, chunksize: int):
+    """Child side of measure(): time the run, report ru_maxrss (KB on Linux)"""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if chunksize:
+            chunked(data_dir, chunksize)
+        else:
+            whole(data_dir)
+    elapsed = time.perf_counter() - start
+    print(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)
+
+
+def main():
+    if sys.argv[1:2] == ["--run"]:
+        return run_once(Path(sys.argv[2]), int(sys.argv[3]))
+    factor = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    workdir = Path(tempfile.mkdtemp(prefix="solvra_chunks_"))
+    try:
+        rows = 0
+        for split in ("train", "test"):
+            df = pd.read_csv(ROOT / "data" / f"{split}.csv")
+            df = df.sample(n=len(df) * factor, replace=True, random_state=42)
+            df.to_csv(workdir / f"{split}.csv", index=False)
+            rows += len(df)
+        size_mb = sum((workdir / f"{split}.csv").stat().st_size for split in ("train", "test")) / 2**20
+        print(f"{rows:,} rows ({size_mb:.1f} MB of CSV)\n")
+
+        whole_dir = workdir / "whole"
+        whole_dir.mkdir()
+        for split in ("train", "test"):
+            shutil.copy(workdir / f"{split}.csv", whole_dir)
+
+        print(f"  {'mode':18} {'time':>8} {'peak memory':>12}  identical")
+        elapsed, peak = measure(whole_dir)
+        print(f"  {'whole file':18} {elapsed:>7.2f}s {peak:>9.1f} MB")
+        for chunksize in (1_000, 10_000, 100_000):
+            elapsed, peak = measure(workdir, chunksize)
+            identical = all(filecmp.cmp(whole_dir / f"{split}_preprocessed.csv",
+                                        workdir / f"{split}_preprocessed.csv", shallow=False)
+                            for split in ("train", "test"))
+            print(f"  {f'chunks of {chunksize:,}':18} {elapsed:>7.2f}s {peak:>9.1f} MB  {identical}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
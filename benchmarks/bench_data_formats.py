@@ -0,0 +1,63 @@
+"""
+Solvra - Data format load-time benchmark
+Writes the preprocessed training frame, inflated by resampling, as CSV,
+Parquet and Feather (uncompressed, memory-mapped on read) and times
+loading each back, with file sizes and whether the flag columns come
+back as bool
+
+Run from the repository root:
+    python benchmarks/bench_data_formats.py [rows]
+"""
+
+import io
+import sys
+import time
+import shutil
+import tempfile
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor, FLAG_COLUMNS
+from data_io import DATA_FORMATS, read_table, write_table
+
+
+def best_time(run, repeats: int = 5) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        train_df = preprocessor.preprocess_training_data()
+    df = train_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True)
+
+    workdir = Path(tempfile.mkdtemp(prefix="solvra_formats_"))
+    try:
+        print(f"{rows:,} preprocessed rows, best of 5\n")
+        print(f"  {'format':8} {'size':>9} {'write':>8} {'load':>8} {'vs csv':>7}  bool flags")
+        csv_load = None
+        for data_format, extension in DATA_FORMATS.items():
+            path = workdir / f"train_preprocessed{extension}"
+            write = best_time(lambda: write_table(df, path), repeats=1)
+            load = best_time(lambda: read_table(path))
+            csv_load = csv_load or load
+            loaded = read_table(path)
+            flags_bool = all(loaded[flag].dtype == bool for flag in FLAG_COLUMNS)
+            print(f"  {data_format:8} {path.stat().st_size / 2**20:>6.1f} MB {write:>7.2f}s {load:>7.3f}s "
+                  f"{csv_load / load:>6.1f}x  {flags_bool}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
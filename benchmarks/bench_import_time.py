@@ -0,0 +1,61 @@
+"""
+Solvra - Import time benchmark
+Measures the startup import cost of each entry point with
+`python -X importtime` in a fresh interpreter, and shows which heavy
+dependencies (pandas, sklearn, sympy, tqdm) each one pulls in
+
+Run from the repository root:
+    python benchmarks/bench_import_time.py [repeats]
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "src"
+
+# What each entry point imports before it can do any work
+ENTRY_POINTS = {
+    "solvra solve": "import solvra, reasoning_agent",
+    "reasoning_agent": "import reasoning_agent",
+    "solver": "import solver",
+    "main": "import main",
+}
+HEAVY = ("pandas", "sklearn", "sympy", "tqdm")
+
+
+def import_profile(statement: str):
+    """Total microseconds for `statement`, and cumulative microseconds per package it loads"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                            cwd=SRC, capture_output=True, text=True, check=True)
+    total, packages = 0, {}
+    for line in result.stderr.splitlines():
+        if line.count("|") != 2:
+            continue
+        _, cum, name = line.split("|")
+        if not cum.strip().isdigit():
+            continue  # Header line
+        if name == " " + name.strip():
+            total += int(cum)  # Imported directly by the statement
+        package = name.strip()
+        if "." not in package:
+            packages[package] = max(packages.get(package, 0), int(cum))
+    return total, packages
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print(f"Best of {repeats} fresh interpreters\n")
+    print(f"{'entry point':16} {'import':>10}  " + " ".join(f"{name:>8}" for name in HEAVY))
+    for label, statement in ENTRY_POINTS.items():
+        total, packages = min((import_profile(statement) for _ in range(repeats)),
+                              key=lambda profile: profile[0])
+        loaded = " ".join(f"{packages[name] / 1000:>6.0f}ms" if name in packages else f"{'-':>8}"
+                          for name in HEAVY)
+        print(f"{label:16} {total / 1000:>8.1f}ms  {loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Solvra - Keyword matching benchmark
+Compares one shared KeywordAutomaton pass against the per-call-site
+`any(word in text ...)` scans it replaced, on real statements and on
+statements repeated to synthesise long inputs
+
+Run from the repository root:
+    python benchmarks/bench_keywords.py [repeats]
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from keyword_matcher import KeywordAutomaton, PROBLEM_KEYWORDS, PROBLEM_VOCABULARIES
+
+
+def per_site_scan(text: str):
+    """Every category checked separately, the way each call site used to"""
+    return frozenset(name for name, words in PROBLEM_KEYWORDS.categories.items()
+                     if any(word in text for word in words))
+
+
+def time_per_text(scan, texts, repeats: int) -> float:
+    """Mean microseconds per text"""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for text in texts:
+            scan(text)
+    return (time.perf_counter() - start) / (repeats * len(texts)) * 1e6
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    frames = [pd.read_csv(ROOT / "data" / name) for name in ("train.csv", "test.csv")]
+    statements = [text.lower() for df in frames for text in df['problem_statement']]
+
+    # Same automaton with the long-text fallback disabled
+    automaton_only = KeywordAutomaton(PROBLEM_VOCABULARIES, long_text_threshold=sys.maxsize)
+
+    print(f"{len(PROBLEM_KEYWORDS.keywords)} keywords, {len(PROBLEM_KEYWORDS.categories)} categories\n")
+    print(f"{'length x':>8} {'avg chars':>10} {'per-site':>12} {'automaton':>12} {'shared':>12} {'speedup':>8}")
+    for scale in (1, 5, 20, 100):
+        texts = [' '.join([text] * scale) for text in statements]
+        assert all(PROBLEM_KEYWORDS.scan(text) == per_site_scan(text) for text in texts)
+
+        avg_chars = sum(len(text) for text in texts) / len(texts)
+        site_us = time_per_text(per_site_scan, texts, repeats)
+        auto_us = time_per_text(automaton_only.scan, texts, repeats)
+        shared_us = time_per_text(PROBLEM_KEYWORDS.scan, texts, repeats)
+        print(f"{scale:>8} {avg_chars:>10.0f} {site_us:>10.1f}us {auto_us:>10.1f}us "
+              f"{shared_us:>10.1f}us {site_us / shared_us:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
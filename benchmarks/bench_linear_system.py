@@ -0,0 +1,83 @@
+"""
+Solvra - Linear system benchmark
+Times MathSolver.solve_linear_system as it was (sympify + sympy.solve on
+every call) against LinearSystemEngine's NumPy path, with the parsed
+equation cache cold and warm, over thousands of random integer systems
+of 2-4 unknowns, and checks every answer matches sympy's
+
+Run from the repository root:
+    python benchmarks/bench_linear_system.py [systems]
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from linear_engine import LinearSystemEngine
+
+VARIABLES = ['x', 'y', 'z', 'w']
+
+
+def random_systems(count: int, seed: int = 42):
+    """(equations, variables) with unique integer solutions; a few extra consistent rows"""
+    rng = random.Random(seed)
+    systems = []
+    while len(systems) < count:
+        variables = VARIABLES[:rng.randint(2, 4)]
+        solution = [rng.randint(-20, 20) for _ in variables]
+        equations = []
+        for _ in range(len(variables) + rng.choice([0, 0, 0, 1])):
+            coeffs = [rng.randint(-9, 9) for _ in variables]
+            lhs = ' + '.join(f"{c}*{v}" for c, v in zip(coeffs, variables))
+            equations.append(f"{lhs} = {sum(c * s for c, s in zip(coeffs, solution))}")
+        systems.append((equations, variables))
+    return systems
+
+
+def sympy_solve(equations, variables):
+    """MathSolver.solve_linear_system before the NumPy path"""
+    import sympy as sp
+    try:
+        syms = sp.symbols(' '.join(variables))
+        eqs = []
+        for eq_str in equations:
+            left, right = eq_str.split('=')
+            eqs.append(sp.Eq(sp.sympify(left), sp.sympify(right)))
+        solution = sp.solve(eqs, syms)
+        return {str(var): float(val) for var, val in solution.items()}
+    except Exception:
+        return {}
+
+
+def run(solve, systems):
+    start = time.perf_counter()
+    results = [solve(equations, variables) for equations, variables in systems]
+    return time.perf_counter() - start, results
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    systems = random_systems(count)
+    sympy_solve(*systems[0])  # import sympy outside the timings
+
+    print(f"{count:,} systems of 2-4 unknowns\n")
+    print(f"  {'path':34} {'total':>10} {'per system':>12} {'speedup':>8}  identical")
+    base_time, expected = run(sympy_solve, systems)
+    print(f"  {'sympy (before)':34} {base_time:>9.2f}s {base_time / count * 1e6:>10.0f}us {1.0:>7.1f}x")
+
+    engine = LinearSystemEngine(cache_size=5 * count)  # up to 5 equations per system
+    for label in ("NumPy, cold equation cache", "NumPy, warm equation cache"):
+        elapsed, results = run(engine.solve, systems)
+        print(f"  {label:34} {elapsed:>9.3f}s {elapsed / count * 1e6:>10.1f}us "
+              f"{base_time / elapsed:>7.1f}x  {results == expected}")
+
+    stats = engine.stats()
+    print(f"\n  {stats['numeric_solves']} numeric solves, {stats['symbolic_solves']} sympy fallbacks, "
+          f"{stats['cache_hits']} parse cache hits")
+
+
+if __name__ == "__main__":
+    main()
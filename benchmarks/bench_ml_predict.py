@@ -0,0 +1,60 @@
+"""
+Solvra - ML prediction benchmark
+Times MLEnhancer.predict (one problem at a time) and predict_batch
+(one feature matrix and matrix product) against training sets inflated
+to different sizes, and checks both give identical results
+
+Run from the repository root:
+    python benchmarks/bench_ml_predict.py [problems]
+"""
+
+import io
+import sys
+import time
+import random
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+from ml_enhancer import MLEnhancer
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        train_df = preprocessor.preprocess_training_data()
+        test_df = preprocessor.preprocess_test_data()
+
+    problems = test_df.sample(n=count, replace=True, random_state=42).reset_index(drop=True)
+    records = problems.to_dict('records')
+    rng = random.Random(42)
+    bases = [rng.randint(1, 5) for _ in range(count)]
+
+    print(f"{count:,} problems\n")
+    print(f"{'train rows':>10} {'predict':>12} {'predict_batch':>14} {'speedup':>8}  identical")
+    for train_rows in (len(train_df), 10_000, 100_000):
+        train = train_df.sample(n=train_rows, replace=True, random_state=0) \
+            if train_rows != len(train_df) else train_df
+        enhancer = MLEnhancer()
+        with contextlib.redirect_stdout(io.StringIO()):
+            enhancer.train(train)
+
+        start = time.perf_counter()
+        scalar = [enhancer.predict(record, base) for record, base in zip(records, bases)]
+        scalar_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        batched = enhancer.predict_batch(problems, bases)
+        batch_time = time.perf_counter() - start
+
+        print(f"{train_rows:>10,} {scalar_time * 1e6 / count:>10.1f}us {batch_time * 1e6 / count:>12.1f}us "
+              f"{scalar_time / batch_time:>7.1f}x  {scalar == batched}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Solvra - ML enhancer startup benchmark
+Compares cold-starting the ML enhancer by retraining (load train.csv,
+preprocess, train) against loading a saved model, and checks both
+predict identically on the test set
+
+Run from the repository root:
+    python benchmarks/bench_ml_startup.py [repeats]
+"""
+
+import io
+import os
+import sys
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+from ml_enhancer import MLEnhancer
+
+
+def retrain() -> MLEnhancer:
+    """What every run did before: read, preprocess and train from scratch"""
+    preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+    preprocessor.load_train_data()
+    train_df = preprocessor.preprocess_training_data()
+    enhancer = MLEnhancer()
+    enhancer.train(train_df)
+    return enhancer
+
+
+def best_time(fn, repeats: int):
+    """Fastest of several runs, and the last result"""
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    model_path = os.path.join(tempfile.mkdtemp(), "ml_enhancer.npz")
+
+    train_time, trained = best_time(retrain, repeats)
+    trained.save(model_path)
+    load_time, loaded = best_time(lambda: MLEnhancer.load(model_path), repeats)
+
+    print(f"Saved model: {os.path.getsize(model_path):,} bytes\n")
+    print(f"  retrain (load + preprocess + train): {train_time * 1000:9.1f} ms")
+    print(f"  MLEnhancer.load:                     {load_time * 1000:9.1f} ms")
+    print(f"  speedup:                             {train_time / load_time:9.1f}x")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        test_df = preprocessor.preprocess_test_data()
+    problems = [test_df.iloc[i].to_dict() for i in range(len(test_df))]
+    identical = all(trained.predict(p, base) == loaded.predict(p, base)
+                    for p in problems for base in (None, 1, 2, 3))
+    print(f"  identical test predictions:          {identical}")
+
+
+if __name__ == "__main__":
+    main()
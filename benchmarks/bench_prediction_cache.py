@@ -0,0 +1,83 @@
+"""
+Solvra - Prediction cache benchmark
+Serves a workload of repeated test problems (seeded resampling, so most
+requests are re-submissions) through the warm InferenceEngine with no
+cache, a cold cache, a warm SQLite cache reopened as after a restart,
+and a warm in-memory cache, and checks every run gives the same answers
+
+Run from the repository root:
+    python benchmarks/bench_prediction_cache.py [requests]
+"""
+
+import io
+import sys
+import time
+import tempfile
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from server import InferenceEngine
+from prediction_cache import PredictionCache
+
+BATCH_SIZE = 64
+
+
+def serve(engine: InferenceEngine, records) -> tuple:
+    """Answer records in server-sized batches; returns (seconds, results)"""
+    results = []
+    start = time.perf_counter()
+    for offset in range(0, len(records), BATCH_SIZE):
+        results.extend(engine.predict_batch(records[offset:offset + BATCH_SIZE]))
+    return time.perf_counter() - start, results
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    test = pd.read_csv(ROOT / "data" / "test.csv")
+    records = test.sample(n=requests, replace=True, random_state=42).to_dict('records')
+    unique = len({record['problem_statement'] for record in records})
+
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        enhancer = InferenceEngine.warm(str(ROOT / "data")).ml_enhancer
+
+    print(f"{requests:,} requests over {unique} distinct problems, batches of {BATCH_SIZE}\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "predictions.sqlite")
+        baseline = None
+        base_time = None
+
+        def report(label: str, cache=None):
+            nonlocal baseline, base_time
+            engine = InferenceEngine(enhancer, prediction_cache=cache)
+            before = cache.stats() if cache is not None else None
+            elapsed, results = serve(engine, records)
+            baseline = baseline or results
+            base_time = base_time or elapsed
+            hits = ""
+            if cache is not None:
+                cache.flush()
+                stats = cache.stats()
+                hits = (f"{stats['memory_hits'] - before['memory_hits']:>6} memory "
+                        f"{stats['disk_hits'] - before['disk_hits']:>5} disk hits")
+            print(f"  {label:28} {elapsed * 1000:>9.1f}ms {elapsed / requests * 1e6:>8.1f}us/req "
+                  f"{base_time / elapsed:>6.1f}x  identical: {str(results == baseline):5} {hits}")
+
+        report("no cache")
+        cache = PredictionCache(path)
+        report("cold cache", cache)
+        cache.close()
+
+        # Reopened as after a restart: the first sight of each problem reads SQLite
+        cache = PredictionCache(path)
+        report("warm SQLite, after restart", cache)
+        report("warm memory", cache)
+        cache.close()
+
+
+if __name__ == "__main__":
+    main()
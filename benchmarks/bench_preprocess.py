@@ -0,0 +1,66 @@
+"""
+Solvra - Preprocessing benchmark
+Compares the row-wise and vectorized DataPreprocessor paths on train.csv
+inflated to a large number of rows, and checks both give identical frames
+
+Run from the repository root:
+    python benchmarks/bench_preprocess.py [rows]
+"""
+
+import io
+import sys
+import time
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+
+
+def inflate(df: pd.DataFrame, rows: int, unique: bool, seed: int = 42) -> pd.DataFrame:
+    """
+    Sample rows with replacement up to the requested size.
+    unique=True tags every statement so no two rows repeat.
+    """
+    df = df.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+    if unique:
+        # Letter-only tags so the number flags are unaffected
+        tags = pd.Series(range(rows)).map(lambda i: ''.join(chr(97 + int(d)) for d in str(i)))
+        df['problem_statement'] = df['problem_statement'] + ' Ref ' + tags
+    return df
+
+
+def run(raw: pd.DataFrame, vectorized: bool):
+    """Preprocess a copy of raw and return (seconds, frame)"""
+    preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+    preprocessor.train_df = raw.copy()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = preprocessor.preprocess_training_data(vectorized=vectorized)
+    return time.perf_counter() - start, result
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    train = pd.read_csv(ROOT / "data" / "train.csv")
+
+    for unique in (False, True):
+        raw = inflate(train, rows, unique)
+        label = "unique statements" if unique else "sampled with repeats"
+        print(f"Preprocessing {rows:,} rows ({label})")
+
+        rowwise_time, rowwise = run(raw, vectorized=False)
+        print(f"  row-wise:   {rowwise_time:8.2f}s  ({rows / rowwise_time:,.0f} rows/sec)")
+
+        vector_time, vector = run(raw, vectorized=True)
+        print(f"  vectorized: {vector_time:8.2f}s  ({rows / vector_time:,.0f} rows/sec)")
+
+        print(f"  speedup:    {rowwise_time / vector_time:8.2f}x")
+        print(f"  identical:  {vector.equals(rowwise)}\n")
+
+if __name__ == "__main__":
+    main()
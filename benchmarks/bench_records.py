@@ -0,0 +1,84 @@
+"""
+Solvra - Row conversion benchmark
+Times turning a preprocessed frame into per-problem inputs the old way
+(iloc[idx].to_dict() per row) against one to_dict('records') pass and
+the read-only problem_records views, and MLEnhancer training over
+iterrows against training over records
+
+Run from the repository root:
+    python benchmarks/bench_records.py [rows]
+"""
+
+import io
+import sys
+import time
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor, problem_records
+from ml_enhancer import MLEnhancer
+
+
+def best_time(run, repeats: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def learn_iterrows(enhancer: MLEnhancer, training_data: pd.DataFrame):
+    """MLEnhancer._learn as it was, walking the frame with iterrows"""
+    for idx, row in training_data.iterrows():
+        if pd.isna(row.get('correct_option_number')):
+            continue
+        correct_answer = int(row['correct_option_number'])
+        topic = row['topic'].lower() if 'topic' in row else 'unknown'
+        enhancer.topic_patterns[topic].append(correct_answer)
+        for feature_name, feature_value in enhancer.extract_features(row).items():
+            if feature_value and isinstance(feature_value, bool):
+                enhancer.keyword_to_answer[feature_name].append(correct_answer)
+        enhancer.answer_distribution[topic][correct_answer] += 1
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        train_df = preprocessor.preprocess_training_data()
+    df = train_df.sample(n=rows, replace=True, random_state=42).reset_index(drop=True)
+
+    print(f"{rows:,} rows, best of 3\n")
+    timings = [
+        ("iloc[idx].to_dict() per row", lambda: [df.iloc[idx].to_dict() for idx in range(len(df))]),
+        ("to_dict('records')", lambda: df.to_dict('records')),
+        ("problem_records (read-only)", lambda: problem_records(df)),
+    ]
+    base = None
+    for label, run in timings:
+        elapsed = best_time(run)
+        base = base or elapsed
+        print(f"  {label:32} {elapsed * 1000:>9.1f}ms {elapsed / rows * 1e6:>7.2f}us/row {base / elapsed:>7.1f}x")
+
+    print()
+    old = MLEnhancer()
+    new = MLEnhancer()
+    with contextlib.redirect_stdout(io.StringIO()):
+        old_time = best_time(lambda: learn_iterrows(MLEnhancer(), df), repeats=1)
+        new_time = best_time(lambda: MLEnhancer()._learn(df), repeats=1)
+        learn_iterrows(old, df)
+        new._learn(df)
+    same = old.topic_patterns == new.topic_patterns and old.keyword_to_answer == new.keyword_to_answer
+    print(f"  {'MLEnhancer learn, iterrows':32} {old_time * 1000:>9.1f}ms")
+    print(f"  {'MLEnhancer learn, records':32} {new_time * 1000:>9.1f}ms {old_time / new_time:>22.1f}x  identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Solvra - Route engine benchmark
+Times the route engine on random sparse road networks up to a million
+edges (CSR build and heap Dijkstra against Dijkstra over a dict of
+neighbour lists), A* against plain Dijkstra on grids with walls, NumPy
+Floyd-Warshall against the pure-Python triple loop, and state-graph
+search on bridge-crossing puzzles
+
+Run from the repository root:
+    python benchmarks/bench_routing.py [max_edges]
+"""
+
+import sys
+import math
+import time
+import heapq
+import random
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from route_engine import CSRGraph, dijkstra, dijkstra_states, floyd_warshall, astar_grid, lattice_path
+from solver import MathSolver
+
+
+def random_network(n: int, m: int, seed: int = 42):
+    """A ring (so everything is connected) plus random chords; weights 1-100"""
+    rng = np.random.default_rng(seed)
+    sources = np.concatenate([np.arange(n), rng.integers(0, n, m - n)])
+    targets = np.concatenate([(np.arange(n) + 1) % n, rng.integers(0, n, m - n)])
+    weights = rng.integers(1, 101, m).astype(np.float64)
+    return sources, targets, weights
+
+
+def dict_dijkstra(n, sources, targets, weights, source):
+    """Heap Dijkstra over {node: [(neighbour, weight)]}, as a plain implementation would"""
+    adjacency = {v: [] for v in range(n)}
+    for u, v, w in zip(sources.tolist(), targets.tolist(), weights.tolist()):
+        adjacency[u].append((v, w))
+        adjacency[v].append((u, w))
+    dist = {source: 0.0}
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for v, w in adjacency[u]:
+            if d + w < dist.get(v, math.inf):
+                dist[v] = d + w
+                heapq.heappush(heap, (d + w, v))
+    return [dist.get(v, math.inf) for v in range(n)]
+
+
+def random_grid(size: int, walls: float = 0.2, seed: int = 42):
+    """Rows of '.' and '#', with a 2x2 block open at each corner"""
+    rng = random.Random(seed)
+    rows = [[('#' if rng.random() < walls else '.') for _ in range(size)] for _ in range(size)]
+    for r, c in [(0, 0), (0, 1), (1, 0), (1, 1)]:
+        rows[r][c] = rows[-1 - r][-1 - c] = '.'
+    return [''.join(row) for row in rows]
+
+
+def grid_dijkstra(grid, goal):
+    """Uninformed search over the grid's open cells (A* with a zero heuristic)"""
+    size = len(grid)
+
+    def neighbours(cell):
+        r, c = cell
+        for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+            if 0 <= r + dr < size and 0 <= c + dc < size and grid[r + dr][c + dc] != '#':
+                yield (r + dr, c + dc), 1.0
+    return dijkstra_states((0, 0), neighbours, lambda cell: cell == goal)
+
+
+def python_floyd_warshall(matrix):
+    dist = [list(row) for row in matrix]
+    n = len(dist)
+    for k in range(n):
+        row_k = dist[k]
+        for i in range(n):
+            d_ik = dist[i][k]
+            row_i = dist[i]
+            for j in range(n):
+                if d_ik + row_k[j] < row_i[j]:
+                    row_i[j] = d_ik + row_k[j]
+    return dist
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    max_edges = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print("SINGLE-SOURCE SHORTEST PATHS (random sparse networks, undirected)")
+    print(f"{'nodes':>9} {'edges':>10} {'CSR build':>10} {'CSR Dijkstra':>13} {'dict Dijkstra':>14}  same")
+    print("-" * 68)
+    for n, m in [(1_000, 10_000), (10_000, 100_000), (100_000, 1_000_000)]:
+        if m > max_edges:
+            break
+        sources, targets, weights = random_network(n, m)
+        build_time, graph = timed(lambda: CSRGraph(n, sources, targets, weights, directed=False))
+        csr_time, (dist, _) = timed(lambda: dijkstra(graph, 0))
+        dict_time, expected = timed(lambda: dict_dijkstra(n, sources, targets, weights, 0))
+        same = np.allclose(dist, expected)
+        print(f"{n:>9} {m:>10} {build_time:>9.3f}s {csr_time:>12.3f}s {dict_time:>13.3f}s  {same}")
+
+    print("\nGRID ROUTES (20% random walls, corner to corner)")
+    print(f"{'grid':>11} {'Dijkstra':>10} {'A* manhattan':>13} {'length':>7} {'A* euclidean 8-way':>19} {'length':>7}")
+    print("-" * 74)
+    for size in [100, 300, 1000]:
+        grid = random_grid(size)
+        goal = (size - 1, size - 1)
+        plain_time, (plain, _) = timed(lambda: grid_dijkstra(grid, goal))
+        manhattan_time, (length, _) = timed(lambda: astar_grid(grid, (0, 0), goal))
+        euclidean_time, (diagonal, _) = timed(lambda: astar_grid(grid, (0, 0), goal, 'euclidean', diagonal=True))
+        assert plain == length
+        print(f"{size:>5}x{size:<5} {plain_time:>9.3f}s {manhattan_time:>12.3f}s {length:>7.0f} "
+              f"{euclidean_time:>18.3f}s {diagonal:>7.1f}")
+
+    # A wall across the straight line must be walked around, even outside the start/goal box
+    wall = [(x, 2, z) for x in (-1, 0, 1) for z in (-1, 0, 1)]
+    detour, _ = lattice_path((0, 0, 0), (0, 4, 0), wall)
+    bounded, _ = lattice_path((0, 0, 0), (0, 4, 0), wall, bounds=[(-5, 5)] * 3)
+    assert detour == bounded == 8.0, (detour, bounded)
+    print(f"3x3 wall across a 3-D lattice path: {detour:.0f} steps (same as with explicit bounds)")
+
+    print("\nALL PAIRS (dense random graphs)")
+    print(f"{'nodes':>7} {'NumPy Floyd-Warshall':>21} {'Python triple loop':>19}  same")
+    print("-" * 56)
+    rng = np.random.default_rng(7)
+    for n in [50, 100, 200, 400]:
+        matrix = rng.integers(1, 100, (n, n)).astype(np.float64)
+        matrix[rng.random((n, n)) < 0.5] = np.inf
+        numpy_time, dist = timed(lambda: floyd_warshall(matrix))
+        if n <= 200:
+            python_time, expected = timed(lambda: python_floyd_warshall(
+                [[0.0 if i == j else matrix[i, j] for j in range(n)] for i in range(n)]))
+            python_cell, same = f"{python_time:>18.3f}s", np.allclose(dist, expected)
+        else:
+            python_cell, same = f"{'-':>19}", '-'
+        print(f"{n:>7} {numpy_time:>20.4f}s {python_cell}  {same}")
+
+    print("\nBRIDGE CROSSINGS (state graph: who is across x torch side)")
+    print(f"{'people':>7} {'states':>8} {'time':>10} {'fastest':>8}")
+    print("-" * 38)
+    solver = MathSolver()
+    for people in [4, 6, 8, 10, 12]:
+        times = [float(t) for t in random.Random(people).sample(range(1, 60), people)]
+        search_time, fastest = timed(lambda: solver.crossing_time(times))
+        print(f"{people:>7} {2 ** (people + 1):>8} {search_time:>9.3f}s {fastest:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Solvra - Rule engine benchmark
+Times LogicSolver.logical_deduction as it was (re-splitting every rule and
+re-lowercasing every conclusion on each pass) against the indexed,
+agenda-driven RuleBase, on rule chains listed in reverse (the old loop's
+worst case) and on random conjunctive knowledge bases up to 100k rules
+
+Run from the repository root:
+    python benchmarks/bench_rule_engine.py
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rule_engine import RuleBase
+
+OLD_LIMIT = 400
+
+
+def old_deduction(facts, rules):
+    """logical_deduction before the rule engine"""
+    conclusions = set(facts)
+    changed = True
+    while changed:
+        changed = False
+        for rule in rules:
+            if 'if' in rule.lower() and 'then' in rule.lower():
+                parts = rule.lower().split('then')
+                condition = parts[0].replace('if', '').strip()
+                conclusion = parts[1].strip()
+                if condition in [f.lower() for f in conclusions]:
+                    if conclusion not in [c.lower() for c in conclusions]:
+                        conclusions.add(conclusion)
+                        changed = True
+    return list(conclusions)
+
+
+def reversed_chain(n: int):
+    """fact s0 and rules s(i) -> s(i+1), listed last link first"""
+    return ['s0'], [f"if s{i} then s{i + 1}" for i in reversed(range(n))]
+
+
+def random_conjunctive(n: int, seed: int = 42):
+    """n rules over n/2 atoms, 1-3 conditions each; 5% of atoms are facts"""
+    rng = random.Random(seed)
+    atoms = max(2, n // 2)
+    rules = []
+    for _ in range(n):
+        conditions = ' and '.join(f"a{rng.randrange(atoms)}" for _ in range(rng.randint(1, 3)))
+        rules.append(f"if {conditions} then a{rng.randrange(atoms)}")
+    facts = [f"a{i}" for i in rng.sample(range(atoms), max(1, atoms // 20))]
+    return facts, rules
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    print("REVERSED CHAIN (single-condition rules)")
+    print(f"{'rules':>8} {'old':>10} {'compile':>10} {'infer':>10} {'derived':>8}  same")
+    print("-" * 58)
+    for n in [100, 200, 400, 1_000, 10_000, 100_000]:
+        facts, rules = reversed_chain(n)
+        compile_time, rule_base = timed(lambda: RuleBase(rules))
+        infer_time, result = timed(lambda: rule_base.infer(facts))
+        if n <= OLD_LIMIT:
+            old_time, old = timed(lambda: old_deduction(facts, rules))
+            old_cell, same = f"{old_time:>9.3f}s", set(old) == set(result['known'])
+        else:
+            old_cell, same = f"{'-':>10}", '-'
+        print(f"{n:>8} {old_cell} {compile_time:>9.4f}s {infer_time:>9.4f}s {len(result['derived']):>8}  {same}")
+
+    print("\nRANDOM CONJUNCTIVE KNOWLEDGE BASES (1-3 conditions per rule)")
+    print(f"{'rules':>8} {'compile':>10} {'infer':>10} {'firings':>8} {'derived':>8} {'us/firing':>10}")
+    print("-" * 60)
+    for n in [1_000, 10_000, 100_000]:
+        facts, rules = random_conjunctive(n)
+        compile_time, rule_base = timed(lambda: RuleBase(rules))
+        infer_time, result = timed(lambda: rule_base.infer(facts))
+        per_firing = infer_time / max(result['firings'], 1) * 1e6
+        print(f"{n:>8} {compile_time:>9.4f}s {infer_time:>9.4f}s {result['firings']:>8} "
+              f"{len(result['derived']):>8} {per_firing:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
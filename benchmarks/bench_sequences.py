@@ -0,0 +1,81 @@
+"""
+Solvra - Sequence batch benchmark
+Compares one-at-a-time sequence detection/prediction against the batched
+API on a large synthetic mix of sequence problems, and checks both give
+identical results
+
+Run from the repository root:
+    python benchmarks/bench_sequences.py [sequences]
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from pattern_matcher import AdvancedPatternMatcher
+from solver import SequenceSolver
+
+
+def make_sequences(count: int, seed: int = 42):
+    """Arithmetic, geometric, power, Fibonacci-like, polynomial and noise sequences of 3-10 terms"""
+    rng = random.Random(seed)
+    sequences = []
+    for _ in range(count):
+        n = rng.randint(3, 10)
+        kind = rng.randrange(6)
+        if kind == 0:
+            a, d = rng.randint(-20, 20), rng.randint(-9, 9)
+            seq = [a + d * i for i in range(n)]
+        elif kind == 1:
+            a, r = rng.randint(1, 9), rng.choice([2, 3, -2, 0.5])
+            seq = [a * r ** i for i in range(n)]
+        elif kind == 2:
+            p, c = rng.randint(2, 3), rng.randint(-10, 10)
+            seq = [(i + 1) ** p + c for i in range(n)]
+        elif kind == 3:
+            seq = [rng.randint(1, 9), rng.randint(1, 9)]
+            while len(seq) < n:
+                seq.append(seq[-1] + seq[-2])
+        elif kind == 4:
+            a, b, c = rng.randint(1, 5), rng.randint(-5, 5), rng.randint(-5, 5)
+            seq = [a * i * i + b * i + c for i in range(n)]
+        else:
+            seq = [rng.randint(0, 100) for _ in range(n)]
+        sequences.append([float(x) for x in seq])
+    return sequences
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sequences = make_sequences(count)
+    matcher = AdvancedPatternMatcher()
+    solver = SequenceSolver()
+
+    print(f"{count:,} sequences of 3-10 terms\n")
+    print(f"{'':22} {'one-by-one':>12} {'batched':>12} {'speedup':>8}  identical")
+
+    start = time.perf_counter()
+    scalar = [matcher.detect_sequence_type(seq) for seq in sequences]
+    scalar_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = matcher.detect_sequence_types(sequences)
+    batch_time = time.perf_counter() - start
+    print(f"{'detect_sequence_type':22} {scalar_time:>11.2f}s {batch_time:>11.3f}s "
+          f"{scalar_time / batch_time:>7.1f}x  {scalar == batched}")
+
+    start = time.perf_counter()
+    scalar = [solver.predict_next(seq) for seq in sequences]
+    scalar_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batched = solver.predict_next_batch(sequences)
+    batch_time = time.perf_counter() - start
+    print(f"{'predict_next':22} {scalar_time:>11.2f}s {batch_time:>11.3f}s "
+          f"{scalar_time / batch_time:>7.1f}x  {scalar == batched}")
+
+
+if __name__ == "__main__":
+    main()
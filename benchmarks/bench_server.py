@@ -0,0 +1,95 @@
+"""
+Solvra - Inference server benchmark
+Starts the micro-batching server in-process on a free localhost port,
+sends the test problems over several concurrent connections for a few
+batch sizes, and reports throughput and latency percentiles. Checks every
+answer against SolvraPipeline.stream_predictions run over the same problems
+as a JSONL file (the --stream CLI path). Runs fully offline.
+
+Run from the repository root:
+    python benchmarks/bench_server.py [problems]
+"""
+
+import io
+import sys
+import json
+import tempfile
+import time
+import asyncio
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from main import SolvraPipeline
+from server import InferenceEngine, MicroBatchServer
+
+CONNECTIONS = 8
+
+
+def stream_answers(records):
+    """{id: result} from stream_predictions over records, trained as `main.py --stream` does"""
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        input_path, output_path = Path(tmp) / "problems.jsonl", Path(tmp) / "predictions.jsonl"
+        input_path.write_text("".join(json.dumps(record) + "\n" for record in records), encoding='utf-8')
+        pipeline = SolvraPipeline(data_dir=str(ROOT / "data"), reports_dir=tmp)
+        pipeline.train_df = pipeline.preprocessor.load_train_data()
+        pipeline.train_df = pipeline.preprocessor.preprocess_training_data()
+        pipeline.train_ml_enhancer()
+        pipeline.stream_predictions(str(input_path), str(output_path))
+        with open(output_path, encoding='utf-8') as f:
+            return {result['id']: result for result in map(json.loads, f)}
+
+
+async def client(address, records, answers):
+    """Pipeline every record down one connection, then read all the answers"""
+    reader, writer = await asyncio.open_connection(*address)
+    for record in records:
+        writer.write((json.dumps(record) + "\n").encode())
+    await writer.drain()
+    for _ in records:
+        response = json.loads(await reader.readline())
+        answers[response['id']] = response
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(engine, records, max_batch_size):
+    server = MicroBatchServer(engine, max_batch_size=max_batch_size, max_wait_ms=2.0)
+    await server.start()
+    answers = {}
+    start = time.perf_counter()
+    shards = [records[i::CONNECTIONS] for i in range(CONNECTIONS)]
+    await asyncio.gather(*(client(server.address, shard, answers) for shard in shards))
+    elapsed = time.perf_counter() - start
+    stats = server.stats()
+    await server.close()
+    return elapsed, stats, answers
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = InferenceEngine.warm(data_dir=str(ROOT / "data"))
+    test_records = pd.read_csv(ROOT / "data" / "test.csv").to_dict('records')
+    records = [dict(test_records[i % len(test_records)], id=i) for i in range(count)]
+    expected = stream_answers([dict(record, id=i) for i, record in enumerate(test_records)])
+
+    print(f"{count:,} requests over {CONNECTIONS} connections\n")
+    print(f"{'max batch':>9} {'req/s':>9} {'mean batch':>10} {'p50':>9} {'p95':>9} {'p99':>9}  same as --stream")
+    for max_batch_size in (1, 8, 32, 128):
+        elapsed, stats, answers = asyncio.run(run(engine, records, max_batch_size))
+        identical = all(
+            answers[i].get('predicted_option') == expected[i % len(expected)].get('predicted_option')
+            and answers[i].get('confidence') == expected[i % len(expected)].get('confidence')
+            for i in range(count))
+        latency = stats['latency']
+        print(f"{max_batch_size:>9} {count / elapsed:>9,.0f} {stats['mean_batch_size']:>10.1f} "
+              f"{latency['p50_ms']:>7.1f}ms {latency['p95_ms']:>7.1f}ms {latency['p99_ms']:>7.1f}ms  {identical}")
+
+
+if __name__ == "__main__":
+    main()
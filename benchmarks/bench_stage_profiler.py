@@ -0,0 +1,62 @@
+"""
+Solvra - Stage profiler overhead benchmark
+Runs the reasoning agent over the bundled problems with per-stage
+profiling switched off (profiler None) and on, and reports the cost per
+problem of each, plus the stage table the profiled run produced
+
+Run from the repository root:
+    python benchmarks/bench_stage_profiler.py [repeats]
+"""
+
+import io
+import sys
+import time
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+from reasoning_agent import ReasoningAgent
+from parsed_problem import ParsedProblem
+from latency import StageProfiler
+
+
+def run_agent(agent, records, repeats: int) -> float:
+    """Best-of-N mean microseconds per problem"""
+    best = float('inf')
+    for _ in range(repeats):
+        parsed = [ParsedProblem(record) for record in records]
+        start = time.perf_counter()
+        for record, p in zip(records, parsed):
+            agent.reason_step_by_step(record, p)
+        best = min(best, time.perf_counter() - start)
+    return best / len(records) * 1e6
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        problems = pd.concat([preprocessor.preprocess_training_data(),
+                              preprocessor.preprocess_test_data()], ignore_index=True)
+    records = problems.drop(columns=['correct_option_number', 'solution']).to_dict('records')
+
+    agent = ReasoningAgent()
+    run_agent(agent, records, 1)  # Warm-up
+    off_us = run_agent(agent, records, repeats)
+    agent.profiler = StageProfiler()
+    on_us = run_agent(agent, records, repeats)
+
+    print(f"{len(records)} problems, best of {repeats}\n")
+    print(f"  profiling off: {off_us:8.1f}us per problem")
+    print(f"  profiling on:  {on_us:8.1f}us per problem ({on_us - off_us:+.1f}us)\n")
+    print("\n".join(agent.profiler.report_lines()))
+
+
+if __name__ == "__main__":
+    main()
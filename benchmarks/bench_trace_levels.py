@@ -0,0 +1,69 @@
+"""
+Solvra - Trace level benchmark
+Runs the reasoning agent over the bundled problems at each trace level
+(off, summary, full) and reports time per problem, throughput and trace
+steps recorded, plus how many problems a 10% TraceSampler keeps
+
+Run from the repository root:
+    python benchmarks/bench_trace_levels.py [repeats]
+"""
+
+import io
+import sys
+import time
+import contextlib
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from preprocess import DataPreprocessor
+from reasoning_agent import ReasoningAgent, TRACE_LEVELS
+from parsed_problem import ParsedProblem
+from trace_logger import TraceSampler
+
+
+def run_agent(agent, records, repeats: int):
+    """Best-of-N mean microseconds per problem, and trace steps in the last run"""
+    best = float('inf')
+    steps = 0
+    for _ in range(repeats):
+        parsed = [ParsedProblem(record) for record in records]
+        steps = 0
+        start = time.perf_counter()
+        for record, p in zip(records, parsed):
+            _, trace = agent.reason_step_by_step(record, p)
+            steps += len(trace) if trace is not None else 0
+        best = min(best, time.perf_counter() - start)
+    return best / len(records) * 1e6, steps
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    with contextlib.redirect_stdout(io.StringIO()):
+        preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+        preprocessor.load_data()
+        problems = pd.concat([preprocessor.preprocess_training_data(),
+                              preprocessor.preprocess_test_data()], ignore_index=True)
+    records = problems.drop(columns=['correct_option_number', 'solution']).to_dict('records')
+
+    print(f"{len(records)} problems, best of {repeats}\n")
+    print(f"  {'level':8} {'per problem':>12} {'throughput':>13} {'trace steps':>12}")
+    baseline = None
+    for level in TRACE_LEVELS:
+        agent = ReasoningAgent(trace_level=level)
+        run_agent(agent, records, 1)  # Warm-up
+        us, steps = run_agent(agent, records, repeats)
+        baseline = baseline or us
+        print(f"  {level:8} {us:>10.1f}us {1e6 / us:>11,.0f}/s {steps:>12,}"
+              f"  ({us / baseline:.2f}x off)")
+
+    sampler = TraceSampler(rate=0.1)
+    kept = sum(sampler.keep(i) for i in range(len(records)))
+    print(f"\n  TraceSampler(rate=0.1) keeps {kept} of {len(records)} full traces")
+
+
+if __name__ == "__main__":
+    main()
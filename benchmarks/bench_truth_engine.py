@@ -0,0 +1,76 @@
+"""
+Solvra - Truth engine benchmark
+Times TruthEngine on random knights-and-knaves puzzles of growing size
+against checking all 2^N role assignments; the GF(2) elimination and
+the bound checks keep the search to a handful of free roles
+
+Run from the repository root:
+    python benchmarks/bench_truth_engine.py
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from truth_engine import TruthEngine, TruthPuzzle, compile_expr
+
+BRUTE_LIMIT = 20
+
+
+def random_puzzle(n: int, seed: int = 42) -> TruthPuzzle:
+    """
+    Everyone speaks once: accusations and same-type claims, plus two
+    counting claims about the whole group
+    """
+    rng = random.Random(seed)
+    names = [f"P{i}" for i in range(n)]
+    counting = set(rng.sample(names, 2))
+    statements = []
+    for speaker in names:
+        a, b = rng.sample(names, 2)
+        if speaker in counting:
+            claim = f"at least {rng.randint(0, n // 2)} of us are liars"
+        elif rng.random() < 0.7:
+            claim = f"{a} is a {'liar' if rng.random() < 0.5 else 'knight'}"
+        else:
+            claim = f"{a} and {b} are of the same type"
+        statements.append((speaker, claim))
+    return TruthPuzzle.from_statements(statements)
+
+
+def brute_force(puzzle: TruthPuzzle):
+    """Every one of the 2^N masks checked against every claim"""
+    claims = [(speaker, compile_expr(expr)) for speaker, expr in puzzle.statements]
+    return [m for m in range(1 << len(puzzle.people))
+            if all((m >> s & 1 == 1) == claim(m) for s, claim in claims)]
+
+
+def main():
+    engine = TruthEngine()
+    print(f"{'people':>7} {'brute force':>12} {'engine':>10} {'solutions':>10}  same")
+    print("-" * 50)
+    for n in [8, 12, 16, 20, 24, 32, 64, 256, 1024]:
+        puzzles = [random_puzzle(n, seed) for seed in range(20)]
+        start = time.perf_counter()
+        results = [engine.solve(puzzle) for puzzle in puzzles]
+        engine_time = (time.perf_counter() - start) / len(puzzles)
+        found = sum(len(r) for r in results)
+
+        if n <= BRUTE_LIMIT:
+            sample = puzzles[:3] if n >= 16 else puzzles
+            start = time.perf_counter()
+            expected = [sorted(brute_force(puzzle), reverse=True) for puzzle in sample]
+            brute_time = (time.perf_counter() - start) / len(sample)
+            brute_cell = f"{brute_time * 1000:>10.1f}ms"
+            same = expected == results[:len(sample)]
+        else:
+            brute_cell, same = f"{'-':>12}", '-'
+        print(f"{n:>7} {brute_cell} {engine_time * 1000:>8.2f}ms {found / len(puzzles):>10.1f}  {same}")
+    print("\n(times per puzzle over 20 random puzzles per size; brute force on a sample of them)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Solvra - TSP benchmark
+Times exact Held-Karp against the nearest-neighbour + 2-opt/Or-opt heuristic
+to show where the exact/heuristic crossover sits
+
+Run from the repository root:
+    python benchmarks/bench_tsp.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from tsp_engine import TSPEngine
+
+
+def random_instance(num_cities: int, seed: int = 42):
+    """Symmetric Euclidean instance as (distances dict, cities)"""
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 100, size=(num_cities, 2))
+    cities = [f"C{i}" for i in range(num_cities)]
+    distances = {}
+    for i in range(num_cities):
+        for j in range(i + 1, num_cities):
+            distances[(cities[i], cities[j])] = float(np.hypot(*(points[i] - points[j])))
+    return distances, cities
+
+
+def time_call(fn, repeats: int = 3):
+    """Best-of-N wall time and the last result"""
+    best = float('inf')
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    engine = TSPEngine()
+
+    print("EXACT vs HEURISTIC")
+    print(f"{'cities':>6} {'exact (s)':>11} {'heuristic (s)':>14} {'gap':>8}")
+    print("-" * 44)
+    for n in [6, 8, 10, 12, 14, 16, 18, 20]:
+        distances, cities = random_instance(n)
+        matrix = engine.build_distance_matrix(distances, cities)
+        exact_time, (_, exact_cost) = time_call(lambda: engine.held_karp(matrix), repeats=1 if n > 14 else 3)
+        heur_time, (_, heur_cost) = time_call(lambda: engine.heuristic(matrix))
+        gap = round((heur_cost - exact_cost) / exact_cost * 100, 4) + 0.0  # avoid "-0.00"
+        print(f"{n:>6} {exact_time:>11.4f} {heur_time:>14.4f} {gap:>7.2f}%")
+
+    print("\nHEURISTIC SCALING")
+    print(f"{'cities':>6} {'time (s)':>10}")
+    print("-" * 18)
+    for n in [50, 100, 200, 400]:
+        distances, cities = random_instance(n)
+        matrix = engine.build_distance_matrix(distances, cities)
+        heur_time, _ = time_call(lambda: engine.heuristic(matrix), repeats=1)
+        print(f"{n:>6} {heur_time:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Solvra - Benchmark comparison
+Diffs two benchmarks/suite.py result files and flags every benchmark
+whose throughput dropped (latency rose) by more than the threshold.
+Best-of-N runs are compared by default since they are the least noisy. Exits with status 1 when anything regressed, so it can gate CI.
+
+Run from the repository root:
+    python benchmarks/compare.py BASE.json HEAD.json [--threshold 10]
+"""
+
+import argparse
+import json
+import sys
+
+
+def load(path: str):
+    with open(path) as f:
+        report = json.load(f)
+    return report, {(r['name'], r['scale']): r for r in report['results']}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two Solvra benchmark result files")
+    parser.add_argument('base', help="Results from the baseline commit")
+    parser.add_argument('head', help="Results from the commit under test")
+    parser.add_argument('--threshold', type=float, default=10.0,
+                        help="Percent slowdown that counts as a regression (default: 10)")
+    parser.add_argument('--stat', choices=['best', 'median'], default='best',
+                        help="Compare best-of-N (default) or median throughput")
+    args = parser.parse_args()
+
+    base_report, base = load(args.base)
+    head_report, head = load(args.head)
+    for label, report in (("base", base_report), ("head", head_report)):
+        env = report.get('environment', {})
+        dirty = " (dirty)" if env.get('dirty') else ""
+        print(f"{label}: {(env.get('commit') or 'unknown')[:12]}{dirty}  python {env.get('python')}  "
+              f"numpy {env.get('numpy')}  pandas {env.get('pandas')}  {env.get('machine')}")
+    if base_report.get('environment', {}).get('platform') != head_report.get('environment', {}).get('platform'):
+        print("warning: results come from different platforms")
+    print()
+
+    field = 'best_throughput_per_s' if args.stat == 'best' else 'throughput_per_s'
+    regressions = improvements = 0
+    print(f"{'benchmark':42} {'scale':>7} {'base/s':>12} {'head/s':>12} {'change':>8}")
+    for key in sorted(base.keys() & head.keys(), key=list(base).index):
+        before, after = base[key][field], head[key][field]
+        change = (after / before - 1) * 100
+        # A throughput drop of t% is a latency rise of t/(100-t)%; judge on latency
+        slowdown = (before / after - 1) * 100
+        flag = ""
+        if slowdown > args.threshold:
+            flag, regressions = "  REGRESSION", regressions + 1
+        elif -slowdown > args.threshold:
+            flag, improvements = "  faster", improvements + 1
+        print(f"{key[0]:42} {key[1]:>7,} {before:>12,.1f} {after:>12,.1f} {change:>+7.1f}%{flag}")
+
+    for label, missing in (("only in base", base.keys() - head.keys()), ("only in head", head.keys() - base.keys())):
+        for name, scale in sorted(missing):
+            print(f"{name:42} {scale:>7,}  {label}")
+
+    print(f"\n{regressions} regression(s), {improvements} improvement(s) beyond {args.threshold:g}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
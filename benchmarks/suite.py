@@ -0,0 +1,262 @@
+"""
+Solvra - Benchmark suite
+Reproducible timings for the solvers, the reasoning agent (per topic),
+the ML enhancer and the end-to-end pipeline, each at several input
+scales built from the bundled CSVs plus seeded synthetic inflation.
+Results are written as JSON for benchmarks/compare.py to diff between
+commits.
+
+Run from the repository root:
+    python benchmarks/suite.py [--quick] [--output results.json] [--only NAME ...]
+"""
+
+import argparse
+import atexit
+import contextlib
+import io
+import json
+import math
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from bench_sequences import make_sequences
+from bench_tsp import random_instance
+from preprocess import DataPreprocessor
+from pattern_matcher import AdvancedPatternMatcher
+from solver import MathSolver, SequenceSolver
+from reasoning_agent import ReasoningAgent
+from parsed_problem import ParsedProblem
+from ml_enhancer import MLEnhancer
+from main import SolvraPipeline
+
+SEED = 42
+SUITE_VERSION = 1
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence progress prints and tqdm bars while timing"""
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+def inflate(df: pd.DataFrame, rows: int, seed: int = SEED) -> pd.DataFrame:
+    """Exactly `rows` rows: the frame itself, then seeded resampling of it"""
+    if rows <= len(df):
+        return df.iloc[:rows].reset_index(drop=True)
+    extra = df.sample(n=rows - len(df), replace=True, random_state=seed)
+    return pd.concat([df, extra], ignore_index=True)
+
+
+class Data:
+    """Bundled CSVs, preprocessed once and shared by every benchmark"""
+
+    def __init__(self):
+        with quiet():
+            preprocessor = DataPreprocessor(data_dir=str(ROOT / "data"))
+            preprocessor.load_data()
+            self.train_raw = preprocessor.train_df.copy()
+            self.test_raw = preprocessor.test_df.copy()
+            self.train = preprocessor.preprocess_training_data()
+            self.test = preprocessor.preprocess_test_data()
+        # Labels and solutions dropped: the agent would otherwise read off the answer
+        self.problems = pd.concat([self.train, self.test], ignore_index=True).drop(
+            columns=['correct_option_number', 'solution'], errors='ignore')
+        self._enhancer = None
+
+    @property
+    def enhancer(self) -> MLEnhancer:
+        if self._enhancer is None:
+            self._enhancer = MLEnhancer()
+            with quiet():
+                self._enhancer.train(self.train)
+        return self._enhancer
+
+
+# Each benchmark: setup(data, scale) -> (run, units). run() is timed; units
+# is how many problems/sequences/tours one run() handles.
+
+def bench_sequence_predict_next(data, scale):
+    sequences = make_sequences(scale, seed=SEED)
+    solver = SequenceSolver()
+    return lambda: [solver.predict_next(seq) for seq in sequences], scale
+
+
+def bench_detect_sequence_type(data, scale):
+    sequences = make_sequences(scale, seed=SEED)
+    matcher = AdvancedPatternMatcher()
+    return lambda: [matcher.detect_sequence_type(seq) for seq in sequences], scale
+
+
+def bench_traveling_salesman(data, scale):
+    instances = [random_instance(scale, seed=SEED + i) for i in range(5)]
+    solver = MathSolver()
+    return lambda: [solver.traveling_salesman_simple(d, c) for d, c in instances], len(instances)
+
+
+def make_agent_bench(topic):
+    def bench_agent(data, scale):
+        topic_df = data.problems[data.problems['topic'] == topic].reset_index(drop=True)
+        records = inflate(topic_df, scale).to_dict('records')
+        agent = ReasoningAgent()
+        return lambda: [agent.reason_step_by_step(p, ParsedProblem(p)) for p in records], scale
+    return bench_agent
+
+
+def bench_ml_train(data, scale):
+    train = inflate(data.train, scale)
+
+    def run():
+        with quiet():
+            MLEnhancer().train(train)
+    return run, scale
+
+
+def bench_ml_predict(data, scale):
+    records = inflate(data.test, scale).to_dict('records')
+    enhancer = data.enhancer
+    bases = np.random.default_rng(SEED).integers(1, 6, size=scale).tolist()
+    return lambda: [enhancer.predict(p, b) for p, b in zip(records, bases)], scale
+
+
+def bench_ml_predict_batch(data, scale):
+    problems = inflate(data.test, scale)
+    enhancer = data.enhancer
+    bases = np.random.default_rng(SEED).integers(1, 6, size=scale).tolist()
+    return lambda: enhancer.predict_batch(problems, bases), scale
+
+
+def bench_pipeline(data, scale):
+    """CSV load, preprocess, ML training and test prediction on inflated CSVs"""
+    workdir = Path(tempfile.mkdtemp(prefix="solvra_bench_"))
+    atexit.register(shutil.rmtree, workdir, ignore_errors=True)
+    inflate(data.train_raw, len(data.train_raw) * scale).to_csv(workdir / "train.csv", index=False)
+    inflate(data.test_raw, len(data.test_raw) * scale).to_csv(workdir / "test.csv", index=False)
+
+    def run():
+        with quiet():
+            pipeline = SolvraPipeline(data_dir=str(workdir), reports_dir=str(workdir / "reports"))
+            pipeline.train_df, pipeline.test_df = pipeline.preprocessor.load_data()
+            pipeline.train_df = pipeline.preprocessor.preprocess_training_data()
+            pipeline.test_df = pipeline.preprocessor.preprocess_test_data()
+            pipeline.train_ml_enhancer()
+            pipeline.predict_test_set(save_traces=False)
+    return run, len(data.test_raw) * scale
+
+
+AGENT_TOPICS = [
+    "Spatial reasoning", "Optimization of actions and planning", "Operation of mechanisms",
+    "Sequence solving", "Lateral thinking", "Classic riddles", "Logical traps",
+]
+
+# name -> (setup, full scales, quick scales, unit name)
+BENCHMARKS = {
+    "sequence.predict_next": (bench_sequence_predict_next, [100, 1_000, 10_000], [1_000], "sequences"),
+    "pattern.detect_sequence_type": (bench_detect_sequence_type, [100, 1_000, 10_000], [1_000], "sequences"),
+    "math.traveling_salesman": (bench_traveling_salesman, [6, 10, 14, 40], [6, 40], "tours"),
+    **{f"agent.{topic.lower().replace(' ', '_')}": (make_agent_bench(topic), [100, 1_000], [100], "problems")
+       for topic in AGENT_TOPICS},
+    "ml.train": (bench_ml_train, [384, 3_840, 38_400], [384], "rows"),
+    "ml.predict": (bench_ml_predict, [100, 1_000, 10_000], [1_000], "problems"),
+    "ml.predict_batch": (bench_ml_predict_batch, [100, 1_000, 10_000], [1_000], "problems"),
+    "pipeline.end_to_end": (bench_pipeline, [1, 5, 20], [1], "test problems"),
+}
+
+
+def measure(run, repeats: int, min_sample: float = 0.1):
+    """
+    Seconds per run(): one warm-up call sizes each sample to at least
+    min_sample seconds (short runs are looped), then `repeats` samples
+    """
+    start = time.perf_counter()
+    run()
+    loops = max(1, math.ceil(min_sample / max(time.perf_counter() - start, 1e-9)))
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(loops):
+            run()
+        times.append((time.perf_counter() - start) / loops)
+    return times, loops
+
+
+def environment():
+    """Where the numbers came from, so comparisons can spot apples vs oranges"""
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True,
+                                  check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    return {
+        'commit': git("rev-parse", "HEAD"),
+        'dirty': bool(git("status", "--porcelain", "--untracked-files=no")),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solvra benchmark suite")
+    parser.add_argument('--output', default=str(ROOT / "benchmarks" / "results.json"),
+                        help="JSON results file (default: benchmarks/results.json)")
+    parser.add_argument('--quick', action='store_true', help="Smallest scales only")
+    parser.add_argument('--repeats', type=int, default=7, help="Timed runs per benchmark and scale")
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help="Run benchmarks whose name starts with any of these prefixes")
+    args = parser.parse_args()
+
+    data = Data()
+    results = []
+    print(f"{'benchmark':42} {'scale':>7} {'median':>10} {'per unit':>11} {'throughput':>14}")
+    for name, (setup, scales, quick_scales, unit) in BENCHMARKS.items():
+        if args.only and not any(name.startswith(prefix) for prefix in args.only):
+            continue
+        for scale in (quick_scales if args.quick else scales):
+            run, units = setup(data, scale)
+            repeats = 1 if name == "pipeline.end_to_end" and scale > 1 else args.repeats
+            times, loops = measure(run, repeats)
+            median = statistics.median(times)
+            results.append({
+                'name': name,
+                'scale': scale,
+                'units': units,
+                'unit': unit,
+                'repeats': repeats,
+                'loops': loops,
+                'times_s': [round(t, 6) for t in times],
+                'median_s': round(median, 6),
+                'min_s': round(min(times), 6),
+                'latency_us': round(median / units * 1e6, 3),
+                'throughput_per_s': round(units / median, 3),
+                'best_throughput_per_s': round(units / min(times), 3),
+            })
+            print(f"{name:42} {scale:>7,} {median * 1000:>8.1f}ms {median / units * 1e6:>9.1f}us "
+                  f"{units / median:>10,.0f}/s")
+
+    report = {'suite_version': SUITE_VERSION, 'seed': SEED, 'quick': args.quick,
+              'environment': environment(), 'results': results}
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
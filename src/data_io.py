@@ -0,0 +1,154 @@
+"""
+Solvra - Data I/O Module
+Reads and writes problem tables as CSV, Parquet or Feather, picked by file
+extension. The columnar formats keep dtypes (real bool flag columns, ints,
+strings) so nothing is re-parsed or re-inferred on load; uncompressed
+Feather files are read through a memory map. Parquet and Feather need
+pyarrow, which is only imported when one of them is used.
+
+Files are written under a temporary name and renamed into place, so a
+reader never sees a half-written file and frames still memory-mapped from
+the old file stay valid.
+"""
+
+import os
+from pathlib import Path
+from typing import Iterator, List, Optional, Union
+
+import pandas as pd
+
+
+# File extension for each supported table format
+DATA_FORMATS = {'csv': '.csv', 'parquet': '.parquet', 'feather': '.feather'}
+
+PathLike = Union[str, Path]
+
+
+def _pyarrow():
+    """The pyarrow module, with an install hint if it is missing"""
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError("Parquet and Feather files need pyarrow: pip install pyarrow") from e
+    return pyarrow
+
+
+def table_format(path: PathLike) -> str:
+    """'csv', 'parquet' or 'feather' from the file extension"""
+    suffix = Path(path).suffix.lower()
+    for data_format, extension in DATA_FORMATS.items():
+        if suffix == extension:
+            return data_format
+    raise ValueError(f"Unsupported data file {path}: expected one of {', '.join(DATA_FORMATS.values())}")
+
+
+def read_table(path: PathLike, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load a whole CSV, Parquet or Feather file"""
+    data_format = table_format(path)
+    if data_format == 'csv':
+        return pd.read_csv(path, usecols=columns)
+
+    _pyarrow()
+    if data_format == 'parquet':
+        return pd.read_parquet(path, columns=columns, memory_map=True)
+    from pyarrow import feather
+    return feather.read_table(path, columns=columns, memory_map=True).to_pandas()
+
+
+def _temporary_path(path: Path) -> Path:
+    return path.with_name(f".{path.name}.tmp")
+
+
+def write_table(df: pd.DataFrame, path: PathLike):
+    """Save df without its index; Feather is left uncompressed so reads can memory-map it"""
+    with TableWriter(path) as writer:
+        writer.write(df)
+
+
+def iter_table_chunks(path: PathLike, chunksize: int) -> Iterator[pd.DataFrame]:
+    """
+    Read chunksize rows at a time. Each chunk is indexed by its row
+    positions in the file, as pd.read_csv(chunksize=...) does.
+    """
+    data_format = table_format(path)
+    if data_format == 'csv':
+        yield from pd.read_csv(path, chunksize=chunksize)
+        return
+
+    pa = _pyarrow()
+    if data_format == 'parquet':
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(path, memory_map=True)
+        tables = (pa.Table.from_batches([batch]) for batch in parquet_file.iter_batches(batch_size=chunksize))
+    else:
+        # Slices of a memory-mapped table are zero-copy views
+        from pyarrow import feather
+        whole = feather.read_table(path, memory_map=True)
+        tables = (whole.slice(offset, chunksize) for offset in range(0, whole.num_rows, chunksize))
+
+    start = 0
+    for table in tables:
+        chunk = table.to_pandas()
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        yield chunk
+
+
+class TableWriter:
+    """
+    Appends DataFrame chunks to one CSV, Parquet or Feather file. Every
+    chunk after the first must have the first chunk's columns; Parquet and
+    Feather also cast it to the first chunk's column types.
+    """
+
+    def __init__(self, path: PathLike):
+        self.path = Path(path)
+        self.format = table_format(path)
+        self.rows = 0
+        self.chunks = 0
+        self._temporary = _temporary_path(self.path)
+        self._writer = None
+        self._schema = None
+
+    def write(self, df: pd.DataFrame):
+        if self.format == 'csv':
+            first = self.chunks == 0
+            df.to_csv(self._temporary, mode='w' if first else 'a', header=first, index=False)
+        else:
+            pa = _pyarrow()
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.format == 'parquet':
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self._temporary, table.schema)
+                else:
+                    import pyarrow.ipc
+                    self._writer = pyarrow.ipc.new_file(str(self._temporary), table.schema)  # Feather v2, uncompressed
+            self._writer.write_table(table)
+        self.rows += len(df)
+        self.chunks += 1
+
+    def close(self):
+        """Finish the file (Parquet and Feather write their footer) and move it into place"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._temporary.exists():
+            os.replace(self._temporary, self.path)
+
+    def abort(self):
+        """Drop everything written so far, leaving any existing file untouched"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        self._temporary.unlink(missing_ok=True)
+
+    def __enter__(self) -> 'TableWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
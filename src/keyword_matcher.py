@@ -0,0 +1,200 @@
+"""
+Solvra - Keyword Matcher Module
+Aho-Corasick automaton over every keyword vocabulary in the pipeline,
+so a problem is read once and all keyword categories come back together
+"""
+
+from collections import deque
+from typing import Dict, FrozenSet, Iterable, List
+
+
+# Keyword vocabularies, grouped by the stage that uses them.
+# Category names in scan results are "<group>.<name>".
+PROBLEM_VOCABULARIES = {
+    # ReasoningAgent.select_tool
+    'tool': {
+        'spatial': ['cube', 'room', 'corner', 'direction'],
+        'logic': ['truth', 'liar', 'logic', 'riddle'],
+        'optimization': ['minimum', 'maximum', 'shortest', 'optimal'],
+    },
+    # ReasoningAgent.evaluate_answer_options
+    'evaluate': {
+        'cube': ['cube'],
+        'paint': ['paint', 'face', 'color'],
+        'two_faces': ['two face', '2 face'],
+        'three_faces': ['three face', '3 face'],
+        'one_face': ['one face', '1 face'],
+        'no_faces': ['no face', 'zero face', 'not painted'],
+        'minimize': ['minimum', 'shortest', 'least'],
+        'maximize': ['maximum', 'most', 'longest'],
+    },
+    # AdvancedPatternMatcher.analyze_problem_keywords
+    'analysis': {
+        'requires_optimization': ['minimum', 'maximum', 'optimal', 'shortest', 'longest', 'least', 'most', 'best'],
+        'requires_spatial': ['cube', 'room', 'direction', 'corner', 'face', 'edge', 'rotate', 'flip'],
+        'requires_logic': ['truth', 'liar', 'riddle', 'logic', 'deduce', 'if', 'then', 'therefore'],
+        'requires_sequence': ['sequence', 'pattern', 'next', 'series', 'progression'],
+        'is_impossible': ['impossible', 'cannot', 'no way', 'no solution', 'logical trap'],
+        'requires_counting': ['how many', 'count', 'number of'],
+        'requires_scheduling': ['schedule', 'order', 'sequence', 'tasks', 'deadline'],
+        'has_time_constraint': ['hour', 'minute', 'second', 'day', 'week', 'time'],
+    },
+    # MLEnhancer.extract_features
+    'ml': {
+        'has_minimum': ['minimum', 'shortest', 'least'],
+        'has_maximum': ['maximum', 'longest', 'most'],
+        'has_cube': ['cube'],
+        'has_sequence_keyword': ['sequence', 'pattern', 'next'],
+        'has_impossible': ['impossible', 'cannot'],
+        'has_always': ['always'],
+        'has_never': ['never'],
+    },
+    # DataPreprocessor.identify_problem_type
+    'flags': {
+        'requires_math': ['calculate', 'sum', 'product', 'divide', 'multiply', 'percentage'],
+        'requires_sequence': ['sequence'],
+        'requires_spatial': ['cube', 'corner', 'room', 'door', 'direction'],
+        'requires_logic': ['always lies', 'always tells', 'truth', 'liar', 'logic'],
+        'requires_optimization': ['minimum', 'maximum', 'optimal', 'shortest', 'least'],
+        'requires_symbolic': ['equation', 'solve for', 'variable', 'formula'],
+        'has_multiple_steps': ['first', 'then', 'after', 'next', 'finally', 'sequence'],
+    },
+}
+
+# Answer option vocabularies (ReasoningAgent.evaluate_answer_options)
+OPTION_VOCABULARIES = {
+    'option': {
+        'logic_trap': ['impossible', 'not possible', 'cannot', 'logical trap', 'no valid'],
+    },
+}
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton compiled to a flat DFA transition table.
+    Texts must already be lowercased; keywords must be ASCII.
+    """
+
+    def __init__(self, vocabularies: Dict[str, Dict[str, Iterable[str]]],
+                 long_text_threshold: int = 2000):
+        # Pure-Python stepping costs more per character than CPython's C
+        # substring search, so very long texts use one `in` per keyword instead
+        self.long_text_threshold = long_text_threshold
+
+        self.categories = {}
+        keywords = set()
+        for group, named in vocabularies.items():
+            for name, words in named.items():
+                words = frozenset(words)
+                self.categories[f"{group}.{name}"] = words
+                keywords |= words
+
+        for word in keywords:
+            if not word or not word.isascii():
+                raise ValueError(f"keywords must be non-empty ASCII strings: {word!r}")
+
+        self.keywords = sorted(keywords)
+        self._build()
+
+    def _build(self):
+        """Trie -> failure links -> dense byte transition table"""
+        goto = [{}]
+        output = [0]
+        for bit, word in enumerate(self.keywords):
+            state = 0
+            for byte in word.encode('ascii'):
+                if byte not in goto[state]:
+                    goto.append({})
+                    output.append(0)
+                    goto[state][byte] = len(goto) - 1
+                state = goto[state][byte]
+            output[state] |= 1 << bit
+
+        # Breadth-first failure links; outputs inherit from their failure state
+        fail = [0] * len(goto)
+        order = []
+        pending = deque(goto[0].values())
+        while pending:
+            state = pending.popleft()
+            order.append(state)
+            for byte, child in goto[state].items():
+                pending.append(child)
+                fallback = fail[state]
+                while fallback and byte not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(byte, 0) if state else 0
+                output[child] |= output[fail[child]]
+
+        # Dense DFA: table[(state << 8) | byte] -> next_state << 8
+        num_states = len(goto)
+        table = [0] * (num_states << 8)
+        for byte, child in goto[0].items():
+            table[byte] = child << 8
+        for state in order:
+            base = state << 8
+            fail_base = fail[state] << 8
+            table[base:base + 256] = table[fail_base:fail_base + 256]
+            for byte, child in goto[state].items():
+                table[base | byte] = child << 8
+
+        self._table = table
+        self._output = [0] * (num_states << 8)
+        for state, mask in enumerate(output):
+            self._output[state << 8] = mask
+
+        self._category_masks = {
+            name: sum(1 << self.keywords.index(word) for word in words)
+            for name, words in self.categories.items()
+        }
+
+    def _keyword_mask(self, text: str) -> int:
+        """Bitmask of keywords occurring in text (one pass)"""
+        if len(text) > self.long_text_threshold:
+            mask = 0
+            for bit, word in enumerate(self.keywords):
+                if word in text:
+                    mask |= 1 << bit
+            return mask
+
+        table = self._table
+        output = self._output
+        state = 0
+        found = 0
+        # Non-ASCII characters become '?', which no keyword contains
+        for byte in text.encode('ascii', 'replace'):
+            state = table[state | byte]
+            if output[state]:
+                found |= output[state]
+        return found
+
+    def group_names(self, group: str) -> List[str]:
+        """Category names of one vocabulary group, without the group prefix"""
+        prefix = f"{group}."
+        return [name[len(prefix):] for name in self.categories if name.startswith(prefix)]
+
+    def find_keywords(self, text: str) -> FrozenSet[str]:
+        """Every keyword that occurs in text"""
+        mask = self._keyword_mask(text)
+        return frozenset(word for bit, word in enumerate(self.keywords) if mask >> bit & 1)
+
+    def scan(self, text: str) -> FrozenSet[str]:
+        """Every category with at least one keyword in text"""
+        mask = self._keyword_mask(text)
+        return frozenset(name for name, cat_mask in self._category_masks.items() if mask & cat_mask)
+
+
+# Shared automata, built once at import
+PROBLEM_KEYWORDS = KeywordAutomaton(PROBLEM_VOCABULARIES)
+OPTION_KEYWORDS = KeywordAutomaton(OPTION_VOCABULARIES)
+
+
+def demo_keyword_matcher():
+    """Demo the keyword automaton"""
+    text = "a 3x3 cube is painted. how many small cubes have exactly two faces painted?"
+    print(f"Text: {text}")
+    print(f"Keywords: {sorted(PROBLEM_KEYWORDS.find_keywords(text))}")
+    print(f"Categories: {sorted(PROBLEM_KEYWORDS.scan(text))}")
+
+
+if __name__ == "__main__":
+    demo_keyword_matcher()
@@ -0,0 +1,165 @@
+"""
+Solvra - Latency Module
+Fixed-size log-bucketed latency histograms: O(1) memory however many
+samples are recorded, percentiles accurate to one bucket (~5%).
+StageProfiler keeps one per pipeline stage and topic.
+"""
+
+import bisect
+import math
+import time
+from typing import Any, Dict, List
+
+
+class LatencyHistogram:
+    """
+    Counts nanosecond latencies into geometric buckets from 1us to ~100s.
+    Percentiles report the upper bound of the bucket they fall in, clamped
+    to the largest sample seen.
+    """
+
+    def __init__(self, buckets_per_decade: int = 48, min_ns: int = 1_000, max_ns: int = 100_000_000_000):
+        decades = math.log10(max_ns / min_ns)
+        count = int(math.ceil(decades * buckets_per_decade))
+        # bounds[i] is the inclusive upper edge of bucket i; the last bucket is open
+        self.bounds: List[int] = [int(min_ns * 10 ** (i / buckets_per_decade)) for i in range(count + 1)]
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    def record(self, elapsed_ns: int):
+        """Add one sample (nanoseconds)"""
+        self.counts[bisect.bisect_left(self.bounds, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if self.max_ns is None or elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def merge(self, other: 'LatencyHistogram'):
+        """Add another histogram's samples (same bucket layout) into this one"""
+        if other.bounds != self.bounds:
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total_ns += other.total_ns
+        for value in (other.min_ns, other.max_ns):
+            if value is not None:
+                self.min_ns = value if self.min_ns is None else min(self.min_ns, value)
+                self.max_ns = value if self.max_ns is None else max(self.max_ns, value)
+
+    def percentile(self, q: float) -> float:
+        """Latency (ns) below which q percent of samples fall"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                upper = self.bounds[i] if i < len(self.bounds) else self.max_ns
+                return float(min(upper, self.max_ns))
+        return float(self.max_ns)
+
+    def summary(self) -> Dict[str, Any]:
+        """Count plus mean/min/p50/p95/p99/max in milliseconds"""
+        if not self.count:
+            return {'count': 0}
+        to_ms = 1e-6
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ns / self.count * to_ms, 4),
+            'min_ms': round(self.min_ns * to_ms, 4),
+            'p50_ms': round(self.percentile(50) * to_ms, 4),
+            'p95_ms': round(self.percentile(95) * to_ms, 4),
+            'p99_ms': round(self.percentile(99) * to_ms, 4),
+            'max_ms': round(self.max_ns * to_ms, 4),
+        }
+
+
+class StageProfiler:
+    """
+    Per-stage, per-topic latency histograms fed from perf_counter_ns.
+    Instrumented code holds the profiler, or None when profiling is off,
+    and chains lap() calls through a mark:
+
+        if profiler is not None:
+            mark = time.perf_counter_ns()
+        ...stage...
+        if profiler is not None:
+            mark = profiler.lap('stage', topic, mark)
+
+    Switched off, each stage costs one `is not None` check.
+    """
+
+    def __init__(self):
+        # stage -> topic -> histogram, stages in first-recorded order
+        self.histograms: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def record(self, stage: str, topic: str, elapsed_ns: int):
+        by_topic = self.histograms.get(stage)
+        if by_topic is None:
+            by_topic = self.histograms[stage] = {}
+        histogram = by_topic.get(topic)
+        if histogram is None:
+            histogram = by_topic[topic] = LatencyHistogram()
+        histogram.record(elapsed_ns)
+
+    def lap(self, stage: str, topic: str, mark: int) -> int:
+        """Record the time since mark under stage/topic; returns the new mark"""
+        now = time.perf_counter_ns()
+        self.record(stage, topic, now - mark)
+        return now
+
+    def merge(self, other: 'StageProfiler'):
+        """Add another profiler's samples (e.g. from a worker process)"""
+        for stage, by_topic in other.histograms.items():
+            for topic, histogram in by_topic.items():
+                mine = self.histograms.setdefault(stage, {}).setdefault(topic, LatencyHistogram())
+                mine.merge(histogram)
+
+    def stage_histogram(self, stage: str) -> LatencyHistogram:
+        """One stage's samples over every topic"""
+        combined = LatencyHistogram()
+        for histogram in self.histograms.get(stage, {}).values():
+            combined.merge(histogram)
+        return combined
+
+    def summary(self) -> Dict[str, Any]:
+        """{stage: {'all': summary, 'by_topic': {topic: summary}}} with times in ms"""
+        return {
+            stage: {
+                'all': self.stage_histogram(stage).summary(),
+                'by_topic': {topic: histogram.summary() for topic, histogram in sorted(by_topic.items())},
+            }
+            for stage, by_topic in self.histograms.items()
+        }
+
+    def report_lines(self, total_stage: str = 'total') -> List[str]:
+        """Text table: every stage over all topics, then each topic's total and slowest stage"""
+        header = f"  {'':38} {'count':>6} {'mean':>9} {'p50':>9} {'p95':>9} {'p99':>9}"
+        def row(label: str, summary: Dict[str, Any]) -> str:
+            return (f"  {label[:38]:38} {summary['count']:>6} {summary['mean_ms']:>7.3f}ms "
+                    f"{summary['p50_ms']:>7.3f}ms {summary['p95_ms']:>7.3f}ms {summary['p99_ms']:>7.3f}ms")
+
+        lines = [header]
+        for stage in self.histograms:
+            lines.append(row(stage, self.stage_histogram(stage).summary()))
+
+        topics = sorted(self.histograms.get(total_stage, {}))
+        if topics:
+            lines.append("")
+            lines.append(f"  By topic ({total_stage}, slowest stage at p95)")
+            lines.append(header)
+            for topic in topics:
+                stages = [stage for stage in self.histograms if stage != total_stage
+                          and topic in self.histograms[stage]]
+                slowest = max(stages, key=lambda stage: self.histograms[stage][topic].percentile(95),
+                              default=None)
+                suffix = f"  <- {slowest}" if slowest else ""
+                lines.append(row(topic, self.histograms[total_stage][topic].summary()) + suffix)
+        return lines
@@ -0,0 +1,317 @@
+"""
+Solvra - Linear System Engine Module
+Solves systems of equations given as strings. Linear systems are read
+into a coefficient matrix by a small expression parser and solved with
+NumPy; anything else (products of unknowns, functions, names sympy
+treats as constants) falls back to sympy.solve. Parsed equations are
+kept in an LRU keyed by the equation string, so repeated equations are
+never parsed twice.
+"""
+
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+
+# A linear expression: ({variable: coefficient}, constant)
+LinearForm = Tuple[Dict[str, float], float]
+
+_TOKEN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][+-]?\d+)?|\.\d+(?:[eE][+-]?\d+)?)|([A-Za-z_]\w*)|(\*\*|[-+*/^()]))")
+
+# Short names sympify turns into constants or functions instead of symbols
+_SYMPY_CONSTANTS = frozenset({'E', 'I', 'N', 'O', 'Q', 'S', 'E1'})
+_SHORT_NAME = re.compile(r"[A-Za-z]\d*")
+
+
+class NotLinear(Exception):
+    """The expression is not a linear form this parser can read"""
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """(kind, text) tokens with kind 'num', 'name' or 'op'"""
+    tokens = []
+    pos = 0
+    text = text.rstrip()
+    while pos < len(text):
+        match = _TOKEN.match(text, pos)
+        if match is None:
+            raise NotLinear(f"unexpected character {text[pos]!r}")
+        number, name, op = match.groups()
+        if number is not None:
+            tokens.append(('num', number))
+        elif name is not None:
+            tokens.append(('name', name))
+        else:
+            tokens.append(('op', '**' if op == '^' else op))  # sympify reads ^ as a power
+        pos = match.end()
+    return tokens
+
+
+class _LinearParser:
+    """
+    Recursive descent over + - * / ** and parentheses with Python
+    precedence, building a LinearForm. Raises NotLinear as soon as two
+    unknowns multiply, an unknown divides or is raised to a power, or the
+    input is anything it does not understand.
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.pos = 0
+
+    def parse(self) -> LinearForm:
+        form = self.expression()
+        if self.pos != len(self.tokens):
+            raise NotLinear(f"unexpected {self.tokens[self.pos][1]!r}")
+        return form
+
+    def peek(self) -> Optional[str]:
+        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'op':
+            return self.tokens[self.pos][1]
+        return None
+
+    def expression(self) -> LinearForm:
+        form = self.term()
+        while self.peek() in ('+', '-'):
+            sign = 1.0 if self.tokens[self.pos][1] == '+' else -1.0
+            self.pos += 1
+            form = _add(form, self.term(), sign)
+        return form
+
+    def term(self) -> LinearForm:
+        form = self.unary()
+        while self.peek() in ('*', '/'):
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            right = self.unary()
+            if op == '*':
+                form = _multiply(form, right)
+            else:
+                if right[0] or right[1] == 0:
+                    raise NotLinear("division by an unknown or by zero")
+                form = _scale(form, 1.0 / right[1])
+        return form
+
+    def unary(self) -> LinearForm:
+        if self.peek() in ('+', '-'):
+            sign = 1.0 if self.tokens[self.pos][1] == '+' else -1.0
+            self.pos += 1
+            return _scale(self.unary(), sign)
+        return self.power()
+
+    def power(self) -> LinearForm:
+        base = self.atom()
+        if self.peek() == '**':
+            self.pos += 1
+            exponent = self.unary()
+            if base[0] or exponent[0]:
+                raise NotLinear("power of an unknown")
+            try:
+                value = base[1] ** exponent[1]
+            except (OverflowError, ZeroDivisionError) as e:
+                raise NotLinear(str(e)) from e
+            if isinstance(value, complex):
+                raise NotLinear("complex power")
+            return {}, float(value)
+        return base
+
+    def atom(self) -> LinearForm:
+        if self.pos >= len(self.tokens):
+            raise NotLinear("unexpected end of expression")
+        kind, text = self.tokens[self.pos]
+        self.pos += 1
+        if kind == 'num':
+            return {}, float(text)
+        if kind == 'name':
+            return {text: 1.0}, 0.0
+        if text == '(':
+            form = self.expression()
+            if self.peek() != ')':
+                raise NotLinear("unbalanced parentheses")
+            self.pos += 1
+            return form
+        raise NotLinear(f"unexpected {text!r}")
+
+
+def _scale(form: LinearForm, factor: float) -> LinearForm:
+    coeffs, constant = form
+    return {name: c * factor for name, c in coeffs.items()}, constant * factor
+
+
+def _add(left: LinearForm, right: LinearForm, sign: float) -> LinearForm:
+    coeffs = dict(left[0])
+    for name, c in right[0].items():
+        coeffs[name] = coeffs.get(name, 0.0) + sign * c
+    return coeffs, left[1] + sign * right[1]
+
+
+def _multiply(left: LinearForm, right: LinearForm) -> LinearForm:
+    if left[0] and right[0]:
+        raise NotLinear("product of unknowns")
+    if left[0]:
+        return _scale(left, right[1])
+    return _scale(right, left[1])
+
+
+class LinearSystemEngine:
+    """
+    solve(['x + y = 10', '2*x - y = 5'], ['x', 'y']) -> {'x': 5.0, 'y': 5.0}.
+    A square full-rank system goes to numpy.linalg.solve and a taller
+    consistent one to lstsq; singular, underdetermined or nonlinear
+    systems are handed to sympy, so results match the sympy-only solver.
+    """
+
+    def __init__(self, cache_size: int = 4096, tol: float = 1e-9):
+        # Equations kept parsed (per cache: linear forms and sympy equations)
+        self.cache_size = cache_size
+        # Residual and integer-snapping tolerance, relative to the values involved
+        self.tol = tol
+        # Equation string -> ('linear', coeffs, constant) | ('nonlinear',) | ('invalid',)
+        self._parsed: 'OrderedDict[str, tuple]' = OrderedDict()
+        # Equation string -> sympy Eq (None if sympify rejects it), for the fallback
+        self._symbolic: 'OrderedDict[str, object]' = OrderedDict()
+        self._plain_names: Dict[str, bool] = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.numeric_solves = 0
+        self.symbolic_solves = 0
+
+    def solve(self, equations: List[str], variables: List[str]) -> Dict[str, float]:
+        """Values of `variables` satisfying every equation ({} when there is no numeric solution)"""
+        rows = [self.parse_equation(eq) for eq in equations]
+        if any(row[0] == 'invalid' for row in rows):
+            return {}
+
+        if variables and all(row[0] == 'linear' for row in rows):
+            index = {name: i for i, name in enumerate(variables)}
+            if len(index) == len(variables) and all(
+                    name in index and self._is_plain_name(name) for row in rows for name in row[1]):
+                matrix = np.zeros((len(rows), len(variables)))
+                rhs = np.empty(len(rows))
+                for r, (_, coeffs, constant) in enumerate(rows):
+                    for name, c in coeffs.items():
+                        matrix[r, index[name]] = c
+                    rhs[r] = constant
+                solution = self.solve_matrix(matrix, rhs)
+                if solution is not None:
+                    self.numeric_solves += 1
+                    return {name: float(value) for name, value in zip(variables, solution)}
+
+        self.symbolic_solves += 1
+        return self.solve_symbolic(equations, variables)
+
+    def solve_matrix(self, matrix: np.ndarray, rhs: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Unique solution of matrix @ x = rhs, or None when the system is
+        singular, underdetermined or inconsistent (left to sympy).
+        Values within tol of an integer are snapped to it, as the exact
+        rational sympy would give.
+        """
+        m, n = matrix.shape
+        if m < n or not np.all(np.isfinite(matrix)) or not np.all(np.isfinite(rhs)):
+            return None
+        if np.linalg.matrix_rank(matrix) < n:
+            return None
+        if m == n:
+            solution = np.linalg.solve(matrix, rhs)
+        else:
+            solution = np.linalg.lstsq(matrix, rhs, rcond=None)[0]
+            scale = np.abs(matrix) @ np.abs(solution) + np.abs(rhs) + 1.0
+            if np.any(np.abs(matrix @ solution - rhs) > self.tol * 1e3 * scale):
+                return None
+
+        rounded = np.rint(solution)
+        close = np.abs(solution - rounded) <= self.tol * np.maximum(1.0, np.abs(solution))
+        return np.where(close, rounded, solution) + 0.0  # no "-0.0"
+
+    def parse_equation(self, equation: str) -> tuple:
+        """Cached ('linear', coeffs, constant) for lhs - rhs = 0, else ('nonlinear',) or ('invalid',)"""
+        parsed = self._cached(self._parsed, equation)
+        if parsed is not None:
+            return parsed
+
+        sides = equation.split('=')
+        if len(sides) != 2:
+            parsed = ('invalid',)
+        else:
+            try:
+                left = _LinearParser(sides[0]).parse()
+                right = _LinearParser(sides[1]).parse()
+                coeffs, constant = _add(left, right, -1.0)
+                parsed = ('linear', {name: c for name, c in coeffs.items() if c != 0}, -constant)
+            except NotLinear:
+                parsed = ('nonlinear',)
+        return self._store(self._parsed, equation, parsed)
+
+    def symbolic_equation(self, equation: str):
+        """Cached sympy Eq for an equation string (None if sympify rejects it)"""
+        eq = self._cached(self._symbolic, equation, missing=False)
+        if eq is not False:
+            return eq
+
+        import sympy as sp
+        try:
+            left, right = equation.split('=')
+            eq = sp.Eq(sp.sympify(left), sp.sympify(right))
+        except Exception:
+            eq = None
+        return self._store(self._symbolic, equation, eq)
+
+    def _cached(self, cache: OrderedDict, key: str, missing=None):
+        """LRU lookup: marks key as recently used, `missing` if absent"""
+        if key in cache:
+            cache.move_to_end(key)
+            self.cache_hits += 1
+            return cache[key]
+        self.cache_misses += 1
+        return missing
+
+    def _store(self, cache: OrderedDict, key: str, value):
+        cache[key] = value
+        while len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return value
+
+    def solve_symbolic(self, equations: List[str], variables: List[str]) -> Dict[str, float]:
+        """sympy.solve on the cached parsed equations (any system sympy can handle)"""
+        # sympy costs ~0.4s to import, so only pay for it when it is needed
+        import sympy as sp
+        try:
+            syms = sp.symbols(' '.join(variables))
+            eqs = []
+            for equation in equations:
+                eq = self.symbolic_equation(equation)
+                if eq is None:
+                    return {}
+                eqs.append(eq)
+
+            solution = sp.solve(eqs, syms)
+            return {str(var): float(val) for var, val in solution.items()}
+        except Exception:
+            return {}
+
+    def _is_plain_name(self, name: str) -> bool:
+        """True if sympify reads name as a plain symbol (E, I, pi, gamma... are not)"""
+        if _SHORT_NAME.fullmatch(name):
+            return name not in _SYMPY_CONSTANTS
+        plain = self._plain_names.get(name)
+        if plain is None:
+            import sympy as sp
+            try:
+                value = sp.sympify(name)
+                plain = isinstance(value, sp.Symbol) and value.name == name
+            except Exception:
+                plain = False
+            self._plain_names[name] = plain
+        return plain
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'numeric_solves': self.numeric_solves,
+            'symbolic_solves': self.symbolic_solves,
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses,
+            'cached_equations': len(self._parsed),
+            'cached_symbolic': len(self._symbolic),
+        }
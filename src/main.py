@@ -3,34 +3,191 @@
 
 import pandas as pd
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
 from tqdm import tqdm
 import warnings
 import time
+import os
+import json
+import argparse
 import numpy as np
-from sklearn.metrics import f1_score, accuracy_score, classification_report, confusion_matrix
+from concurrent.futures import ProcessPoolExecutor
 warnings.filterwarnings('ignore')
 
-from preprocess import DataPreprocessor
-from reasoning_agent import ReasoningAgent
+from preprocess import DataPreprocessor, DEFAULT_CHUNK_SIZE, problem_records
+from data_io import DATA_FORMATS, TableWriter, write_table
+from reasoning_agent import ReasoningAgent, TRACE_FULL
 from verifier import ReasoningVerifier
-from trace_logger import TraceLogger
+from trace_logger import TraceLogger, StreamingTraceLogger, TraceSampler
 from ml_enhancer import MLEnhancer, EnsemblePredictor
+from parsed_problem import ParsedProblem
+from latency import StageProfiler
+from prediction_cache import PredictionCache, model_fingerprint
+
+
+# Per-process components for parallel inference (set up by _init_worker)
+_worker_agent = None
+_worker_ensemble = None
+_worker_verifier = None
+_worker_profile_stages = False
+_worker_trace_sampler = None
+
+
+def _init_worker(ml_enhancer, profile_stages=False, trace_level='full', trace_sampler=None):
+    """Build one agent/ensemble/verifier per worker process.
+    The trained MLEnhancer arrives once here instead of with every shard."""
+    global _worker_agent, _worker_ensemble, _worker_verifier, _worker_profile_stages, _worker_trace_sampler
+    _worker_agent = ReasoningAgent(trace_level=trace_level)
+    _worker_ensemble = EnsemblePredictor(ml_enhancer) if ml_enhancer.trained else None
+    _worker_verifier = ReasoningVerifier()
+    _worker_profile_stages = profile_stages
+    _worker_trace_sampler = trace_sampler
+
+
+def _trace_to_log(agent, sampler, idx, problem, parsed, trace, prediction, confidence, default_keep):
+    """
+    The trace to log for one problem, or None to log nothing.
+    Without a sampler: the trace the run recorded (re-run for answers served
+    from the prediction cache), if default_keep.
+    With one: problems it keeps are re-run at full trace level unless the run
+    already was (the agent is deterministic, so the answer is the same).
+    """
+    if sampler is None:
+        if not default_keep:
+            return None
+        if trace is None and agent.trace_level:
+            return _retrace(agent, problem, parsed, None)  # Answer came from the prediction cache
+        return trace
+    
+    label = problem.get('correct_option_number')
+    is_correct = None if label is None or label != label else bool(prediction == label)  # NaN: unlabelled
+    if not sampler.keep(idx, is_correct, confidence):
+        return None
+    if trace is not None and agent.trace_level >= TRACE_FULL:
+        return trace
+    return _retrace(agent, problem, parsed, 'full')
+
+
+def _retrace(agent, problem, parsed, trace_level):
+    """Re-run the agent only for its trace (None: the agent's own trace level)"""
+    profiler, agent.profiler = agent.profiler, None  # Keep the re-run out of the stage timings
+    try:
+        _, trace = agent.reason_step_by_step(problem, parsed, trace_level=trace_level)
+    finally:
+        agent.profiler = profiler
+    return trace
+
+
+def _predict_shard(start_idx, records, trace_limit):
+    """
+    Run the inference loop over one shard of test problems inside a worker.
+    Returns predictions and timings in input order plus traces for rows < trace_limit
+    (or those the worker's trace sampler keeps) and the shard's stage latencies
+    """
+    predictions = []
+    times = []
+    traces = []
+    shard_start = time.time()
+    profiler = StageProfiler() if _worker_profile_stages else None
+    _worker_agent.profiler = profiler
+    
+    # Sequence problems are classified together in one batched pass
+    parsed_problems = [ParsedProblem(problem) for problem in records]
+    _worker_agent.prepare_sequence_batch(parsed_problems)
+    
+    for offset, (problem, parsed) in enumerate(zip(records, parsed_problems)):
+        idx = start_idx + offset
+        start_time = time.time()
+        if profiler is not None:
+            start_mark = time.perf_counter_ns()
+        
+        prediction, trace = _worker_agent.reason_step_by_step(problem, parsed)
+        if profiler is not None:
+            mark = time.perf_counter_ns()
+        confidence = 0.8
+        
+        if _worker_ensemble:
+            corrected_prediction, confidence = _worker_ensemble.ensemble_predict(
+                problem, prediction, 0.8, parsed
+            )
+            if profiler is not None:
+                profiler.lap('ensemble', parsed.topic, mark)
+        else:
+            corrected_prediction = _worker_verifier.apply_correction_heuristics(
+                problem, prediction, trace, parsed
+            )
+            if profiler is not None:
+                profiler.lap('verifier', parsed.topic, mark)
+        if profiler is not None:
+            profiler.lap('total', parsed.topic, start_mark)
+        
+        times.append(time.time() - start_time)
+        predictions.append(corrected_prediction)
+        
+        logged_trace = _trace_to_log(_worker_agent, _worker_trace_sampler, idx, problem, parsed,
+                                     trace, corrected_prediction, confidence, idx < trace_limit)
+        if logged_trace is not None:
+            traces.append((idx, problem, corrected_prediction, list(logged_trace),
+                           _worker_verifier.get_verification_report()))
+    
+    return {
+        'start_idx': start_idx,
+        'predictions': predictions,
+        'times': times,
+        'traces': traces,
+        'pid': os.getpid(),
+        'busy_time': time.time() - shard_start,
+        'profiler': profiler,
+    }
+
+
+def iter_jsonl_problems(path) -> Iterator[Tuple[int, Any]]:
+    """
+    Lazily yield (line_number, record) from a JSONL file, one line at a time.
+    Malformed lines are yielded as the json.JSONDecodeError instead of a record.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, e
 
 
 class SolvraPipeline:
     # Main class to run everything
     
-    def __init__(self, data_dir: str = "../data", reports_dir: str = "../reports"):
+    def __init__(self, data_dir: str = "../data", reports_dir: str = "../reports",
+                 stream_traces: bool = False, ml_model_path: Optional[str] = None,
+                 profile_stages: bool = True, trace_level: str = 'full',
+                 trace_sampler: Optional[TraceSampler] = None, data_format: str = 'csv',
+                 prediction_cache: Optional[PredictionCache] = None):
         self.data_dir = Path(data_dir)
         self.reports_dir = Path(reports_dir)
         
-        # Initialize components
-        self.preprocessor = DataPreprocessor(data_dir=str(self.data_dir))
-        self.agent = ReasoningAgent()
+        # Initialize components (data_format: csv, parquet or feather for data files)
+        self.preprocessor = DataPreprocessor(data_dir=str(self.data_dir), data_format=data_format)
+        self.data_format = data_format
+        self.agent = ReasoningAgent(trace_level=trace_level)
         self.verifier = ReasoningVerifier()
-        self.logger = TraceLogger(log_dir=str(self.reports_dir))
         
-        # Initialize ML components
+        # How much reasoning to record, and (optionally) which problems keep a
+        # full trace: a random sample and/or wrong or low-confidence ones
+        self.trace_level = trace_level
+        self.trace_sampler = trace_sampler
+        
+        # Streaming traces go to disk as they are logged (bounded memory)
+        self.stream_traces = stream_traces
+        if stream_traces:
+            self.logger = StreamingTraceLogger(log_dir=str(self.reports_dir), background=True)
+        else:
+            self.logger = TraceLogger(log_dir=str(self.reports_dir))
+        
+        # Initialize ML components (a saved model replaces training when given)
+        self.ml_model_path = ml_model_path
         self.ml_enhancer = MLEnhancer()
         self.ensemble = None
         
@@ -42,12 +199,28 @@ class SolvraPipeline:
         # Performance metrics
         self.inference_times = []
         self.performance_metrics = {}
+        
+        # Per-stage, per-topic latency histograms for prediction runs
+        self.profile_stages = profile_stages
+        self.stage_profiler = None
+        
+        # Optional cache of final predictions (memory LRU + SQLite file),
+        # used by the serial, chunked and streaming prediction paths
+        self.prediction_cache = prediction_cache
     
-    def load_and_preprocess(self):
-        """Load and preprocess all data"""
+    def load_and_preprocess(self, reuse_preprocessed: bool = False):
+        """
+        Load and preprocess all data
+        reuse_preprocessed reloads the saved *_preprocessed files when they exist
+        """
         print("🚀 SOLVRA PIPELINE STARTED")
         print("="*60 + "\n")
         
+        if reuse_preprocessed and all(self.preprocessor.data_path(f"{split}_preprocessed").exists()
+                                      for split in ('train', 'test')):
+            self.train_df, self.test_df = self.preprocessor.load_preprocessed_data()
+            return
+        
         # Load data
         self.train_df, self.test_df = self.preprocessor.load_data()
         
@@ -58,6 +231,17 @@ class SolvraPipeline:
         # Save preprocessed data
         self.preprocessor.save_preprocessed_data()
     
+    def train_ml_enhancer(self):
+        """Load the saved ML enhancer if one was given, otherwise train on train_df"""
+        if self.ml_model_path:
+            start_time = time.time()
+            self.ml_enhancer = MLEnhancer.load(self.ml_model_path)
+            load_time = time.time() - start_time
+            print(f" Loaded ML Enhancer from {self.ml_model_path} ({load_time*1000:.1f} ms)")
+            self.performance_metrics['ml_load_time'] = load_time
+        else:
+            self.ml_enhancer.train(self.train_df)
+    
     def train_on_examples(self, num_examples: int = 50):
         """
         Enhanced training: Learn patterns from training data + analyze examples
@@ -65,8 +249,8 @@ class SolvraPipeline:
         print(f"\n🎓 Training ML Enhancer on all {len(self.train_df)} examples...")
         print("-"*60)
         
-        # Train ML enhancer on full training set
-        self.ml_enhancer.train(self.train_df)
+        # Train ML enhancer on full training set (or load the saved one)
+        self.train_ml_enhancer()
         
         # Initialize ensemble predictor
         self.ensemble = EnsemblePredictor(self.ml_enhancer)
@@ -79,34 +263,39 @@ class SolvraPipeline:
         y_pred = []
         train_times = []
         
-        for idx in tqdm(range(min(num_examples, len(self.train_df))), desc="Analyzing"):
-            problem = self.train_df.iloc[idx].to_dict()
-            
+        examples = problem_records(self.train_df.iloc[:num_examples])
+        for idx, problem in enumerate(tqdm(examples, desc="Analyzing")):
             # Track inference time
             start_time = time.time()
             
+            # Parse once and share across every stage
+            parsed = ParsedProblem(problem)
+            
             # Run reasoning
-            prediction, trace = self.agent.reason_step_by_step(problem)
+            prediction, trace = self.agent.reason_step_by_step(problem, parsed)
             
             # Use ensemble prediction
             final_prediction, confidence = self.ensemble.ensemble_predict(
-                problem, prediction, 0.8  # Base confidence
+                problem, prediction, 0.8, parsed  # Base confidence
             )
             
             # Verify and correct if needed
             corrected_prediction = self.verifier.apply_correction_heuristics(
-                problem, final_prediction, trace
+                problem, final_prediction, trace, parsed
             )
             
             # Record inference time
             inference_time = time.time() - start_time
             train_times.append(inference_time)
             
-            # Log trace
-            self.logger.log_problem_trace(
-                idx, problem, corrected_prediction, trace,
-                self.verifier.get_verification_report()
-            )
+            # Log trace (every example, or those the sampler keeps)
+            logged_trace = _trace_to_log(self.agent, self.trace_sampler, idx, problem, parsed,
+                                         trace, corrected_prediction, confidence, True)
+            if logged_trace is not None:
+                self.logger.log_problem_trace(
+                    idx, problem, corrected_prediction, logged_trace,
+                    self.verifier.get_verification_report()
+                )
             
             # Collect for metrics
             true_label = problem.get('correct_option_number')
@@ -117,7 +306,8 @@ class SolvraPipeline:
             if corrected_prediction == true_label:
                 correct_count += 1
         
-        # Calculate metrics
+        # Calculate metrics (sklearn is imported here, not at startup)
+        from sklearn.metrics import f1_score
         accuracy = (correct_count / num_examples) * 100
         f1_macro = f1_score(y_true, y_pred, average='macro') * 100
         avg_inference_time = np.mean(train_times)
@@ -138,40 +328,50 @@ class SolvraPipeline:
         
         return accuracy
     
-    def predict_test_set(self, save_traces: bool = True):
+    def predict_test_set(self, save_traces: bool = True, workers: int = 1):
         """
         Generate predictions for the entire test set using ensemble approach
+        workers > 1 shards the test set across a process pool
         """
         print(f"\n Generating predictions for {len(self.test_df)} test problems...")
         print("-"*60)
         
         if not self.ml_enhancer.trained:
             print("  Warning: ML enhancer not trained. Training now...")
-            self.ml_enhancer.train(self.train_df)
+            self.train_ml_enhancer()
             self.ensemble = EnsemblePredictor(self.ml_enhancer)
         
         self.predictions = []
         self.inference_times = []
+        self.stage_profiler = StageProfiler() if self.profile_stages else None
+        
+        if workers > 1:
+            return self._predict_test_set_parallel(save_traces, workers)
+        
+        profiler = self.stage_profiler
+        self.agent.profiler = profiler
+        cache = self._keyed_cache()
+        
+        # Parse once and share across every stage; sequence problems are
+        # classified together in one batched pass
+        problems = problem_records(self.test_df)
+        parsed_problems = [ParsedProblem(problem) for problem in problems]
+        batch_start = time.time()
+        self.agent.prepare_sequence_batch(parsed_problems)
+        sequence_batch_time = time.time() - batch_start
         
         for idx in tqdm(range(len(self.test_df)), desc="Predicting"):
-            problem = self.test_df.iloc[idx].to_dict()
+            problem = problems[idx]
+            parsed = parsed_problems[idx]
             
             # Track inference time
             start_time = time.time()
+            if profiler is not None:
+                start_mark = time.perf_counter_ns()
             
-            # Run reasoning
-            prediction, trace = self.agent.reason_step_by_step(problem)
-            
-            # Use ensemble prediction for better accuracy
-            if self.ensemble:
-                corrected_prediction, confidence = self.ensemble.ensemble_predict(
-                    problem, prediction, 0.8
-                )
-            else:
-                # Fallback to verification
-                corrected_prediction = self.verifier.apply_correction_heuristics(
-                    problem, prediction, trace
-                )
+            corrected_prediction, confidence, trace, cached = self._answer(problem, parsed, profiler, cache)
+            if profiler is not None and not cached:
+                profiler.lap('total', parsed.topic, start_mark)
             
             # Record inference time
             inference_time = time.time() - start_time
@@ -179,12 +379,18 @@ class SolvraPipeline:
             
             self.predictions.append(corrected_prediction)
             
-            # Log trace (optional for test set)
-            if save_traces and idx < 20:  # Save first 20 for review
-                self.logger.log_problem_trace(
-                    idx, problem, corrected_prediction, trace,
-                    self.verifier.get_verification_report()
-                )
+            # Log trace (optional for test set): the first 20, or those the sampler keeps
+            if save_traces:
+                logged_trace = _trace_to_log(self.agent, self.trace_sampler, idx, problem, parsed,
+                                             trace, corrected_prediction, confidence, idx < 20)
+                if logged_trace is not None:
+                    self.logger.log_problem_trace(
+                        idx, problem, corrected_prediction, logged_trace,
+                        self.verifier.get_verification_report()
+                    )
+        
+        self.agent.profiler = None
+        self._store_cache_stats()
         
         # Calculate test metrics
         avg_test_time = np.mean(self.inference_times)
@@ -193,16 +399,144 @@ class SolvraPipeline:
         print(f" Predictions complete")
         print(f"  Average Inference Time: {avg_test_time:.4f}s per problem")
         print(f"  Total Test Time: {total_test_time:.2f}s")
+        print(f"  Sequence Batch Time: {sequence_batch_time:.4f}s")
         
         # Store metrics
         self.performance_metrics['test_avg_time'] = avg_test_time
         self.performance_metrics['test_total_time'] = total_test_time
+        self.performance_metrics['test_sequence_batch_time'] = sequence_batch_time
+        self._store_stage_latency('test_stage_latency')
+        self.performance_metrics.pop('test_workers', None)
+        self.performance_metrics.pop('test_worker_stats', None)
+        return self.predictions
+    
+    def _answer(self, problem, parsed, profiler, cache):
+        """
+        One test-set answer: the agent, then the ensemble (or, without one,
+        the verifier). Returns (prediction, confidence, trace, cached); answers
+        served from the prediction cache come back with no trace.
+        """
+        if cache is not None:
+            key = cache.key(problem, 'ensemble' if self.ensemble else 'verifier')
+            hit = cache.get(key)
+            if hit is not None:
+                return hit['prediction'], hit['confidence'], None, True
+        
+        # Run reasoning (the agent times its own stages)
+        prediction, trace = self.agent.reason_step_by_step(problem, parsed)
+        if profiler is not None:
+            mark = time.perf_counter_ns()
+        confidence = 0.8
+        
+        # Use ensemble prediction for better accuracy
+        if self.ensemble:
+            prediction, confidence = self.ensemble.ensemble_predict(
+                problem, prediction, confidence, parsed
+            )
+            if profiler is not None:
+                profiler.lap('ensemble', parsed.topic, mark)
+        else:
+            # Fallback to verification
+            prediction = self.verifier.apply_correction_heuristics(
+                problem, prediction, trace, parsed
+            )
+            if profiler is not None:
+                profiler.lap('verifier', parsed.topic, mark)
+        
+        if cache is not None:
+            cache.put(key, {'prediction': int(prediction), 'confidence': float(confidence)})
+        return prediction, confidence, trace, False
+    
+    def _keyed_cache(self) -> Optional[PredictionCache]:
+        """The prediction cache, keyed to the current code and ML model (None if disabled)"""
+        if self.prediction_cache is not None:
+            self.prediction_cache.set_fingerprint(model_fingerprint(self.ml_enhancer))
+        return self.prediction_cache
+    
+    def _store_cache_stats(self):
+        """Flush the prediction cache and put its counters in performance_metrics"""
+        if self.prediction_cache is not None:
+            self.prediction_cache.flush()
+            self.performance_metrics['prediction_cache'] = self.prediction_cache.stats()
+    
+    def _predict_test_set_parallel(self, save_traces: bool, workers: int,
+                                   shards_per_worker: int = 4):
+        """
+        Shard the test set across a process pool
+        Predictions are reassembled in input order and match the serial loop
+        (workers do not share the prediction cache, so it is bypassed here)
+        """
+        records = self.test_df.to_dict('records')  # Plain dicts: shards are pickled
+        num_shards = min(len(records), workers * shards_per_worker) or 1
+        bounds = np.linspace(0, len(records), num_shards + 1).astype(int)
+        shards = [(int(bounds[i]), records[bounds[i]:bounds[i+1]])
+                  for i in range(num_shards) if bounds[i] < bounds[i+1]]
+        trace_limit = 20 if save_traces else 0  # Save first 20 for review
+        
+        wall_start = time.time()
+        results = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.ml_enhancer, self.profile_stages, self.trace_level,
+                                           self.trace_sampler if save_traces else None)) as executor:
+            futures = [executor.submit(_predict_shard, start, shard, trace_limit)
+                       for start, shard in shards]
+            for future in tqdm(futures, desc=f"Predicting ({workers} workers)"):
+                results.append(future.result())
+        wall_time = time.time() - wall_start
+        
+        # Reassemble in input order and aggregate per-worker throughput
+        worker_stats = {}
+        for result in sorted(results, key=lambda r: r['start_idx']):
+            self.predictions.extend(result['predictions'])
+            self.inference_times.extend(result['times'])
+            for trace_args in result['traces']:
+                self.logger.log_problem_trace(*trace_args)
+            if result['profiler'] is not None:
+                self.stage_profiler.merge(result['profiler'])
+            
+            stats = worker_stats.setdefault(result['pid'], {'problems': 0, 'busy_time': 0.0})
+            stats['problems'] += len(result['predictions'])
+            stats['busy_time'] += result['busy_time']
+        
+        worker_list = []
+        for worker_id, (pid, stats) in enumerate(sorted(worker_stats.items())):
+            busy = stats['busy_time']
+            worker_list.append({
+                'worker': worker_id,
+                'pid': pid,
+                'problems': stats['problems'],
+                'busy_time': busy,
+                'throughput': stats['problems'] / busy if busy > 0 else 0.0,
+            })
+        
+        avg_test_time = np.mean(self.inference_times) if self.inference_times else 0.0
+        
+        print(f" Predictions complete")
+        print(f"  Average Inference Time: {avg_test_time:.4f}s per problem")
+        print(f"  Total Test Time: {wall_time:.2f}s (wall clock, {workers} workers)")
+        
+        # Store metrics (total time is wall clock so throughput reflects the pool)
+        self.performance_metrics['test_avg_time'] = avg_test_time
+        self.performance_metrics['test_total_time'] = wall_time
+        self.performance_metrics['test_workers'] = workers
+        self.performance_metrics['test_worker_stats'] = worker_list
+        self._store_stage_latency('test_stage_latency')
+        self.performance_metrics.pop('test_sequence_batch_time', None)  # Inside worker busy time
         return self.predictions
     
-    def save_predictions(self, filename: str = "predictions.csv"):
+    def _store_stage_latency(self, key: str):
+        """Put the stage profiler's histograms (if profiling) into performance_metrics[key]"""
+        if self.stage_profiler is not None:
+            self.performance_metrics[key] = self.stage_profiler.summary()
+        else:
+            self.performance_metrics.pop(key, None)
+    
+    def save_predictions(self, filename: Optional[str] = None):
         """
         Save predictions in the required format with all columns
+        The file format follows filename's extension (default: predictions.<data format>)
         """
+        filename = filename or f"predictions{DATA_FORMATS[self.data_format]}"
         output_path = self.data_dir / filename
         
         # Create submission DataFrame with all required columns
@@ -222,13 +556,13 @@ class SolvraPipeline:
         
         # Try to save, handle permission errors by using temp file
         try:
-            submission_df.to_csv(output_path, index=False)
+            write_table(submission_df, output_path)
         except PermissionError:
             # File might be open, try alternate name
-            temp_path = self.data_dir / "predictions_new.csv"
-            submission_df.to_csv(temp_path, index=False)
+            temp_path = output_path.with_name(f"{output_path.stem}_new{output_path.suffix}")
+            write_table(submission_df, temp_path)
             output_path = temp_path
-            print(f"  Original file locked, saved as predictions_new.csv instead")
+            print(f"  Original file locked, saved as {temp_path.name} instead")
         
         print(f"\n Predictions saved to: {output_path}")
         
@@ -236,6 +570,215 @@ class SolvraPipeline:
         print("\n Sample predictions:")
         print(submission_df.head(10))
     
+    def predict_chunks(self, chunks: Iterable[pd.DataFrame], filename: Optional[str] = None,
+                       save_traces: bool = True) -> int:
+        """
+        predict_test_set + save_predictions over a stream of preprocessed test
+        chunks: each chunk is predicted and appended to the predictions file,
+        then dropped, so memory is bounded by the chunk size
+        Returns the number of problems predicted
+        """
+        output_path = self.data_dir / (filename or f"predictions{DATA_FORMATS[self.data_format]}")
+        if self.ensemble is None and self.ml_enhancer.trained:
+            self.ensemble = EnsemblePredictor(self.ml_enhancer)
+        if self.ensemble is not None:
+            self.ensemble.set_history_limit(1000)  # Bounded memory for long runs
+        
+        profiler = self.stage_profiler = StageProfiler() if self.profile_stages else None
+        self.agent.profiler = profiler
+        cache = self._keyed_cache()
+        
+        idx = 0
+        total_time = 0.0
+        with TableWriter(output_path) as writer:
+            for chunk in chunks:
+                problems = problem_records(chunk)
+                parsed_problems = [ParsedProblem(problem) for problem in problems]
+                self.agent.prepare_sequence_batch(parsed_problems)
+                
+                predictions = []
+                for problem, parsed in zip(problems, parsed_problems):
+                    start_time = time.time()
+                    if profiler is not None:
+                        start_mark = time.perf_counter_ns()
+                    
+                    # Same ensemble/verifier choice as predict_test_set
+                    prediction, confidence, trace, cached = self._answer(problem, parsed, profiler, cache)
+                    if profiler is not None and not cached:
+                        profiler.lap('total', parsed.topic, start_mark)
+                    total_time += time.time() - start_time
+                    predictions.append(prediction)
+                    
+                    if save_traces:
+                        logged_trace = _trace_to_log(self.agent, self.trace_sampler, idx, problem, parsed,
+                                                     trace, prediction, confidence, idx < 20)
+                        if logged_trace is not None:
+                            self.logger.log_problem_trace(
+                                idx, problem, prediction, logged_trace,
+                                self.verifier.get_verification_report()
+                            )
+                    idx += 1
+                
+                submission_df = pd.DataFrame({
+                    'topic': chunk['topic'].values,
+                    'problem_statement': chunk['problem_statement'].values,
+                    'solution': chunk['solution'].values if 'solution' in chunk.columns else [''] * len(chunk),
+                    'correct option': predictions
+                })
+                writer.write(submission_df)
+        
+        self.agent.profiler = None
+        self._store_cache_stats()
+        
+        print(f" Predicted {idx} test problems")
+        if idx:
+            print(f"  Average Inference Time: {total_time / idx:.4f}s per problem")
+        print(f"  Total Test Time: {total_time:.2f}s")
+        print(f"\n Predictions saved to: {output_path}")
+        self.performance_metrics['test_avg_time'] = total_time / idx if idx else 0.0
+        self.performance_metrics['test_total_time'] = total_time
+        self._store_stage_latency('test_stage_latency')
+        return idx
+    
+    def run_chunked_pipeline(self, chunksize: int = DEFAULT_CHUNK_SIZE):
+        """
+        Bounded-memory variant of run_full_pipeline for problem files too large
+        to load whole: train.csv and test.csv are read chunksize rows at a time,
+        each chunk is preprocessed, saved, learned from (train) or predicted
+        (test) and dropped. Topic statistics are aggregated as chunks pass.
+        """
+        print(f"🚀 SOLVRA PIPELINE STARTED (chunks of {chunksize:,} rows)")
+        print("="*60 + "\n")
+        
+        train_chunks = self.preprocessor.save_chunks(self.preprocessor.iter_chunks('train', chunksize), 'train')
+        if self.ml_model_path:
+            for _ in train_chunks:
+                pass  # Still write train_preprocessed.csv
+            self.train_ml_enhancer()
+        else:
+            self.ml_enhancer.train_chunks(train_chunks)
+        print(f"\n Training topics distribution:")
+        print(self.preprocessor.topic_distribution('train'))
+        
+        print(f"\n Generating predictions chunk by chunk...")
+        print("-"*60)
+        test_chunks = self.preprocessor.save_chunks(self.preprocessor.iter_chunks('test', chunksize), 'test')
+        self.predict_chunks(test_chunks)
+        if self.stage_profiler is not None and self.stage_profiler.histograms:
+            print("\n".join(self.stage_profiler.report_lines()))
+        if self.prediction_cache is not None:
+            print("\n".join(self.prediction_cache.report_lines()))
+        
+        self.logger.save_traces_json()
+        if self.stream_traces:
+            self.logger.close()
+        
+        print("\n" + "="*60)
+        print(" SOLVRA PIPELINE COMPLETED SUCCESSFULLY")
+        print("="*60)
+    
+    def prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Clean a single raw problem and add its problem-type flags"""
+        return self.preprocessor.prepare_record(record)
+    
+    def stream_predictions(self, input_path: str, output_path: str) -> int:
+        """
+        Streaming inference over a JSONL file of problems
+        Each record runs through the agent, ensemble and verifier and its result
+        is written to the output JSONL straight away, so memory stays flat
+        Returns the number of records written
+        """
+        print(f"\n Streaming predictions: {input_path} -> {output_path}")
+        print("-"*60)
+        
+        if self.ml_enhancer.trained and self.ensemble is None:
+            self.ensemble = EnsemblePredictor(self.ml_enhancer, history_limit=1000)
+        elif self.ensemble is not None:
+            self.ensemble.set_history_limit(1000)
+        
+        written = 0
+        errors = 0
+        start = time.time()
+        self.stage_profiler = StageProfiler() if self.profile_stages else None
+        profiler = self.stage_profiler
+        self.agent.profiler = profiler
+        cache = self._keyed_cache()
+        
+        # Line buffered so each result is visible as soon as it is written
+        with open(output_path, 'w', encoding='utf-8', buffering=1) as out:
+            for line_number, record in iter_jsonl_problems(input_path):
+                result = {'line': line_number}
+                if isinstance(record, dict) and 'id' in record:
+                    result['id'] = record['id']
+                
+                try:
+                    if isinstance(record, json.JSONDecodeError):
+                        raise ValueError(f"invalid JSON: {record}")
+                    if not isinstance(record, dict):
+                        raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+                    problem = self.prepare_record(record)
+                    parsed = ParsedProblem(problem)
+                    problem_start = time.time()
+                    if profiler is not None:
+                        start_mark = time.perf_counter_ns()
+                    
+                    # Same key as the inference server, whose answers match these
+                    hit = None
+                    if cache is not None:
+                        key = cache.key(problem, 'ensemble+verifier' if self.ensemble else 'verifier')
+                        hit = cache.get(key)
+                    if hit is not None:
+                        prediction, confidence, verification = hit['prediction'], hit['confidence'], hit['verification']
+                    else:
+                        prediction, trace = self.agent.reason_step_by_step(problem, parsed)
+                        if profiler is not None:
+                            mark = time.perf_counter_ns()
+                        confidence = 0.8
+                        if self.ensemble:
+                            prediction, confidence = self.ensemble.ensemble_predict(
+                                problem, prediction, confidence, parsed
+                            )
+                            if profiler is not None:
+                                mark = profiler.lap('ensemble', parsed.topic, mark)
+                        prediction = self.verifier.apply_correction_heuristics(
+                            problem, prediction, trace, parsed
+                        )
+                        if profiler is not None:
+                            profiler.lap('verifier', parsed.topic, mark)
+                            profiler.lap('total', parsed.topic, start_mark)
+                        verification = list(self.verifier.warnings)
+                        if cache is not None:
+                            cache.put(key, {'prediction': int(prediction), 'confidence': float(confidence),
+                                            'verification': verification})
+                    
+                    result.update({
+                        'topic': problem.get('topic'),
+                        'predicted_option': int(prediction),
+                        'confidence': round(float(confidence), 4),
+                        'inference_time': time.time() - problem_start,
+                        'verification': verification,
+                    })
+                except (KeyError, TypeError, ValueError, AttributeError) as e:
+                    errors += 1
+                    result['error'] = f"{type(e).__name__}: {e}"
+                
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                written += 1
+        
+        self.agent.profiler = None
+        self._store_stage_latency('stream_stage_latency')
+        self._store_cache_stats()
+        
+        elapsed = time.time() - start
+        print(f" Streamed {written} records ({errors} errors) in {elapsed:.2f}s")
+        if elapsed > 0:
+            print(f"  Throughput: {written / elapsed:.2f} problems/sec")
+        if profiler is not None and profiler.histograms:
+            print("\n".join(profiler.report_lines()))
+        if cache is not None:
+            print("\n".join(cache.report_lines()))
+        return written
+    
     def generate_reports(self):
         """
         Generate all analysis reports
@@ -284,6 +827,16 @@ class SolvraPipeline:
             report_lines.append(f"  Throughput:         {len(self.test_df)/self.performance_metrics['test_total_time']:.2f} problems/sec")
             report_lines.append("")
         
+        # Per-worker throughput for parallel runs
+        if self.performance_metrics.get('test_worker_stats'):
+            report_lines.append(f" PARALLEL WORKERS ({self.performance_metrics['test_workers']} processes)")
+            report_lines.append("-"*70)
+            for stats in self.performance_metrics['test_worker_stats']:
+                report_lines.append(f"  Worker {stats['worker']:<3d} (pid {stats['pid']}): "
+                                    f"{stats['problems']:6d} problems, "
+                                    f"{stats['throughput']:.2f} problems/sec")
+            report_lines.append("")
+        
         # Inference Time Distribution
         if self.inference_times:
             report_lines.append("  INFERENCE TIME ANALYSIS")
@@ -294,6 +847,21 @@ class SolvraPipeline:
             report_lines.append(f"  Std Dev:            {np.std(self.inference_times):.4f}s")
             report_lines.append("")
         
+        # Where the time goes: per-stage and per-topic percentiles
+        if self.stage_profiler is not None and self.stage_profiler.histograms:
+            report_lines.append("  STAGE LATENCY")
+            report_lines.append("-"*70)
+            report_lines.extend(self.stage_profiler.report_lines())
+            report_lines.append("")
+        
+        # Repeated problems answered from the prediction cache
+        if self.prediction_cache is not None:
+            self._store_cache_stats()
+            report_lines.append("  PREDICTION CACHE")
+            report_lines.append("-"*70)
+            report_lines.extend(self.prediction_cache.report_lines())
+            report_lines.append("")
+        
         # System Configuration
         report_lines.append("  SYSTEM CONFIGURATION")
         report_lines.append("-"*70)
@@ -335,12 +903,13 @@ class SolvraPipeline:
         pass
     
     def run_full_pipeline(self, train_samples: int = 100, 
-                         generate_test_predictions: bool = True):
+                         generate_test_predictions: bool = True,
+                         workers: int = 1, reuse_preprocessed: bool = False):
         """
         Run the complete pipeline end-to-end
         """
         # Step 1: Load and preprocess
-        self.load_and_preprocess()
+        self.load_and_preprocess(reuse_preprocessed=reuse_preprocessed)
         
         # Step 2: Analyze training examples
         train_accuracy = self.train_on_examples(num_examples=train_samples)
@@ -350,12 +919,15 @@ class SolvraPipeline:
         
         # Step 4: Generate test predictions
         if generate_test_predictions:
-            self.predict_test_set(save_traces=True)
+            self.predict_test_set(save_traces=True, workers=workers)
             self.save_predictions()
         
         # Step 5: Generate comprehensive performance report
         self.generate_performance_report()
         
+        if self.stream_traces:
+            self.logger.close()
+        
         print("\n" + "="*60)
         print(" SOLVRA PIPELINE COMPLETED SUCCESSFULLY")
         print("="*60)
@@ -371,18 +943,101 @@ def main():
     """
     Main entry point for Solvra
     """
+    parser = argparse.ArgumentParser(description="Solvra agentic reasoning system")
+    parser.add_argument('--stream', metavar='INPUT_JSONL',
+                        help="stream predictions for a JSONL file of problems instead of the CSV pipeline")
+    parser.add_argument('--output', default="../data/predictions.jsonl",
+                        help="output JSONL for --stream (default: ../data/predictions.jsonl)")
+    parser.add_argument('--no-train', action='store_true',
+                        help="with --stream, skip training the ML enhancer (agent + verifier only)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="processes for test set prediction")
+    parser.add_argument('--stream-traces', action='store_true',
+                        help="write reasoning traces as JSONL while running instead of at the end")
+    parser.add_argument('--ml-model', metavar='PATH',
+                        help="load a saved ML enhancer (.npz) instead of retraining")
+    parser.add_argument('--trace-level', choices=['off', 'summary', 'full'], default='full',
+                        help="reasoning recorded per problem: nothing, the decisive steps, or everything")
+    parser.add_argument('--trace-sample', type=float, default=0.0, metavar='RATE',
+                        help="keep full traces for this random fraction of problems")
+    parser.add_argument('--trace-errors', action='store_true',
+                        help="keep full traces for wrong predictions (labelled data only)")
+    parser.add_argument('--trace-min-confidence', type=float, metavar='CONF',
+                        help="keep full traces for predictions below this confidence")
+    parser.add_argument('--no-stage-profile', action='store_true',
+                        help="skip per-stage latency histograms while predicting")
+    parser.add_argument('--chunk-size', type=int, metavar='ROWS',
+                        help="read, preprocess and predict the CSVs this many rows at a time (bounded memory)")
+    parser.add_argument('--data-format', choices=list(DATA_FORMATS), default='csv',
+                        help="format of train/test, the preprocessed files and predictions (default: csv)")
+    parser.add_argument('--reuse-preprocessed', action='store_true',
+                        help="reload the saved *_preprocessed files instead of preprocessing again")
+    parser.add_argument('--convert-data', choices=list(DATA_FORMATS), metavar='FORMAT',
+                        help="rewrite train/test (read as --data-format) in FORMAT and exit")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="SQLite prediction cache; repeated problems skip the agent (kept across runs)")
+    parser.add_argument('--cache-size', type=int, default=10_000, metavar='N',
+                        help="in-memory LRU entries in front of the cache (default: 10000)")
+    parser.add_argument('--save-ml-model', metavar='PATH',
+                        help="save the trained ML enhancer to PATH for later --ml-model runs")
+    args = parser.parse_args()
+    
+    # Sampled tracing replaces the fixed "first 20 problems" rule
+    trace_sampler = None
+    if args.trace_sample > 0 or args.trace_errors or args.trace_min_confidence is not None:
+        trace_sampler = TraceSampler(rate=args.trace_sample, errors=args.trace_errors,
+                                     min_confidence=args.trace_min_confidence)
+    
+    prediction_cache = PredictionCache(args.cache, capacity=args.cache_size) if args.cache else None
+    
     # Initialize pipeline
     pipeline = SolvraPipeline(
         data_dir="../data",
-        reports_dir="../reports"
+        reports_dir="../reports",
+        stream_traces=args.stream_traces,
+        ml_model_path=args.ml_model,
+        profile_stages=not args.no_stage_profile,
+        trace_level=args.trace_level,
+        trace_sampler=trace_sampler,
+        data_format=args.data_format,
+        prediction_cache=prediction_cache
     )
     
+    if args.convert_data:
+        pipeline.preprocessor.convert_data(args.convert_data)
+        return
+    
+    if args.stream:
+        if not args.no_train:
+            if not args.ml_model:
+                pipeline.train_df = pipeline.preprocessor.load_train_data()
+                pipeline.train_df = pipeline.preprocessor.preprocess_training_data()
+            pipeline.train_ml_enhancer()
+            if args.save_ml_model:
+                pipeline.ml_enhancer.save(args.save_ml_model)
+                print(f" ML Enhancer saved to: {args.save_ml_model}")
+        pipeline.stream_predictions(args.stream, args.output)
+        return
+    
+    if args.chunk_size:
+        pipeline.run_chunked_pipeline(chunksize=args.chunk_size)
+        if args.save_ml_model:
+            pipeline.ml_enhancer.save(args.save_ml_model)
+            print(f" ML Enhancer saved to: {args.save_ml_model}")
+        return
+    
     # Run full pipeline
     # Start with smaller sample for testing, increase for final run
     pipeline.run_full_pipeline(
         train_samples=50,  # Increase to 534 for full training analysis
-        generate_test_predictions=True
+        generate_test_predictions=True,
+        workers=args.workers,
+        reuse_preprocessed=args.reuse_preprocessed
     )
+    
+    if args.save_ml_model:
+        pipeline.ml_enhancer.save(args.save_ml_model)
+        print(f" ML Enhancer saved to: {args.save_ml_model}")
 
 
 if __name__ == "__main__":
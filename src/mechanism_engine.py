@@ -0,0 +1,372 @@
+"""
+Solvra - Mechanism Engine Module
+Gear trains, belts, shafts and levers as a graph of parts. Rotation
+direction is tracked by a union-find with parity (meshing gears turn
+opposite ways, belts and shafts keep the direction), which finds
+contradictions such as an odd cycle of meshing gears, which jams. Speeds
+are propagated from a driving part by breadth-first search with exact
+fractions. Everything is iterative and linear in parts plus connections,
+so networks of any size run without recursion limits.
+"""
+
+import re
+from collections import deque
+from fractions import Fraction
+from typing import Dict, List, Optional, Tuple
+
+CLOCKWISE, COUNTERCLOCKWISE = 1, -1
+
+# How a connection relates the two parts: (reverses direction, speed follows sizes)
+CONNECTIONS = {
+    'mesh': (True, True),           # gears in contact: speed ratio = teeth ratio, opposite turn
+    'belt': (False, True),          # open belt or chain: same turn
+    'crossed_belt': (True, True),   # crossed belt: opposite turn
+    'shaft': (False, False),        # same axle: same speed and turn
+    'lever': (True, True),          # two arms of a lever about its fulcrum: opposite motion
+}
+
+
+class MechanismGraph:
+    """
+    Parts with optional sizes (teeth, pulley diameter or lever arm) and
+    typed connections between them. direction()/jammed() use the parity
+    union-find; propagate() computes every part's motion from one driver.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.sizes: List[Optional[Fraction]] = []
+        self.edges: List[Tuple[int, int, str]] = []
+        # Union-find over parts: parity[i] = turns opposite to parent[i]
+        self._parent: List[int] = []
+        self._parity: List[int] = []
+        self._jammed_roots = set()
+        self.conflicts: List[Tuple[str, str]] = []
+
+    def add_part(self, name: str, size: Optional[float] = None) -> int:
+        """Index of a part, adding it if new; a size fills in one not yet known"""
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.names)
+            self.names.append(name)
+            self.sizes.append(None)
+            self._parent.append(i)
+            self._parity.append(0)
+        if size is not None and self.sizes[i] is None:
+            self.sizes[i] = Fraction(size).limit_denominator(10**6)
+        return i
+
+    def connect(self, a: str, b: str, kind: str = 'mesh'):
+        """Join two parts; an odd cycle of reversing connections jams its component"""
+        if kind not in CONNECTIONS:
+            raise ValueError(f"connection kind must be one of {list(CONNECTIONS)}, got {kind!r}")
+        u, v = self.add_part(a), self.add_part(b)
+        self.edges.append((u, v, kind))
+
+        flip = 1 if CONNECTIONS[kind][0] else 0
+        (ru, pu), (rv, pv) = self._find(u), self._find(v)
+        if ru == rv:
+            if pu ^ pv != flip:
+                self._jammed_roots.add(ru)
+                self.conflicts.append((self.names[u], self.names[v]))
+            return
+        jammed = ru in self._jammed_roots or rv in self._jammed_roots
+        self._parent[rv] = ru
+        self._parity[rv] = pu ^ pv ^ flip
+        self._jammed_roots.discard(rv)
+        if jammed:
+            self._jammed_roots.add(ru)
+
+    def _find(self, i: int) -> Tuple[int, int]:
+        """(root, parity of i relative to root), compressing the path without recursion"""
+        path = []
+        while self._parent[i] != i:
+            path.append(i)
+            i = self._parent[i]
+        root, parity = i, 0
+        for j in reversed(path):
+            parity ^= self._parity[j]
+            self._parity[j] = parity
+            self._parent[j] = root
+        return root, (self._parity[path[0]] if path else 0)
+
+    def jammed(self, name: str) -> bool:
+        """True if the part is in a group whose directions contradict (it cannot turn)"""
+        return self._find(self.index[name])[0] in self._jammed_roots
+
+    def direction(self, name: str, driver: str, driver_direction: int = CLOCKWISE) -> Optional[int]:
+        """
+        Turning direction of a part when the driver turns driver_direction;
+        None if the two are not connected or the group is jammed
+        """
+        (ra, pa), (rb, pb) = self._find(self.index[name]), self._find(self.index[driver])
+        if ra != rb or ra in self._jammed_roots:
+            return None
+        return driver_direction if pa == pb else -driver_direction
+
+    def adjacency(self) -> List[List[Tuple[int, str, int]]]:
+        """Per part: (neighbour, connection kind, edge index)"""
+        neighbours = [[] for _ in self.names]
+        for e, (u, v, kind) in enumerate(self.edges):
+            neighbours[u].append((v, kind, e))
+            neighbours[v].append((u, kind, e))
+        return neighbours
+
+    def _step(self, u: int, v: int, kind: str) -> Optional[Fraction]:
+        """Speed of v per unit speed of u across one connection (None if a size is missing)"""
+        reverses, sized = CONNECTIONS[kind]
+        if not sized:
+            return Fraction(1)
+        su, sv = self.sizes[u], self.sizes[v]
+        if su is None or sv is None or not su or not sv:
+            return None
+        if kind == 'lever':
+            return sv / su  # the longer arm moves further
+        return su / sv
+
+    def propagate(self, driver: str, amount: Fraction = Fraction(1),
+                  direction: int = CLOCKWISE) -> Dict[str, Tuple[Optional[Fraction], Optional[int]]]:
+        """
+        {part: (amount, direction)} for every part the driver moves, by BFS.
+        amount is None where a size on the way is unknown. A jammed group
+        gives (0, None) for all its parts. Amounts are rotations, degrees,
+        RPM... in whatever unit the driver's amount uses.
+        """
+        start = self.index[driver]
+        if self.jammed(driver):
+            root = self._find(start)[0]
+            return {name: (Fraction(0), None) for i, name in enumerate(self.names)
+                    if self._find(i)[0] == root}
+
+        neighbours = self.adjacency()
+        speed: List[Optional[Fraction]] = [None] * len(self.names)
+        sign = [0] * len(self.names)  # 0 = not reached
+        used = bytearray(len(self.edges))  # edges whose ratio has been applied
+        speed[start], sign[start] = Fraction(amount), direction
+        queue = deque([start])
+        while queue:
+            u = queue.popleft()
+            for v, kind, e in neighbours[u]:
+                if used[e]:
+                    continue
+                step = self._step(u, v, kind) if speed[u] is not None else None
+                value = speed[u] * step if step is not None else None
+                if not sign[v]:
+                    sign[v] = -sign[u] if CONNECTIONS[kind][0] else sign[u]
+                    speed[v] = value
+                    queue.append(v)
+                elif value is None:
+                    continue
+                elif speed[v] is None:
+                    speed[v] = value
+                    queue.append(v)  # a sized path reached it after an unsized one
+                elif speed[v] != value:
+                    self.conflicts.append((self.names[u], self.names[v]))  # cycle with mismatched ratios
+                if value is not None:
+                    used[e] = 1
+
+        return {self.names[i]: (speed[i], sign[i]) for i in range(len(self.names)) if sign[i]}
+
+
+# ---- Reading gear problems from text ----
+
+_PART_WORDS = r"(?:gear|cog|cogwheel|pulley|sprocket|wheel)(?:\s+system)?"
+_ORDINALS = {'first': '1', 'second': '2', 'third': '3', 'fourth': '4', 'fifth': '5', 'sixth': '6'}
+_MENTION = re.compile(r"\b(?:" + _PART_WORDS + r"\s+([A-Z]|\d+)\b|(?:the\s+)?(" + '|'.join(_ORDINALS)
+                      + r")\s+(?:" + _PART_WORDS + r"))", re.IGNORECASE)
+_TEETH = re.compile(r"(\d+(?:\.\d+)?)\s+teeth", re.IGNORECASE)
+_CONNECT_VERBS = re.compile(r"\b(?:mesh\w*|engag\w*|interlock\w*|drives?|driving|connect\w*|touch\w*|attached|"
+                            r"linked|coupled|joined|in contact)\b", re.IGNORECASE)
+_NEGATION = re.compile(r"\b(?:not|n't|never|no)\b", re.IGNORECASE)
+_WORD_AMOUNTS = {'once': '1', 'twice': '2', 'one': '1', 'a': '1', 'two': '2', 'three': '3', 'four': '4',
+                 'five': '5', 'six': '6', 'ten': '10', 'half a': '1/2'}
+_AMOUNT = re.compile(r"\b(\d+(?:\.\d+)?(?:\s*/\s*\d+)?|half a|one|a|two|three|four|five|six|ten)\s+(?:full\s+|complete\s+)?"
+                     r"(?:rotations?|revolutions?|turns?|times|degrees|rpm)\b|\b(once|twice)\b", re.IGNORECASE)
+_COUNTER = re.compile(r"counter[\s-]?clockwise|anti[\s-]?clockwise", re.IGNORECASE)
+_CLOCKWISE = re.compile(r"(?<![-\w])clockwise", re.IGNORECASE)
+_MOTION = re.compile(r"\b(?:rotat\w*|turn\w*|spin\w*|revolution\w*|rpm|crank\w*|clockwise)", re.IGNORECASE)
+# Questions with conditions the engine does not model (parity, counters, positions, coincidences)
+_UNMODELLED = re.compile(r"\b(?:even|odd|display\w*|first time|both|again|position\w*|align\w*|"
+                         r"simultaneous\w*|at the same time)\b", re.IGNORECASE)
+_JAM_OPTION = re.compile(r"\bjam|\block|not (?:rotate|rotating|turn|turning|move|moving)|won't (?:turn|rotate|move)|"
+                         r"will not (?:turn|rotate|move)|cannot (?:turn|rotate|move)|impossible", re.IGNORECASE)
+
+
+def _number(text: str) -> Fraction:
+    """'3', '1.5', '4/7', 'twice', 'half a' -> Fraction"""
+    text = _WORD_AMOUNTS.get(text.lower(), text).replace(' ', '')
+    if '/' in text:
+        top, bottom = text.split('/')
+        return Fraction(top) / Fraction(bottom)
+    return Fraction(text)
+
+
+def _direction_in(text: str) -> Optional[int]:
+    if _COUNTER.search(text):
+        return COUNTERCLOCKWISE
+    if _CLOCKWISE.search(text):
+        return CLOCKWISE
+    return None
+
+
+class MechanismProblem:
+    """
+    A gear/belt graph read from a problem statement, with the driving
+    part, how far and which way it turns, and the part asked about
+    """
+
+    def __init__(self, graph: MechanismGraph, driver: str, target: str, amount: Fraction = Fraction(1),
+                 direction: Optional[int] = None, asks_direction: bool = False, asks_amount: bool = True,
+                 inverse: bool = False):
+        self.graph = graph
+        self.driver = driver
+        self.target = target
+        self.amount = amount
+        self.direction = direction
+        self.asks_direction = asks_direction
+        self.asks_amount = asks_amount
+        self.inverse = inverse  # asked for driver turns per target turn
+        self._answer = None
+
+    @classmethod
+    def from_text(cls, text: str) -> Optional['MechanismProblem']:
+        """
+        None unless the text names two or more gears, how they connect, and
+        asks plainly how one moves (speed, ratio, direction or jam). Questions
+        with extra conditions, such as an even count or a display, are left
+        to the other strategies.
+        """
+        sentences = [s for s in re.split(r"(?<=[.?!])\s+", text.strip()) if s]
+        if (len(sentences) < 2 or re.search(r"\bteeth\b", sentences[-1], re.IGNORECASE)
+                or _UNMODELLED.search(sentences[-1])):
+            return None
+        # per sentence: [(start, end, name)] of the parts it names
+        mentions = [[(m.start(), m.end(), m.group(1).upper() if m.group(1) else _ORDINALS[m.group(2).lower()])
+                     for m in _MENTION.finditer(sentence)] for sentence in sentences]
+        names = list(dict.fromkeys(name for found in mentions for _, _, name in found))
+        if len(names) < 2:
+            return None
+
+        graph = MechanismGraph()
+        for name in names:
+            graph.add_part(name)
+        # Teeth: the first "N teeth" after a mention, before the next mention in that sentence
+        for sentence, found in zip(sentences, mentions):
+            for k, (_, end, name) in enumerate(found):
+                stop = found[k + 1][0] if k + 1 < len(found) else len(sentence)
+                teeth = _TEETH.search(sentence, end, stop)
+                if teeth:
+                    graph.add_part(name, float(teeth.group(1)))
+
+        # Explicit connections, clause by clause: the first part named connects to the others
+        for sentence, found in zip(sentences, mentions):
+            kind = 'belt' if re.search(r"\b(?:belt|chain)\b", sentence, re.IGNORECASE) else 'mesh'
+            if kind == 'belt' and re.search(r"\b(?:crossed|twisted)\b", sentence, re.IGNORECASE):
+                kind = 'crossed_belt'
+            offset = 0
+            for clause in re.split(r"[,;()]", sentence):
+                start, offset = offset, offset + len(clause) + 1
+                if (kind == 'mesh' and not _CONNECT_VERBS.search(clause)) or _NEGATION.search(clause):
+                    continue
+                named = list(dict.fromkeys(name for pos, _, name in found if start <= pos < offset))
+                for other in named[1:]:
+                    graph.connect(named[0], other, kind)
+
+        if not graph.edges:
+            lower = text.lower()
+            if re.search(r"\b(?:the other two|all the others|each of the others|every other gear)\b", lower):
+                for i, a in enumerate(names):
+                    for b in names[i + 1:]:
+                        graph.connect(a, b)
+            elif re.search(r"\b(?:line|row|sequence|series|train|neighbo(?:u)?ring|each other|in turn)\b", lower):
+                for a, b in zip(names, names[1:]):
+                    graph.connect(a, b)
+            else:
+                return None
+
+        # The driver is the first part named where motion is described; the target the last other part asked about
+        driver = None
+        for moving in (lambda s: _AMOUNT.search(s) or _direction_in(s), _MOTION.search):
+            for sentence, found in zip(sentences, mentions):
+                if found and moving(sentence) and (sentence is not sentences[-1] or len(found) > 1):
+                    driver = found[0][2]
+                    break
+            if driver is not None:
+                break
+        targets = [name for _, _, name in mentions[-1] if name != driver]
+        if driver is None or not targets:
+            return None
+        target = targets[-1]
+
+        # How far and which way the driver turns: text after the driver is named, up to the next part named
+        amount, direction = None, None
+        for sentence, found in zip(sentences, mentions):
+            for k, (_, end, name) in enumerate(found):
+                if name != driver:
+                    continue
+                stop = next((pos for pos, _, other in found[k + 1:] if other != driver), len(sentence))
+                segment = sentence[end:stop]
+                if direction is None:
+                    direction = _direction_in(segment)
+                measured = _AMOUNT.search(segment)
+                if amount is None and measured:
+                    amount = _number(measured.group(1) or measured.group(2))
+
+        question = sentences[-1]
+        how_many = question.lower().find('how many')
+        inverse = how_many >= 0 and any(name == driver and pos > how_many for pos, _, name in mentions[-1])
+        asks_direction = bool(re.search(r"direction|clockwise", question, re.IGNORECASE))
+        asks_amount = bool(re.search(r"how many|how fast|how far|how much|rpm|degrees|rotations?|revolutions?|speed",
+                                     question, re.IGNORECASE))
+        return cls(graph, driver, target, amount or Fraction(1), direction, asks_direction, asks_amount, inverse)
+
+    def answer(self) -> Dict[str, object]:
+        """
+        {'jammed', 'amount' (float or None), 'direction' (+1/-1/None)} for
+        the target part, propagated on the first call and then reused
+        """
+        if self._answer is not None:
+            return self._answer
+        if self.graph.jammed(self.driver):
+            self._answer = {'jammed': True, 'amount': 0.0, 'direction': None}
+            return self._answer
+        motion = self.graph.propagate(self.driver, self.amount, self.direction or CLOCKWISE)
+        amount, direction = motion.get(self.target, (None, None))
+        if self.inverse and amount:
+            amount = self.amount / amount
+        self._answer = {
+            'jammed': False,
+            'amount': float(amount) if amount is not None else None,
+            'direction': direction if self.direction is not None else None,
+        }
+        return self._answer
+
+    def match_option(self, options: List[str]) -> Optional[int]:
+        """Index of the only option consistent with the answer, else None"""
+        answer = self.answer()
+        if answer['jammed']:
+            jammed = [i for i, option in enumerate(options) if option and _JAM_OPTION.search(option)]
+            return jammed[0] if len(jammed) == 1 else None
+        if (self.asks_amount and answer['amount'] is None) or (self.asks_direction and answer['direction'] is None):
+            return None
+
+        matches = []
+        for i, option in enumerate(options):
+            if not option or 'another answer' in option.lower():
+                continue
+            if self.asks_amount:
+                number = re.search(r"\d+(?:\.\d+)?(?:\s*/\s*\d+)?", option)
+                if number is None:
+                    continue
+                decimals = len(number.group().split('.')[1]) if '.' in number.group() else 0
+                tolerance = 0.5 * 10 ** -decimals if decimals else 1e-9
+                if abs(float(_number(number.group())) - answer['amount']) > tolerance:
+                    continue
+            option_direction = _direction_in(option)
+            if self.asks_direction and option_direction is None:
+                continue
+            if None not in (option_direction, answer['direction']) and option_direction != answer['direction']:
+                continue
+            matches.append(i)
+        return matches[0] if len(matches) == 1 and (self.asks_amount or self.asks_direction) else None
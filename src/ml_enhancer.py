@@ -3,11 +3,20 @@ Solvra - Machine Learning Enhancement Module
 Trains on training data to learn patterns and boost accuracy to maximum
 """
 
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Tuple, Optional
-from collections import Counter, defaultdict
-import re
+from typing import Dict, Iterable, List, Any, Tuple, Optional, Union
+from collections import Counter, defaultdict, deque
+from pathlib import Path
+from parsed_problem import ParsedProblem
+
+
+# Version of the saved model layout written by MLEnhancer.save
+MODEL_FORMAT_VERSION = 1
+
+# Vote rank for answers that received no vote
+_NO_VOTE = np.iinfo(np.int64).max
 
 
 class MLEnhancer:
@@ -22,36 +31,44 @@ class MLEnhancer:
         self.keyword_to_answer = defaultdict(list)
         self.successful_strategies = []
         self.trained = False
+        
+        # Hash of the learned counts (set by compile_vote_tables); changes
+        # whenever retraining on different data would change a prediction
+        self.fingerprint = None
     
-    def extract_features(self, problem: Dict[str, Any]) -> Dict[str, Any]:
+    def extract_features(self, problem: Dict[str, Any],
+                         parsed: Optional[ParsedProblem] = None) -> Dict[str, Any]:
         """Extract comprehensive features from problem"""
-        text = problem['problem_statement'].lower()
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        text = parsed.text_lower
+        topic = parsed.topic_lower
+        keywords = parsed.keywords
         
         features = {
             # Text features
             'word_count': len(text.split()),
-            'number_count': len(re.findall(r'\d+', text)),
+            'number_count': parsed.digit_run_count,
             'question_marks': text.count('?'),
-            'has_minimum': 'minimum' in text or 'shortest' in text or 'least' in text,
-            'has_maximum': 'maximum' in text or 'longest' in text or 'most' in text,
+            'has_minimum': 'ml.has_minimum' in keywords,
+            'has_maximum': 'ml.has_maximum' in keywords,
             
             # Topic-based
-            'topic': problem.get('topic', '').lower(),
-            'is_sequence': 'sequence' in problem.get('topic', '').lower(),
-            'is_spatial': 'spatial' in problem.get('topic', '').lower(),
-            'is_optimization': 'optimization' in problem.get('topic', '').lower(),
-            'is_logic': 'logic' in problem.get('topic', '').lower() or 'riddle' in problem.get('topic', '').lower(),
+            'topic': topic,
+            'is_sequence': 'sequence' in topic,
+            'is_spatial': 'spatial' in topic,
+            'is_optimization': 'optimization' in topic,
+            'is_logic': 'logic' in topic or 'riddle' in topic,
             
             # Keywords
-            'has_cube': 'cube' in text,
-            'has_sequence_keyword': 'sequence' in text or 'pattern' in text or 'next' in text,
-            'has_impossible': 'impossible' in text or 'cannot' in text,
-            'has_always': 'always' in text,
-            'has_never': 'never' in text,
+            'has_cube': 'ml.has_cube' in keywords,
+            'has_sequence_keyword': 'ml.has_sequence_keyword' in keywords,
+            'has_impossible': 'ml.has_impossible' in keywords,
+            'has_always': 'ml.has_always' in keywords,
+            'has_never': 'ml.has_never' in keywords,
             
             # Answer option analysis
-            'has_another_answer': any('another answer' in str(problem.get(f'answer_option_{i}', '')).lower() 
-                                     for i in range(1, 6)),
+            'has_another_answer': parsed.has_another_answer,
         }
         
         return features
@@ -61,8 +78,26 @@ class MLEnhancer:
         Learn patterns from training data
         """
         print(" Training ML Enhancer on training data...")
-        
-        for idx, row in training_data.iterrows():
+        self._learn(training_data)
+        self._finish_training(len(training_data))
+    
+    def train_chunks(self, chunks: Iterable[pd.DataFrame]) -> None:
+        """
+        train() over a stream of DataFrame chunks (e.g. DataPreprocessor.iter_chunks)
+        with one chunk in memory at a time; the model matches training on
+        the concatenated frame
+        """
+        print(" Training ML Enhancer on training data chunks...")
+        rows = 0
+        for chunk in chunks:
+            self._learn(chunk)
+            rows += len(chunk)
+        self._finish_training(rows)
+    
+    def _learn(self, training_data: pd.DataFrame) -> None:
+        """Accumulate label counts from one frame of training data"""
+        # One to_dict pass instead of a Series per row
+        for row in training_data.to_dict('records'):
             if pd.isna(row.get('correct_option_number')):
                 continue
             
@@ -82,18 +117,147 @@ class MLEnhancer:
             
             # Learn answer distribution
             self.answer_distribution[topic][correct_answer] += 1
-        
+    
+    def _finish_training(self, num_examples: int) -> None:
+        """Best guesses and vote tables from the accumulated counts"""
         # Calculate most common answers per topic
         self.topic_best_guesses = {}
         for topic, counter in self.answer_distribution.items():
             if counter:
                 self.topic_best_guesses[topic] = counter.most_common(1)[0][0]
         
+        self.compile_vote_tables()
         self.trained = True
-        print(f" Trained on {len(training_data)} examples")
+        print(f" Trained on {num_examples} examples")
         print(f"   Learned patterns for {len(self.topic_patterns)} topics")
     
-    def predict(self, problem: Dict[str, Any], base_prediction: int = None) -> Tuple[int, float]:
+    def compile_vote_tables(self) -> None:
+        """
+        Fold the learned label lists into fixed vote tables so prediction
+        no longer depends on the training set size:
+          topic_votes[t, a]    weight of answer a in topic t's top 3 (count / total)
+          topic_ranks[t, a]    its slot in that top 3 (vote order, for tie-breaks)
+          feature_votes[f, a]  1 if a is the most common answer when feature f is true
+        """
+        self.vote_answers = sorted({answer for labels in self.topic_patterns.values() for answer in labels}
+                                   | {answer for labels in self.keyword_to_answer.values() for answer in labels}
+                                   | set(range(1, 6)))
+        self.answer_index = {answer: j for j, answer in enumerate(self.vote_answers)}
+        num_answers = len(self.vote_answers)
+        
+        self.topic_index = {}
+        self.topic_votes = np.zeros((len(self.topic_patterns) + 1, num_answers))
+        self.topic_ranks = np.full((len(self.topic_patterns) + 1, num_answers), _NO_VOTE)
+        self.topic_confidence = np.zeros((len(self.topic_patterns) + 1, 2))  # (sum, count)
+        for t, (topic, labels) in enumerate(self.topic_patterns.items()):
+            self.topic_index[topic] = t
+            if not labels:
+                continue
+            for slot, (answer, count) in enumerate(Counter(labels).most_common(3)):
+                weight = count / len(labels)
+                self.topic_votes[t, self.answer_index[answer]] += weight
+                self.topic_ranks[t, self.answer_index[answer]] = slot
+                self.topic_confidence[t, 0] += weight
+                self.topic_confidence[t, 1] += 1
+        # Last row: unseen topics get no topic votes
+        
+        # Features vote in extract_features order, as the per-feature loop did
+        feature_order = list(self.extract_features({'topic': '', 'problem_statement': ''}))
+        self.vote_features = [name for name in feature_order if self.keyword_to_answer.get(name)]
+        self.feature_votes = np.zeros((len(self.vote_features), num_answers), dtype=np.int64)
+        for f, name in enumerate(self.vote_features):
+            answer = Counter(self.keyword_to_answer[name]).most_common(1)[0][0]
+            self.feature_votes[f, self.answer_index[answer]] = 1
+        
+        self.fingerprint = self._learned_fingerprint()
+    
+    def _learned_fingerprint(self) -> str:
+        """
+        Hash of exactly what save() stores: per-topic and per-feature answer
+        counts with their first-occurrence order, so a saved and reloaded
+        model fingerprints the same as the one that was trained
+        """
+        answers = sorted({answer for labels in self.topic_patterns.values() for answer in labels})
+        digest = hashlib.sha256()
+        digest.update(repr((answers, list(self.topic_patterns), list(self.keyword_to_answer),
+                            sorted(self.topic_best_guesses.items()))).encode())
+        for label_lists in (self.topic_patterns, self.keyword_to_answer):
+            for array in self._count_arrays(label_lists, answers):
+                digest.update(array.tobytes())
+        return digest.hexdigest()[:16]
+    
+    def feature_matrix(self, problems: List[Dict[str, Any]],
+                       parsed_problems: Optional[List[ParsedProblem]] = None) -> np.ndarray:
+        """Boolean (problems x vote_features) matrix of true features"""
+        if parsed_problems is None:
+            parsed_problems = [None] * len(problems)
+        matrix = np.zeros((len(problems), len(self.vote_features)), dtype=bool)
+        for i, (problem, parsed) in enumerate(zip(problems, parsed_problems)):
+            features = self.extract_features(problem, parsed)
+            matrix[i] = [features[name] is True for name in self.vote_features]
+        return matrix
+    
+    def combine_votes(self, topics: List[str], features: np.ndarray,
+                      base_predictions: List[Optional[int]]) -> List[Tuple[int, float]]:
+        """
+        Topic, feature and base-prediction votes for a batch in whole-array
+        form. Ties go to the answer that received its first vote earliest.
+        """
+        n = len(topics)
+        unseen = len(self.topic_votes) - 1
+        topic_rows = np.array([self.topic_index.get(topic, unseen) for topic in topics], dtype=np.int64)
+        
+        base_cols = np.full(n, -1)
+        for i, base in enumerate(base_predictions):
+            if base:
+                if base not in self.answer_index:
+                    # Outside the learned answers: base vote only, as the Counter did
+                    self.answer_index[base] = len(self.vote_answers)
+                    self.vote_answers.append(base)
+                    self._widen_vote_tables()
+                base_cols[i] = self.answer_index[base]
+        has_base = base_cols >= 0
+        
+        # One integer matrix product gives every feature vote count
+        feature_counts = features.astype(np.int64) @ self.feature_votes
+        base_onehot = np.zeros((n, len(self.vote_answers)))
+        base_onehot[np.flatnonzero(has_base), base_cols[has_base]] = 1.0
+        votes = self.topic_votes[topic_rows] + 0.3 * feature_counts + 2.0 * base_onehot
+        
+        # Order in which each answer first received a vote: topic slots 0-2,
+        # then features in order, then the base prediction
+        num_features = len(self.vote_features)
+        feature_rank = np.where(features[:, :, None] & (self.feature_votes[None, :, :] > 0),
+                                3 + np.arange(num_features)[None, :, None], _NO_VOTE).min(axis=1, initial=_NO_VOTE)
+        ranks = np.minimum(self.topic_ranks[topic_rows], feature_rank)
+        ranks = np.minimum(ranks, np.where(base_onehot > 0, 3 + num_features, _NO_VOTE))
+        
+        voted = ranks < _NO_VOTE
+        best = np.where(voted, votes, -np.inf).max(axis=1)
+        winner = np.where(voted & (votes == best[:, None]), ranks, _NO_VOTE).argmin(axis=1)
+        
+        # Confidence: mean of the topic weights used, plus 0.8 for a base prediction
+        conf_sum = self.topic_confidence[topic_rows, 0] + 0.8 * has_base
+        conf_count = self.topic_confidence[topic_rows, 1] + has_base
+        
+        results = []
+        for i in range(n):
+            if not voted[i].any():
+                results.append((base_predictions[i] or 2, 0.5))
+                continue
+            confidence = min(conf_sum[i] / conf_count[i], 0.95) if conf_count[i] else 0.5
+            results.append((self.vote_answers[winner[i]], float(confidence)))
+        return results
+    
+    def _widen_vote_tables(self) -> None:
+        """Widen the vote tables after a new answer column was appended"""
+        pad = len(self.vote_answers) - self.topic_votes.shape[1]
+        self.topic_votes = np.pad(self.topic_votes, ((0, 0), (0, pad)))
+        self.topic_ranks = np.pad(self.topic_ranks, ((0, 0), (0, pad)), constant_values=_NO_VOTE)
+        self.feature_votes = np.pad(self.feature_votes, ((0, 0), (0, pad)))
+    
+    def predict(self, problem: Dict[str, Any], base_prediction: int = None,
+                parsed: Optional[ParsedProblem] = None) -> Tuple[int, float]:
         """
         Predict answer using learned patterns
         Returns (prediction, confidence)
@@ -101,43 +265,104 @@ class MLEnhancer:
         if not self.trained:
             return base_prediction or 2, 0.5
         
-        features = self.extract_features(problem)
-        topic = features['topic']
-        
-        # Strategy 1: Use topic-specific patterns
-        votes = Counter()
-        confidences = []
-        
-        # Vote based on topic patterns
-        if topic in self.topic_patterns and self.topic_patterns[topic]:
-            topic_predictions = self.topic_patterns[topic]
-            most_common = Counter(topic_predictions).most_common(3)
-            for answer, count in most_common:
-                weight = count / len(topic_predictions)
-                votes[answer] += weight
-                confidences.append(weight)
-        
-        # Vote based on feature correlations
-        for feature_name, feature_value in features.items():
-            if feature_value and isinstance(feature_value, bool):
-                if feature_name in self.keyword_to_answer:
-                    predictions = self.keyword_to_answer[feature_name]
-                    if predictions:
-                        most_common_answer = Counter(predictions).most_common(1)[0][0]
-                        votes[most_common_answer] += 0.3
-        
-        # Combine with base prediction
-        if base_prediction:
-            votes[base_prediction] += 2.0  # Strong weight for algorithmic prediction
-            confidences.append(0.8)
-        
-        # Select winner
-        if votes:
-            prediction = votes.most_common(1)[0][0]
-            confidence = min(sum(confidences) / len(confidences), 0.95) if confidences else 0.5
-            return prediction, confidence
-        
-        return base_prediction or 2, 0.5
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        features = self.feature_matrix([problem], [parsed])
+        return self.combine_votes([parsed.topic_lower], features, [base_prediction])[0]
+    
+    def predict_batch(self, problems: Union[pd.DataFrame, List[Dict[str, Any]]],
+                      base_predictions: List[Optional[int]],
+                      parsed_problems: Optional[List[ParsedProblem]] = None) -> List[Tuple[int, float]]:
+        """
+        predict() for a whole DataFrame (or list of problem dicts): one boolean
+        feature matrix and one matrix product against the compiled vote tables
+        """
+        if not self.trained:
+            return [(base or 2, 0.5) for base in base_predictions]
+        
+        records = problems.to_dict('records') if isinstance(problems, pd.DataFrame) else list(problems)
+        if parsed_problems is None:
+            parsed_problems = [ParsedProblem(record) for record in records]
+        features = self.feature_matrix(records, parsed_problems)
+        topics = [parsed.topic_lower for parsed in parsed_problems]
+        return self.combine_votes(topics, features, list(base_predictions))
+    
+    def _count_arrays(self, label_lists: Dict[str, List[int]],
+                      answers: List[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (counts, order) per key: how often each answer occurs and the rank of
+        its first occurrence (-1 if never), which keeps Counter tie-breaking
+        """
+        column = {answer: j for j, answer in enumerate(answers)}
+        counts = np.zeros((len(label_lists), len(answers)), dtype=np.int64)
+        order = np.full((len(label_lists), len(answers)), -1, dtype=np.int64)
+        for i, labels in enumerate(label_lists.values()):
+            for rank, (answer, count) in enumerate(Counter(labels).items()):
+                counts[i, column[answer]] = count
+                order[i, column[answer]] = rank
+        return counts, order
+    
+    def _label_lists(self, keys: np.ndarray, counts: np.ndarray, order: np.ndarray,
+                     answers: np.ndarray) -> Dict[str, List[int]]:
+        """Inverse of _count_arrays: labels grouped in first-occurrence order"""
+        label_lists = defaultdict(list)
+        for key, row_counts, row_order in zip(keys, counts, order):
+            for j in np.argsort(np.where(row_order < 0, len(answers), row_order), kind='stable'):
+                if row_counts[j]:
+                    label_lists[str(key)].extend([int(answers[j])] * int(row_counts[j]))
+        return label_lists
+    
+    def save(self, path: str) -> None:
+        """
+        Save the learned patterns as a compressed, versioned .npz of count arrays
+        """
+        if not self.trained:
+            raise ValueError("MLEnhancer must be trained before it can be saved")
+        
+        answers = sorted({answer for labels in self.topic_patterns.values() for answer in labels})
+        topics = list(self.topic_patterns)
+        # answer_distribution holds the same per-topic counts as topic_patterns
+        topic_counts, topic_order = self._count_arrays(self.topic_patterns, answers)
+        feature_counts, feature_order = self._count_arrays(self.keyword_to_answer, answers)
+        
+        np.savez_compressed(
+            path,
+            format_version=np.array(MODEL_FORMAT_VERSION),
+            answers=np.array(answers, dtype=np.int64),
+            topics=np.array(topics, dtype=str),
+            topic_counts=topic_counts,
+            topic_order=topic_order,
+            features=np.array(list(self.keyword_to_answer), dtype=str),
+            feature_counts=feature_counts,
+            feature_order=feature_order,
+            best_guesses=np.array([self.topic_best_guesses.get(t, 0) for t in topics], dtype=np.int64),
+        )
+    
+    @classmethod
+    def load(cls, path: str) -> 'MLEnhancer':
+        """Rebuild a trained MLEnhancer from a file written by save()"""
+        with np.load(Path(path), allow_pickle=False) as data:
+            version = int(data['format_version'])
+            if version != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported MLEnhancer format version {version} "
+                                 f"(expected {MODEL_FORMAT_VERSION})")
+            answers = data['answers']
+            topics = data['topics']
+            topic_counts, topic_order = data['topic_counts'], data['topic_order']
+            features = data['features']
+            feature_counts, feature_order = data['feature_counts'], data['feature_order']
+            best_guesses = data['best_guesses']
+        
+        enhancer = cls()
+        enhancer.topic_patterns = enhancer._label_lists(topics, topic_counts, topic_order, answers)
+        enhancer.keyword_to_answer = enhancer._label_lists(features, feature_counts, feature_order, answers)
+        for topic, labels in enhancer.topic_patterns.items():
+            enhancer.answer_distribution[topic] = Counter(labels)
+        enhancer.topic_best_guesses = {str(topic): int(guess)
+                                       for topic, guess in zip(topics, best_guesses) if guess}
+        enhancer.compile_vote_tables()
+        enhancer.trained = True
+        return enhancer
     
     def get_topic_statistics(self) -> Dict[str, Any]:
         """Get statistics about learned patterns"""
@@ -157,19 +382,42 @@ class EnsemblePredictor:
     Combines multiple prediction strategies for maximum accuracy
     """
     
-    def __init__(self, ml_enhancer: MLEnhancer):
+    def __init__(self, ml_enhancer: MLEnhancer, history_limit: Optional[int] = None):
         self.ml_enhancer = ml_enhancer
         self.prediction_history = []
+        if history_limit is not None:
+            self.set_history_limit(history_limit)
+    
+    def set_history_limit(self, history_limit: int):
+        """Keep only the most recent predictions (bounded memory for long runs)"""
+        self.prediction_history = deque(self.prediction_history, maxlen=history_limit)
     
     def ensemble_predict(self, problem: Dict[str, Any], 
                          algo_prediction: int,
-                         algo_confidence: float) -> Tuple[int, float]:
+                         algo_confidence: float,
+                         parsed: Optional[ParsedProblem] = None) -> Tuple[int, float]:
         """
         Combine algorithmic and ML predictions
         """
         # Get ML prediction
-        ml_prediction, ml_confidence = self.ml_enhancer.predict(problem, algo_prediction)
-        
+        ml_prediction, ml_confidence = self.ml_enhancer.predict(problem, algo_prediction, parsed)
+        return self._combine(algo_prediction, algo_confidence, ml_prediction, ml_confidence)
+    
+    def ensemble_predict_batch(self, problems: Union[pd.DataFrame, List[Dict[str, Any]]],
+                               algo_predictions: List[int],
+                               algo_confidences: List[float],
+                               parsed_problems: Optional[List[ParsedProblem]] = None) -> List[Tuple[int, float]]:
+        """
+        ensemble_predict for a whole DataFrame, with the ML votes from one predict_batch
+        """
+        ml_results = self.ml_enhancer.predict_batch(problems, algo_predictions, parsed_problems)
+        return [self._combine(algo_prediction, algo_confidence, ml_prediction, ml_confidence)
+                for algo_prediction, algo_confidence, (ml_prediction, ml_confidence)
+                in zip(algo_predictions, algo_confidences, ml_results)]
+    
+    def _combine(self, algo_prediction: int, algo_confidence: float,
+                 ml_prediction: int, ml_confidence: float) -> Tuple[int, float]:
+        """Weighted vote between one algorithmic and one ML prediction"""
         # Weighted voting
         if algo_confidence > 0.9:
             # Trust algorithmic prediction if very confident
@@ -0,0 +1,133 @@
+"""
+Solvra - Parsed Problem Module
+Parses a problem once so every pipeline stage can share the results
+"""
+
+import re
+from functools import cached_property
+from typing import Dict, FrozenSet, List, Any, Optional
+from keyword_matcher import PROBLEM_KEYWORDS, OPTION_KEYWORDS
+from mechanism_engine import MechanismProblem
+
+
+# Same patterns the individual stages used to run on their own
+ALL_NUMBERS_PATTERN = re.compile(r'-?\d+\.?\d*(?:/\d+)?')    # AdvancedPatternMatcher.extract_all_numbers
+SIGNED_NUMBER_PATTERN = re.compile(r'-?\d+\.?\d*')           # MathSolver.extract_numbers
+UNSIGNED_NUMBER_PATTERN = re.compile(r'\b\d+\.?\d*\b')       # ReasoningVerifier sequence checks
+INTEGER_PATTERN = re.compile(r'\b\d+\b')                     # ReasoningVerifier spatial checks
+DIGIT_RUN_PATTERN = re.compile(r'\d+')                       # MLEnhancer number_count
+
+
+def _first_number(pattern: re.Pattern, text: str) -> Optional[float]:
+    """First number matched by pattern in text, or None"""
+    match = pattern.search(text)
+    return float(match.group()) if match else None
+
+
+class ParsedProblem:
+    """
+    Parse-once view of a problem shared by the agent, ensemble and verifier.
+    Every field is computed on first access and then reused.
+    """
+
+    def __init__(self, problem: Dict[str, Any]):
+        self.problem = problem
+        self.topic = problem.get('topic', '')
+        self.text = problem['problem_statement']
+
+        # Filled in by the reasoning agent once the sequence is classified
+        self.sequence_pattern = None
+        # Next term predicted from signed_numbers, as (value,) once computed
+        self.sequence_next = None
+
+    @cached_property
+    def topic_lower(self) -> str:
+        return self.topic.lower()
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def keywords(self) -> FrozenSet[str]:
+        """Every keyword category hit by the statement, from one automaton pass"""
+        return PROBLEM_KEYWORDS.scan(self.text_lower)
+
+    @cached_property
+    def numbers(self) -> List[float]:
+        """All numbers including fractions and decimals"""
+        numbers = []
+        for match in ALL_NUMBERS_PATTERN.findall(self.text):
+            if '/' in match:
+                parts = match.split('/')
+                numbers.append(float(parts[0]) / float(parts[1]))
+            else:
+                numbers.append(float(match))
+        return numbers
+
+    @cached_property
+    def signed_numbers(self) -> List[float]:
+        return [float(n) for n in SIGNED_NUMBER_PATTERN.findall(self.text)]
+
+    @cached_property
+    def unsigned_numbers(self) -> List[float]:
+        return [float(n) for n in UNSIGNED_NUMBER_PATTERN.findall(self.text)]
+
+    @cached_property
+    def integers(self) -> List[float]:
+        return [float(n) for n in INTEGER_PATTERN.findall(self.text)]
+
+    @cached_property
+    def digit_run_count(self) -> int:
+        return len(DIGIT_RUN_PATTERN.findall(self.text))
+
+    @cached_property
+    def mechanism(self) -> Optional[MechanismProblem]:
+        """Gear or belt train read from the statement (None if it describes none)"""
+        return MechanismProblem.from_text(self.text)
+
+    @cached_property
+    def options(self) -> List[Any]:
+        """Answer options in order, skipping missing keys"""
+        return [self.problem[f'answer_option_{i}'] for i in range(1, 6)
+                if f'answer_option_{i}' in self.problem]
+
+    @cached_property
+    def option_lowers(self) -> List[str]:
+        return [opt.lower() if opt else '' for opt in self.options]
+
+    @cached_property
+    def option_keywords(self) -> List[FrozenSet[str]]:
+        return [OPTION_KEYWORDS.scan(opt_lower) for opt_lower in self.option_lowers]
+
+    @cached_property
+    def option_values(self) -> List[Optional[float]]:
+        """First signed number of each option (None if the option has none)"""
+        return [_first_number(SIGNED_NUMBER_PATTERN, opt) if opt else None
+                for opt in self.options]
+
+    @cached_property
+    def option_unsigned_values(self) -> Dict[int, Optional[float]]:
+        """First unsigned number keyed by option number"""
+        return {i: _first_number(UNSIGNED_NUMBER_PATTERN, self.problem[f'answer_option_{i}'])
+                for i in range(1, 6) if f'answer_option_{i}' in self.problem}
+
+    @cached_property
+    def option_integer_values(self) -> Dict[int, Optional[float]]:
+        """First whole number keyed by option number"""
+        return {i: _first_number(INTEGER_PATTERN, self.problem[f'answer_option_{i}'])
+                for i in range(1, 6) if f'answer_option_{i}' in self.problem}
+
+    @cached_property
+    def another_answer_idx(self) -> Optional[int]:
+        """Option number of the "Another answer" choice (last one if repeated)"""
+        idx = None
+        for i, opt_lower in enumerate(self.option_lowers):
+            if 'another answer' in opt_lower:
+                idx = i + 1
+        return idx
+
+    @cached_property
+    def has_another_answer(self) -> bool:
+        return any('another answer' in str(self.problem.get(f'answer_option_{i}', '')).lower()
+                   for i in range(1, 6))
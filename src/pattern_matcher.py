@@ -6,6 +6,8 @@ Specialized algorithms for complex pattern recognition
 import re
 from typing import List, Dict, Any, Optional, Tuple
 import numpy as np
+from keyword_matcher import PROBLEM_KEYWORDS
+from sequence_engine import SequenceEngine
 
 
 class AdvancedPatternMatcher:
@@ -15,6 +17,7 @@ class AdvancedPatternMatcher:
     
     def __init__(self):
         self.known_patterns = {}
+        self.sequence_engine = SequenceEngine()
     
     def extract_all_numbers(self, text: str) -> List[float]:
         """Extract all numbers including fractions and decimals"""
@@ -35,123 +38,28 @@ class AdvancedPatternMatcher:
     def detect_sequence_type(self, numbers: List[float]) -> Dict[str, Any]:
         """
         Comprehensive sequence type detection
-        Returns type and parameters
+        Returns type and parameters, with the engine's prediction and confidence
         """
-        if len(numbers) < 3:
-            return {'type': 'unknown'}
-        
-        # Test arithmetic
-        diffs = [numbers[i+1] - numbers[i] for i in range(len(numbers)-1)]
-        if len(set([round(d, 6) for d in diffs])) == 1:
-            return {'type': 'arithmetic', 'difference': diffs[0]}
-        
-        # Test geometric
-        if all(n != 0 for n in numbers[:-1]):
-            ratios = [numbers[i+1] / numbers[i] for i in range(len(numbers)-1)]
-            if len(set([round(r, 6) for r in ratios])) == 1:
-                return {'type': 'geometric', 'ratio': ratios[0]}
-        
-        # Test quadratic (n^2 + c)
-        indices = list(range(1, len(numbers) + 1))
-        for c in range(-10, 11):
-            if all(abs(numbers[i] - ((i+1)**2 + c)) < 0.1 for i in range(len(numbers))):
-                return {'type': 'quadratic', 'formula': f'n^2 + {c}', 'constant': c}
-        
-        # Test n^2 + n
-        if all(abs(numbers[i] - ((i+1)**2 + (i+1))) < 0.1 for i in range(len(numbers))):
-            return {'type': 'quadratic', 'formula': 'n^2 + n'}
-        
-        # Test cubic
-        if all(abs(numbers[i] - (i+1)**3) < 0.1 for i in range(len(numbers))):
-            return {'type': 'cubic', 'formula': 'n^3'}
-        
-        # Test fibonacci-like
-        if all(abs(numbers[i] - (numbers[i-1] + numbers[i-2])) < 0.1 
-               for i in range(2, len(numbers))):
-            return {'type': 'fibonacci'}
-        
-        # Test exponential (2^n, 3^n, etc.)
-        for base in [2, 3, 4, 5]:
-            if all(abs(numbers[i] - base**(i+1)) < 0.1 for i in range(len(numbers))):
-                return {'type': 'exponential', 'base': base}
-        
-        # Test second-order differences (quadratic)
-        if len(numbers) >= 4:
-            second_diffs = [diffs[i+1] - diffs[i] for i in range(len(diffs)-1)]
-            if len(set([round(d, 6) for d in second_diffs])) == 1:
-                return {'type': 'quadratic_sequence', 'second_difference': second_diffs[0]}
-        
-        # Test alternating patterns
-        if len(numbers) >= 4:
-            odd_vals = [numbers[i] for i in range(0, len(numbers), 2)]
-            even_vals = [numbers[i] for i in range(1, len(numbers), 2)]
-            
-            # Check if odd and even positions form separate patterns
-            if len(odd_vals) >= 2:
-                odd_diffs = [odd_vals[i+1] - odd_vals[i] for i in range(len(odd_vals)-1)]
-                if len(set([round(d, 6) for d in odd_diffs])) == 1:
-                    return {'type': 'alternating', 'odd_diff': odd_diffs[0] if odd_diffs else 0}
-        
-        return {'type': 'unknown'}
+        return self.sequence_engine.analyze(numbers)
+    
+    def detect_sequence_types(self, sequences: List[List[float]]) -> List[Dict[str, Any]]:
+        """detect_sequence_type for many sequences in one batched engine pass"""
+        return self.sequence_engine.analyze_batch(sequences)
     
     def predict_next_value(self, numbers: List[float], pattern_info: Dict[str, Any]) -> Optional[float]:
         """Predict next value based on detected pattern"""
         if not numbers:
             return None
-        
-        pattern_type = pattern_info.get('type')
-        
-        if pattern_type == 'arithmetic':
-            return numbers[-1] + pattern_info['difference']
-        
-        elif pattern_type == 'geometric':
-            return numbers[-1] * pattern_info['ratio']
-        
-        elif pattern_type == 'quadratic':
-            formula = pattern_info.get('formula', '')
-            if 'n^2 +' in formula:
-                c = pattern_info.get('constant', 0)
-                n = len(numbers) + 1
-                return n**2 + c
-            elif formula == 'n^2 + n':
-                n = len(numbers) + 1
-                return n**2 + n
-        
-        elif pattern_type == 'cubic':
-            n = len(numbers) + 1
-            return n**3
-        
-        elif pattern_type == 'fibonacci':
-            return numbers[-1] + numbers[-2]
-        
-        elif pattern_type == 'exponential':
-            base = pattern_info['base']
-            return base ** (len(numbers) + 1)
-        
-        elif pattern_type == 'quadratic_sequence':
-            # Use second difference to predict
-            first_diffs = [numbers[i+1] - numbers[i] for i in range(len(numbers)-1)]
-            next_first_diff = first_diffs[-1] + pattern_info['second_difference']
-            return numbers[-1] + next_first_diff
-        
-        return None
+        return pattern_info.get('prediction')
     
     def analyze_problem_keywords(self, text: str) -> Dict[str, bool]:
         """
         Extract key indicators from problem text
         """
-        text_lower = text.lower()
+        keywords = PROBLEM_KEYWORDS.scan(text.lower())
         
-        return {
-            'requires_optimization': any(kw in text_lower for kw in ['minimum', 'maximum', 'optimal', 'shortest', 'longest', 'least', 'most', 'best']),
-            'requires_spatial': any(kw in text_lower for kw in ['cube', 'room', 'direction', 'corner', 'face', 'edge', 'rotate', 'flip']),
-            'requires_logic': any(kw in text_lower for kw in ['truth', 'liar', 'riddle', 'logic', 'deduce', 'if', 'then', 'therefore']),
-            'requires_sequence': any(kw in text_lower for kw in ['sequence', 'pattern', 'next', 'series', 'progression']),
-            'is_impossible': any(kw in text_lower for kw in ['impossible', 'cannot', 'no way', 'no solution', 'logical trap']),
-            'requires_counting': any(kw in text_lower for kw in ['how many', 'count', 'number of']),
-            'requires_scheduling': any(kw in text_lower for kw in ['schedule', 'order', 'sequence', 'tasks', 'deadline']),
-            'has_time_constraint': any(kw in text_lower for kw in ['hour', 'minute', 'second', 'day', 'week', 'time']),
-        }
+        return {name: f'analysis.{name}' in keywords
+                for name in PROBLEM_KEYWORDS.group_names('analysis')}
     
     def extract_constraints(self, text: str) -> List[str]:
         """Extract constraints from problem description"""
@@ -210,6 +118,9 @@ class AdvancedPatternMatcher:
         if pattern_info.get('type') == 'unknown':
             return 0.3
         
+        if 'confidence' in pattern_info:
+            return pattern_info['confidence']
+        
         known_types = ['arithmetic', 'geometric', 'quadratic', 'cubic', 'fibonacci', 'exponential']
         if pattern_info.get('type') in known_types:
             return 0.95
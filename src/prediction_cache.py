@@ -0,0 +1,233 @@
+"""
+Solvra - Prediction Cache Module
+Content-addressed cache of final predictions, so repeated problems
+(re-submissions, retries, shared question banks) skip the agent, the
+ensemble and the verifier. Two tiers: an in-process LRU in front of an
+optional SQLite file that survives restarts.
+
+Keys hash the topic, the whitespace-normalised statement and answer
+options, the training label when one is present (the agent reads it),
+the stages that produced the answer, and a model fingerprint made of the
+source code and the MLEnhancer's learned counts. A new fingerprint drops
+every entry made under the old one, so retraining on different data
+invalidates the cache automatically.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+# Bump when the key layout or stored value changes
+CACHE_FORMAT_VERSION = 1
+
+_SOURCE_DIR = Path(__file__).resolve().parent
+_code_fingerprint = None
+
+
+def code_fingerprint() -> str:
+    """Hash of every module in src/: any code change starts a fresh cache"""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha256()
+        for path in sorted(_SOURCE_DIR.glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+        _code_fingerprint = digest.hexdigest()[:16]
+    return _code_fingerprint
+
+
+def model_fingerprint(ml_enhancer=None) -> str:
+    """Cache format, code and learned-model fingerprint for the predictions being cached"""
+    learned = ml_enhancer.fingerprint if ml_enhancer is not None and ml_enhancer.trained else "untrained"
+    return f"v{CACHE_FORMAT_VERSION}:{code_fingerprint()}:{learned}"
+
+
+def _normalize(value: Any) -> Optional[str]:
+    """Whitespace-collapsed NFC text (None for missing values)"""
+    if value is None or (isinstance(value, float) and value != value):
+        return None
+    return ' '.join(unicodedata.normalize('NFC', str(value)).split())
+
+
+def _label(problem: Mapping[str, Any]) -> Optional[str]:
+    """The training label as text (3, 3.0 and np.int64(3) all give '3'), None if absent"""
+    if 'correct_option_number' not in problem:
+        return None
+    label = problem['correct_option_number']
+    try:
+        if float(label).is_integer():
+            return str(int(label))
+    except (TypeError, ValueError):
+        pass
+    return _normalize(label)
+
+
+def problem_key(problem: Mapping[str, Any], stages: str, fingerprint: str) -> str:
+    """Stable hex key for one problem answered by `stages` under `fingerprint`"""
+    content = [
+        _normalize(problem.get('topic')),
+        _normalize(problem.get('problem_statement')),
+        [_normalize(problem.get(f'answer_option_{i}')) for i in range(1, 6)],
+        _label(problem),
+        stages,
+        fingerprint,
+    ]
+    encoded = json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class PredictionCache:
+    """
+    LRU dict of the most recent `capacity` predictions, backed by an optional
+    SQLite file (path). Values are small JSON-able dicts. Safe to share
+    between threads.
+    """
+
+    def __init__(self, path: Optional[str] = None, capacity: int = 10_000,
+                 commit_every: int = 256):
+        self.capacity = capacity
+        self.commit_every = commit_every
+        self.fingerprint = None
+        self._memory: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = 0
+
+        self.hits = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidated = 0
+
+        self.path = Path(path) if path else None
+        self._db = None
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS predictions ("
+                             "key TEXT PRIMARY KEY, fingerprint TEXT NOT NULL, "
+                             "value TEXT NOT NULL, created REAL NOT NULL)")
+            self._db.commit()
+
+    def set_fingerprint(self, fingerprint: str):
+        """
+        Use entries made under `fingerprint` only. When it differs from the
+        stored one, the memory tier is cleared and stale SQLite rows deleted.
+        """
+        with self._lock:
+            if fingerprint == self.fingerprint:
+                return
+            self.fingerprint = fingerprint
+            self.invalidated += len(self._memory)
+            self._memory.clear()
+            if self._db is not None:
+                cursor = self._db.execute("DELETE FROM predictions WHERE fingerprint != ?", (fingerprint,))
+                self.invalidated += max(cursor.rowcount, 0)
+                self._db.commit()
+                self._pending = 0
+
+    def key(self, problem: Mapping[str, Any], stages: str) -> str:
+        if self.fingerprint is None:
+            raise ValueError("PredictionCache.set_fingerprint must be called before use")
+        return problem_key(problem, stages, self.fingerprint)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached value for key, or None (counted as a miss)"""
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                self.memory_hits += 1
+                return value
+
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM predictions WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(key, value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]):
+        with self._lock:
+            self._remember(key, value)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?)",
+                                 (key, self.fingerprint, json.dumps(value), time.time()))
+                self._pending += 1
+                if self._pending >= self.commit_every:
+                    self._db.commit()
+                    self._pending = 0
+
+    def _remember(self, key: str, value: Dict[str, Any]):
+        """Insert into the LRU tier, evicting the least recently used entry when full"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def flush(self):
+        """Commit pending SQLite writes"""
+        with self._lock:
+            if self._db is not None and self._pending:
+                self._db.commit()
+                self._pending = 0
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def disk_entries(self) -> int:
+        if self._db is None:
+            return 0
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM predictions").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the performance report"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'invalidated': self.invalidated,
+            'memory_entries': len(self._memory),
+            'capacity': self.capacity,
+            'disk_entries': self.disk_entries(),
+            'path': str(self.path) if self.path else None,
+        }
+
+    def report_lines(self) -> List[str]:
+        """Text lines for the performance report"""
+        stats = self.stats()
+        lines = [
+            f"  Lookups:            {stats['hits'] + stats['misses']} "
+            f"({stats['hit_rate'] * 100:.1f}% hit rate)",
+            f"  Hits:               {stats['hits']} ({stats['memory_hits']} memory, {stats['disk_hits']} disk)",
+            f"  Misses:             {stats['misses']}",
+            f"  Evictions:          {stats['evictions']} (LRU capacity {stats['capacity']})",
+            f"  Invalidated:        {stats['invalidated']} (model or code changed)",
+        ]
+        if stats['path']:
+            lines.append(f"  SQLite:             {stats['path']} ({stats['disk_entries']} entries)")
+        return lines
@@ -6,27 +6,84 @@ Handles data loading, cleaning, and formatting for the reasoning pipeline
 import pandas as pd
 import numpy as np
 import re
-from typing import Dict, List, Tuple, Optional
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple, Optional
 from pathlib import Path
+from keyword_matcher import PROBLEM_KEYWORDS, PROBLEM_VOCABULARIES
+from data_io import DATA_FORMATS, TableWriter, iter_table_chunks, read_table, write_table
+
+
+# Problem-type flags in output column order
+FLAG_COLUMNS = [
+    'requires_math', 'requires_sequence', 'requires_spatial', 'requires_logic',
+    'requires_optimization', 'requires_symbolic', 'has_numbers', 'has_multiple_steps'
+]
+
+# Flags set when the lowercased topic contains the keyword
+TOPIC_FLAG_KEYWORDS = {
+    'requires_sequence': 'sequence',
+    'requires_spatial': 'spatial',
+    'requires_optimization': 'optimization',
+}
+
+# Flags set when the lowercased problem statement contains any keyword
+# (the 'flags' group of the shared keyword automaton)
+PROBLEM_FLAG_KEYWORDS = PROBLEM_VOCABULARIES['flags']
+
+# Text columns cleaned for each split
+SPLIT_TEXT_COLUMNS = {
+    'train': ['problem_statement', 'solution'],
+    'test': ['problem_statement'],
+}
+
+# Rows per chunk for the bounded-memory loaders
+DEFAULT_CHUNK_SIZE = 50_000
+
+NUMBER_PATTERN = r'\b\d+\.?\d*\b'
+NUMBER_REGEX = re.compile(NUMBER_PATTERN)
+
+
+def problem_records(df: pd.DataFrame) -> List[Mapping[str, Any]]:
+    """
+    The rows of df as read-only problem mappings, converted in one pass:
+    to_dict('records') boxes every value once as a plain Python scalar
+    (no per-row Series), and the read-only views can be shared by every
+    stage without copying. Use df.to_dict('records') where records must
+    be pickled (process pools).
+    """
+    return [MappingProxyType(record) for record in df.to_dict('records')]
 
 
 class DataPreprocessor:
     """
     Preprocesses raw CSV data for the Solvra reasoning system.
     Cleans text, extracts patterns, and categorizes problem types.
+    data_format ('csv', 'parquet' or 'feather') picks the raw files read
+    (train.<ext>, test.<ext>) and the preprocessed files written.
     """
     
-    def __init__(self, data_dir: str = "../data"):
+    def __init__(self, data_dir: str = "../data", data_format: str = 'csv'):
+        if data_format not in DATA_FORMATS:
+            raise ValueError(f"data_format must be one of {list(DATA_FORMATS)}, got {data_format!r}")
         self.data_dir = Path(data_dir)
+        self.data_format = data_format
         self.train_df = None
         self.test_df = None
         self.problem_categories = {}
         
+        # Topic counts per split, accumulated chunk by chunk by iter_chunks
+        self.topic_counts: Dict[str, Counter] = {}
+    
+    def data_path(self, name: str, data_format: Optional[str] = None) -> Path:
+        """data_dir/<name>.<ext> for the given (default: configured) format"""
+        return self.data_dir / f"{name}{DATA_FORMATS[data_format or self.data_format]}"
+        
     def load_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """Load training and test datasets"""
         print(" Loading datasets...")
-        self.train_df = pd.read_csv(self.data_dir / "train.csv")
-        self.test_df = pd.read_csv(self.data_dir / "test.csv")
+        self.train_df = read_table(self.data_path("train"))
+        self.test_df = read_table(self.data_path("test"))
         
         print(f" Loaded {len(self.train_df)} training examples")
         print(f" Loaded {len(self.test_df)} test examples")
@@ -37,6 +94,18 @@ class DataPreprocessor:
         
         return self.train_df, self.test_df
     
+    def load_train_data(self) -> pd.DataFrame:
+        """Load only the training dataset"""
+        self.train_df = read_table(self.data_path("train"))
+        print(f" Loaded {len(self.train_df)} training examples")
+        return self.train_df
+    
+    def convert_data(self, data_format: str):
+        """Rewrite the raw train/test files in another format (e.g. CSV -> Parquet)"""
+        for split in SPLIT_TEXT_COLUMNS:
+            write_table(read_table(self.data_path(split)), self.data_path(split, data_format))
+            print(f" Wrote {self.data_path(split, data_format)}")
+    
     def clean_text(self, text: str) -> str:
         """Clean and normalize text"""
         if pd.isna(text):
@@ -51,11 +120,26 @@ class DataPreprocessor:
         
         return text.strip()
     
+    def clean_text_series(self, series: pd.Series) -> pd.Series:
+        """
+        Column-at-a-time clean_text: each distinct value is cleaned once
+        and the results are scattered back by factorized code
+        """
+        codes, uniques = pd.factorize(series)
+        cleaned = np.array([self.clean_text(text) for text in uniques] + [""], dtype=object)
+        
+        # Missing values get code -1, which picks the trailing ""
+        result = pd.Series(cleaned[codes], index=series.index, name=series.name)
+        
+        # Hand back the column's own string dtype, as Series.apply would
+        if isinstance(series.dtype, pd.StringDtype):
+            result = result.astype(series.dtype)
+        return result
+    
     def extract_numbers(self, text: str) -> List[float]:
         """Extract all numbers from text"""
         # Pattern matches integers, decimals, fractions
-        pattern = r'\b\d+\.?\d*\b'
-        numbers = re.findall(pattern, text)
+        numbers = re.findall(NUMBER_PATTERN, text)
         return [float(n) for n in numbers]
     
     def extract_time_durations(self, text: str) -> List[Tuple[float, str]]:
@@ -78,99 +162,152 @@ class DataPreprocessor:
         topic = row['topic'].lower()
         problem = row['problem_statement'].lower()
         
-        flags = {
-            'requires_math': False,
-            'requires_sequence': False,
-            'requires_spatial': False,
-            'requires_logic': False,
-            'requires_optimization': False,
-            'requires_symbolic': False,
-            'has_numbers': False,
-            'has_multiple_steps': False
-        }
-        
-        # Check for mathematical problems
-        if any(word in problem for word in ['calculate', 'sum', 'product', 'divide', 'multiply', 'percentage']):
-            flags['requires_math'] = True
-        
-        # Check for sequences
-        if 'sequence' in topic or 'sequence' in problem:
-            flags['requires_sequence'] = True
-        
-        # Check for spatial reasoning
-        if 'spatial' in topic or any(word in problem for word in ['cube', 'corner', 'room', 'door', 'direction']):
-            flags['requires_spatial'] = True
-        
-        # Check for logic puzzles
-        if any(word in problem for word in ['always lies', 'always tells', 'truth', 'liar', 'logic']):
-            flags['requires_logic'] = True
-        
-        # Check for optimization
-        if 'optimization' in topic or any(word in problem for word in ['minimum', 'maximum', 'optimal', 'shortest', 'least']):
-            flags['requires_optimization'] = True
-        
-        # Check for symbolic math
-        if any(word in problem for word in ['equation', 'solve for', 'variable', 'formula']):
-            flags['requires_symbolic'] = True
+        flags = {flag: False for flag in FLAG_COLUMNS}
+        
+        # Topic-level hints (sequence, spatial, optimization)
+        for flag, keyword in TOPIC_FLAG_KEYWORDS.items():
+            if keyword in topic:
+                flags[flag] = True
+        
+        # Keyword checks: math, sequence, spatial, logic, optimization,
+        # symbolic math and multi-step problems, all in one automaton pass
+        keywords = PROBLEM_KEYWORDS.scan(problem)
+        for flag in PROBLEM_FLAG_KEYWORDS:
+            if f'flags.{flag}' in keywords:
+                flags[flag] = True
         
         # Check if numbers present
         numbers = self.extract_numbers(problem)
         flags['has_numbers'] = len(numbers) > 0
         
-        # Check for multi-step problems
-        if any(word in problem for word in ['first', 'then', 'after', 'next', 'finally', 'sequence']):
-            flags['has_multiple_steps'] = True
-        
         return flags
     
-    def preprocess_training_data(self) -> pd.DataFrame:
-        """Full preprocessing pipeline for training data"""
-        print("\n🔧 Preprocessing training data...")
+    def prepare_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Clean a single raw problem and add its problem-type flags"""
+        problem = dict(record)
+        for col in ['problem_statement', 'solution'] + [f'answer_option_{i}' for i in range(1, 6)]:
+            if col in problem:
+                value = problem[col]
+                if value is not None and not isinstance(value, str):
+                    value = str(value)  # e.g. numeric answer options in JSON
+                problem[col] = self.clean_text(value)
+        problem.update(self.identify_problem_type(problem))
+        return problem
+    
+    def identify_problem_types(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Vectorized identify_problem_type: every flag column for the whole frame
+        from str.contains scans over the distinct topics and statements
+        """
+        topic_codes, topics = pd.factorize(df['topic'])
+        problem_codes, problems = pd.factorize(df['problem_statement'])
         
-        # Clean text columns
-        for col in ['problem_statement', 'solution']:
-            if col in self.train_df.columns:
-                self.train_df[col] = self.train_df[col].apply(self.clean_text)
+        # Object dtype keeps Python string/regex semantics whatever the column storage
+        topics = pd.Series(topics, dtype=object).str.lower()
+        problems = pd.Series(problems, dtype=object).str.lower()
         
-        # Clean answer options
-        for i in range(1, 6):
-            col = f'answer_option_{i}'
-            if col in self.train_df.columns:
-                self.train_df[col] = self.train_df[col].apply(self.clean_text)
+        flags = {}
+        for flag in FLAG_COLUMNS:
+            hit = np.zeros(len(df), dtype=bool)
+            if flag in TOPIC_FLAG_KEYWORDS:
+                topic_hit = topics.str.contains(TOPIC_FLAG_KEYWORDS[flag], regex=False).to_numpy(dtype=bool)
+                hit |= np.append(topic_hit, False)[topic_codes]  # code -1 (missing) -> False
+            if flag in PROBLEM_FLAG_KEYWORDS or flag == 'has_numbers':
+                problem_hit = np.zeros(len(problems), dtype=bool)
+                if flag == 'has_numbers':
+                    problem_hit |= problems.str.contains(NUMBER_REGEX).to_numpy(dtype=bool)
+                else:
+                    # Plain substring scans beat one alternation regex under Python's re
+                    for word in PROBLEM_FLAG_KEYWORDS[flag]:
+                        problem_hit |= problems.str.contains(word, regex=False).to_numpy(dtype=bool)
+                hit |= np.append(problem_hit, False)[problem_codes]
+            flags[flag] = hit
         
-        # Extract problem characteristics
-        problem_types = self.train_df.apply(self.identify_problem_type, axis=1)
-        problem_types_df = pd.DataFrame(problem_types.tolist())
+        return pd.DataFrame(flags, index=df.index)
+    
+    def _preprocess_frame(self, df: pd.DataFrame, text_columns: List[str],
+                          vectorized: bool) -> pd.DataFrame:
+        """Clean text columns and append the problem-type flag columns"""
+        columns = text_columns + [f'answer_option_{i}' for i in range(1, 6)]
+        
+        if vectorized:
+            for col in columns:
+                if col in df.columns:
+                    df[col] = self.clean_text_series(df[col])
+            problem_types_df = self.identify_problem_types(df)
+        else:
+            for col in columns:
+                if col in df.columns:
+                    df[col] = df[col].apply(self.clean_text)
+            problem_types = df.apply(self.identify_problem_type, axis=1)
+            problem_types_df = pd.DataFrame(problem_types.tolist(), index=df.index)
         
         # Combine with original data
-        self.train_df = pd.concat([self.train_df, problem_types_df], axis=1)
+        return pd.concat([df, problem_types_df], axis=1)
+    
+    def preprocess_training_data(self, vectorized: bool = True) -> pd.DataFrame:
+        """Full preprocessing pipeline for training data"""
+        print("\n🔧 Preprocessing training data...")
+        
+        self.train_df = self._preprocess_frame(
+            self.train_df, SPLIT_TEXT_COLUMNS['train'], vectorized
+        )
         
         print(" Training data preprocessed")
         return self.train_df
     
-    def preprocess_test_data(self) -> pd.DataFrame:
+    def preprocess_test_data(self, vectorized: bool = True) -> pd.DataFrame:
         """Full preprocessing pipeline for test data"""
         print("\n Preprocessing test data...")
         
-        # Clean text columns
-        self.test_df['problem_statement'] = self.test_df['problem_statement'].apply(self.clean_text)
-        
-        # Clean answer options
-        for i in range(1, 6):
-            col = f'answer_option_{i}'
-            if col in self.test_df.columns:
-                self.test_df[col] = self.test_df[col].apply(self.clean_text)
-        
-        # Extract problem characteristics
-        problem_types = self.test_df.apply(self.identify_problem_type, axis=1)
-        problem_types_df = pd.DataFrame(problem_types.tolist())
-        
-        # Combine with original data
-        self.test_df = pd.concat([self.test_df, problem_types_df], axis=1)
+        self.test_df = self._preprocess_frame(
+            self.test_df, SPLIT_TEXT_COLUMNS['test'], vectorized
+        )
         
         print(" Test data preprocessed")
         return self.test_df
     
+    def iter_chunks(self, split: str, chunksize: int = DEFAULT_CHUNK_SIZE,
+                    vectorized: bool = True) -> Iterator[pd.DataFrame]:
+        """
+        Read the raw split file chunksize rows at a time, yielding each chunk cleaned
+        and flagged. Only one chunk is held, so memory is bounded by chunksize
+        whatever the file size; topic counts accumulate in topic_counts[split].
+        Chunks keep their row positions in the file as index.
+        """
+        counts = self.topic_counts[split] = Counter()
+        for chunk in iter_table_chunks(self.data_path(split), chunksize):
+            counts.update(chunk['topic'].value_counts().to_dict())
+            yield self._preprocess_frame(chunk, SPLIT_TEXT_COLUMNS[split], vectorized)
+    
+    def save_chunks(self, chunks: Iterable[pd.DataFrame], split: str) -> Iterator[pd.DataFrame]:
+        """Append each chunk to <split>_preprocessed.<ext> as it passes through"""
+        with TableWriter(self.data_path(f"{split}_preprocessed")) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+                yield chunk
+    
+    def topic_distribution(self, split: str) -> pd.Series:
+        """Accumulated topic counts for a chunked split, laid out like value_counts()"""
+        counts = pd.Series(self.topic_counts.get(split, {}), dtype='int64', name='count')
+        counts.index.name = 'topic'
+        return counts.sort_values(ascending=False, kind='stable')
+    
+    def preprocess_chunked(self, chunksize: int = DEFAULT_CHUNK_SIZE) -> Dict[str, int]:
+        """
+        Bounded-memory load_data + preprocess + save_preprocessed_data:
+        both splits are streamed chunk by chunk into *_preprocessed.<ext>
+        """
+        print(f" Preprocessing datasets in chunks of {chunksize} rows...")
+        rows = {}
+        for split in SPLIT_TEXT_COLUMNS:
+            rows[split] = sum(len(chunk) for chunk in self.save_chunks(self.iter_chunks(split, chunksize), split))
+            print(f" Preprocessed {rows[split]} {split} examples")
+        
+        print(f"\n Training topics distribution:")
+        print(self.topic_distribution('train'))
+        return rows
+    
     def create_problem_summary(self, row: pd.Series) -> str:
         """Create a concise summary of the problem"""
         summary = f"Topic: {row['topic']}\n"
@@ -184,12 +321,29 @@ class DataPreprocessor:
     def save_preprocessed_data(self):
         """Save preprocessed data"""
         if self.train_df is not None:
-            self.train_df.to_csv(self.data_dir / "train_preprocessed.csv", index=False)
+            write_table(self.train_df, self.data_path("train_preprocessed"))
             print(f" Saved preprocessed training data")
         
         if self.test_df is not None:
-            self.test_df.to_csv(self.data_dir / "test_preprocessed.csv", index=False)
+            write_table(self.test_df, self.data_path("test_preprocessed"))
             print(f" Saved preprocessed test data")
+    
+    def load_preprocessed_data(self) -> Tuple[pd.DataFrame, pd.DataFrame]:
+        """
+        Reload what save_preprocessed_data wrote, skipping preprocessing.
+        Parquet and Feather keep the flag columns as bool; CSV flags are
+        cast back to bool.
+        """
+        frames = []
+        for split in SPLIT_TEXT_COLUMNS:
+            df = read_table(self.data_path(f"{split}_preprocessed"))
+            flags = [flag for flag in FLAG_COLUMNS if flag in df.columns and df[flag].dtype != bool]
+            if flags:
+                df[flags] = df[flags].astype(bool)
+            frames.append(df)
+        self.train_df, self.test_df = frames
+        print(f" Loaded {len(self.train_df)} preprocessed training and {len(self.test_df)} test examples")
+        return self.train_df, self.test_df
 
 
 def main():
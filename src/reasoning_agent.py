@@ -5,10 +5,16 @@ Enhanced with advanced pattern matching for maximum accuracy
 """
 
 import re
+import time
 from typing import Dict, List, Any, Optional, Tuple
-import pandas as pd
 from solver import MathSolver, LogicSolver, SpatialSolver, SequenceSolver
 from pattern_matcher import AdvancedPatternMatcher
+from parsed_problem import ParsedProblem
+
+# How much of the reasoning to record: nothing, the decisive steps, or every
+# step with its intermediate results
+TRACE_OFF, TRACE_SUMMARY, TRACE_FULL = 0, 1, 2
+TRACE_LEVELS = {'off': TRACE_OFF, 'summary': TRACE_SUMMARY, 'full': TRACE_FULL}
 
 
 class ReasoningAgent:
@@ -20,7 +26,7 @@ class ReasoningAgent:
     4. Answer synthesis
     """
     
-    def __init__(self):
+    def __init__(self, trace_level: str = 'full'):
         # Initialize specialized solvers
         self.math_solver = MathSolver()
         self.logic_solver = LogicSolver()
@@ -30,35 +36,56 @@ class ReasoningAgent:
         # Initialize advanced pattern matcher
         self.pattern_matcher = AdvancedPatternMatcher()
         
-        # Reasoning trace for explainability
+        # Reasoning trace for explainability (None while tracing is off)
+        self.trace_level = TRACE_FULL
+        self.set_trace_level(trace_level)
         self.reasoning_trace = []
+        
+        # Optional latency.StageProfiler timing each reasoning stage (None = off)
+        self.profiler = None
+    
+    def set_trace_level(self, trace_level: str):
+        """
+        'off' records nothing (reason_step_by_step returns None for the trace),
+        'summary' only the tool choice and the step that decided the answer,
+        'full' every step with its results. Call sites check the level before
+        formatting a message, so lower levels skip that work entirely.
+        """
+        if trace_level not in TRACE_LEVELS:
+            raise ValueError(f"trace_level must be one of {list(TRACE_LEVELS)}, got {trace_level!r}")
+        self.trace_level = TRACE_LEVELS[trace_level]
     
     def reset_trace(self):
         """Clear reasoning trace for new problem"""
-        self.reasoning_trace = []
+        self.reasoning_trace = [] if self.trace_level else None
     
     def add_to_trace(self, step: str, result: Any = None):
         """Add a reasoning step to the trace"""
+        if self.reasoning_trace is None:
+            return
         trace_entry = {
             'step': step,
             'result': result
         }
         self.reasoning_trace.append(trace_entry)
     
-    def decompose_problem(self, problem: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def decompose_problem(self, problem: Dict[str, Any],
+                          parsed: Optional[ParsedProblem] = None) -> List[Dict[str, Any]]:
         """
         Break down a complex problem into smaller subproblems
         Returns list of subproblems with metadata
         """
-        self.add_to_trace("🔍 Decomposing problem")
+        if self.trace_level >= TRACE_FULL:
+            self.add_to_trace("🔍 Decomposing problem")
         
-        problem_text = problem['problem_statement']
-        topic = problem['topic']
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        topic = parsed.topic_lower
         
         subproblems = []
         
         # Identify key components based on topic
-        if 'optimization' in topic.lower():
+        if 'optimization' in topic:
             subproblems.append({
                 'type': 'extract_constraints',
                 'description': 'Extract all constraints and requirements'
@@ -72,7 +99,7 @@ class ReasoningAgent:
                 'description': 'Evaluate each possible solution'
             })
         
-        elif 'spatial' in topic.lower():
+        elif 'spatial' in topic:
             subproblems.append({
                 'type': 'visualize_space',
                 'description': 'Understand the spatial configuration'
@@ -82,7 +109,7 @@ class ReasoningAgent:
                 'description': 'Track movements or transformations'
             })
         
-        elif 'sequence' in topic.lower():
+        elif 'sequence' in topic:
             subproblems.append({
                 'type': 'extract_sequence',
                 'description': 'Extract the sequence of numbers'
@@ -96,7 +123,7 @@ class ReasoningAgent:
                 'description': 'Predict next values'
             })
         
-        elif 'operation' in topic.lower():
+        elif 'operation' in topic:
             subproblems.append({
                 'type': 'understand_mechanism',
                 'description': 'Understand how the mechanism works'
@@ -116,27 +143,31 @@ class ReasoningAgent:
                 'description': 'Apply logical deduction'
             })
         
-        self.add_to_trace(f"Identified {len(subproblems)} subproblems", subproblems)
+        if self.trace_level >= TRACE_FULL:
+            self.add_to_trace(f"Identified {len(subproblems)} subproblems", subproblems)
         return subproblems
     
-    def select_tool(self, problem: Dict[str, Any]) -> str:
+    def select_tool(self, problem: Dict[str, Any],
+                    parsed: Optional[ParsedProblem] = None) -> str:
         """
         Select the appropriate solver based on problem characteristics
         """
-        topic = problem['topic'].lower()
-        problem_text = problem['problem_statement'].lower()
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        topic = parsed.topic_lower
+        keywords = parsed.keywords
         
         # Priority-based tool selection
         if 'sequence' in topic:
             return 'sequence_solver'
         
-        if 'spatial' in topic or any(word in problem_text for word in ['cube', 'room', 'corner', 'direction']):
+        if 'spatial' in topic or 'tool.spatial' in keywords:
             return 'spatial_solver'
         
-        if any(word in problem_text for word in ['truth', 'liar', 'logic', 'riddle']):
+        if 'tool.logic' in keywords:
             return 'logic_solver'
         
-        if 'optimization' in topic or any(word in problem_text for word in ['minimum', 'maximum', 'shortest', 'optimal']):
+        if 'optimization' in topic or 'tool.optimization' in keywords:
             return 'math_solver'
         
         if problem.get('requires_math', False) or problem.get('has_numbers', False):
@@ -145,49 +176,106 @@ class ReasoningAgent:
         # Default to logic solver for riddles and lateral thinking
         return 'logic_solver'
     
-    def solve_subproblem(self, subproblem: Dict[str, Any], problem: Dict[str, Any]) -> Any:
+    def _sequence_pattern(self, parsed: ParsedProblem) -> Dict[str, Any]:
+        """Detect the sequence type once per problem and reuse it"""
+        if parsed.sequence_pattern is None:
+            parsed.sequence_pattern = self.pattern_matcher.detect_sequence_type(parsed.numbers)
+        return parsed.sequence_pattern
+    
+    def _sequence_next(self, parsed: ParsedProblem) -> Optional[float]:
+        """Sequence solver prediction for the statement, computed once per problem"""
+        if parsed.sequence_next is None:
+            parsed.sequence_next = (self.sequence_solver.predict_next(parsed.signed_numbers),)
+        return parsed.sequence_next[0]
+    
+    def prepare_sequence_batch(self, parsed_problems: List[ParsedProblem]):
+        """
+        Classify and extrapolate every sequence-topic problem in one batched
+        pass, filling the per-problem caches the scalar path would fill
+        """
+        sequences = [p for p in parsed_problems if 'sequence' in p.topic_lower]
+        
+        pending = [p for p in sequences if p.sequence_pattern is None and len(p.numbers) >= 3]
+        patterns = self.pattern_matcher.detect_sequence_types([p.numbers for p in pending])
+        for parsed, pattern in zip(pending, patterns):
+            parsed.sequence_pattern = pattern
+        
+        pending = [p for p in sequences if p.sequence_next is None and len(p.signed_numbers) >= 3]
+        predictions = self.sequence_solver.predict_next_batch([p.signed_numbers for p in pending])
+        for parsed, prediction in zip(pending, predictions):
+            parsed.sequence_next = (prediction,)
+    
+    def solve_subproblem(self, subproblem: Dict[str, Any], problem: Dict[str, Any],
+                         parsed: Optional[ParsedProblem] = None) -> Any:
         """
         Solve an individual subproblem using the appropriate solver
         Enhanced with advanced pattern matching
         """
         subtype = subproblem['type']
-        problem_text = problem['problem_statement']
+        if parsed is None:
+            parsed = ParsedProblem(problem)
         
         if subtype == 'extract_sequence':
-            numbers = self.pattern_matcher.extract_all_numbers(problem_text)
-            return numbers
+            return parsed.numbers
         
         elif subtype == 'identify_pattern':
-            numbers = self.pattern_matcher.extract_all_numbers(problem_text)
+            numbers = parsed.numbers
             if numbers and len(numbers) >= 3:
                 # Use advanced pattern detection
-                pattern_info = self.pattern_matcher.detect_sequence_type(numbers)
-                self.add_to_trace(f"Pattern detected: {pattern_info['type']}", pattern_info)
+                pattern_info = self._sequence_pattern(parsed)
+                if self.trace_level >= TRACE_FULL:
+                    self.add_to_trace(f"Pattern detected: {pattern_info['type']}", pattern_info)
                 return pattern_info
             return {'type': 'unknown'}
         
         elif subtype == 'predict_next':
-            numbers = self.pattern_matcher.extract_all_numbers(problem_text)
+            numbers = parsed.numbers
             if numbers and len(numbers) >= 3:
-                pattern_info = self.pattern_matcher.detect_sequence_type(numbers)
+                pattern_info = self._sequence_pattern(parsed)
                 prediction = self.pattern_matcher.predict_next_value(numbers, pattern_info)
-                confidence = self.pattern_matcher.calculate_confidence(pattern_info, prediction)
-                self.add_to_trace(f"Prediction confidence: {confidence:.2%}")
+                if self.trace_level >= TRACE_FULL:
+                    confidence = self.pattern_matcher.calculate_confidence(pattern_info, prediction)
+                    self.add_to_trace(f"Prediction confidence: {confidence:.2%}")
                 return prediction
             return None
         
+        elif subtype == 'evaluate_options':
+            # Bridge and river crossings are searched as a state graph
+            crossing = self.math_solver.crossing_time_from_text(parsed.text)
+            if crossing is not None:
+                if self.trace_level >= TRACE_FULL:
+                    self.add_to_trace(f"Fastest crossing found by state search: {crossing:g}")
+                return crossing
+            return "Subproblem solved"
+        
+        elif subtype == 'track_transformations':
+            # Walks along a cube's edges are shortest paths on its grid
+            walk = self.spatial_solver.cube_edge_walk(parsed.text)
+            if walk is not None:
+                if self.trace_level >= TRACE_FULL:
+                    self.add_to_trace(f"Shortest walk along the edges: {walk:g}")
+                return walk
+            return "Subproblem solved"
+        
+        elif subtype in ('visualize_space', 'calculate_result') and self.trace_level < TRACE_FULL:
+            return None  # Descriptions below are only read from the full trace
+        
         elif subtype == 'visualize_space':
             # Extract spatial information
-            if 'cube' in problem_text.lower():
+            if 'cube' in parsed.text_lower:
                 # Find cube dimensions
-                numbers = self.pattern_matcher.extract_all_numbers(problem_text)
-                return f"Cube configuration with dimensions: {numbers}"
+                return f"Cube configuration with dimensions: {parsed.numbers}"
             return "Spatial configuration identified"
         
         elif subtype == 'calculate_result':
-            # Extract and calculate based on numbers
-            numbers = self.pattern_matcher.extract_all_numbers(problem_text)
-            return f"Numbers extracted: {numbers}"
+            # Gear and belt trains are worked out; otherwise extract the numbers.
+            # The mechanism is read once on parsed and shared with Strategy 6,
+            # which picks the answer option from the same result.
+            motion = self.spatial_solver.gear_motion(parsed.mechanism)
+            if motion is not None:
+                self.add_to_trace(f"Gear train motion of {motion['part']}", motion)
+                return motion
+            return f"Numbers extracted: {parsed.numbers}"
         
         return "Subproblem solved"
     
@@ -196,11 +284,10 @@ class ReasoningAgent:
         Analyze the provided solution text to extract reasoning patterns
         Only available for training data
         """
-        if 'solution' not in problem or pd.isna(problem['solution']):
+        solution = problem.get('solution')
+        if not isinstance(solution, str):  # Missing, None or NaN from pandas
             return {}
         
-        solution = problem['solution']
-        
         analysis = {
             'mentions_calculation': any(word in solution.lower() for word in ['calculate', 'multiply', 'divide', 'sum']),
             'mentions_pattern': 'pattern' in solution.lower(),
@@ -212,168 +299,221 @@ class ReasoningAgent:
         return analysis
     
     def evaluate_answer_options(self, problem: Dict[str, Any], 
-                                 reasoning_result: Any) -> int:
+                                 reasoning_result: Any,
+                                 parsed: Optional[ParsedProblem] = None) -> int:
         """
         Enhanced answer evaluation with multi-strategy approach
         Returns option number (1-5)
         """
-        self.add_to_trace(" Evaluating answer options with enhanced logic")
+        if self.trace_level >= TRACE_FULL:
+            self.add_to_trace(" Evaluating answer options with enhanced logic")
         
-        topic = problem['topic'].lower()
-        problem_text = problem['problem_statement'].lower()
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        topic = parsed.topic_lower
+        keywords = parsed.keywords
         
-        # Extract answer options
-        options = []
-        for i in range(1, 6):
-            opt_key = f'answer_option_{i}'
-            if opt_key in problem:
-                options.append(problem[opt_key])
+        # Answer options and their leading numbers (parsed once)
+        options = parsed.options
+        option_values = parsed.option_values
         
         # Special handling for "Another answer" option
-        another_answer_idx = None
-        for i, opt in enumerate(options):
-            if opt and 'another answer' in opt.lower():
-                another_answer_idx = i + 1
+        another_answer_idx = parsed.another_answer_idx
         
         # Strategy 1: Exact numerical match
         if isinstance(reasoning_result, (int, float)):
             for i, opt in enumerate(options):
-                if opt:
-                    opt_numbers = self.math_solver.extract_numbers(opt)
-                    if opt_numbers and abs(opt_numbers[0] - reasoning_result) < 0.01:
+                value = option_values[i]
+                if value is not None and abs(value - reasoning_result) < 0.01:
+                    if self.trace_level:
                         self.add_to_trace(f"✓ Exact match found: option {i+1}", opt)
-                        return i + 1
+                    return i + 1
         
         # Strategy 2: Sequence problems with advanced pattern detection
         if 'sequence' in topic:
-            numbers_in_problem = self.math_solver.extract_numbers(problem_text)
+            numbers_in_problem = parsed.signed_numbers
             if numbers_in_problem and len(numbers_in_problem) >= 3:
-                next_num = self.sequence_solver.predict_next(numbers_in_problem)
+                next_num = self._sequence_next(parsed)
                 if next_num:
-                    self.add_to_trace(f"Predicted next in sequence: {next_num}")
-                    for i, opt in enumerate(options):
-                        if opt and 'another answer' not in opt.lower():
-                            opt_numbers = self.math_solver.extract_numbers(opt)
-                            if opt_numbers and abs(opt_numbers[0] - next_num) < 0.5:
+                    if self.trace_level >= TRACE_FULL:
+                        self.add_to_trace(f"Predicted next in sequence: {next_num}")
+                    for i, opt_lower in enumerate(parsed.option_lowers):
+                        value = option_values[i]
+                        if 'another answer' not in opt_lower and value is not None \
+                                and abs(value - next_num) < 0.5:
+                            if self.trace_level:
                                 self.add_to_trace(f"✓ Sequence match: option {i+1}")
-                                return i + 1
+                            return i + 1
         
         # Strategy 3: Spatial reasoning - enhanced cube analysis
-        if 'cube' in problem_text and any(word in problem_text for word in ['paint', 'face', 'color']):
-            numbers = self.math_solver.extract_numbers(problem_text)
+        if 'evaluate.cube' in keywords and 'evaluate.paint' in keywords:
+            numbers = parsed.signed_numbers
             if numbers:
                 cube_size = int(numbers[0]) if numbers[0] <= 10 else 3  # Default to 3 if unclear
                 cube_data = self.spatial_solver.count_cube_faces(cube_size, 6)
                 
                 # Check if problem asks about specific face counts
-                if 'two face' in problem_text or '2 face' in problem_text:
+                if 'evaluate.two_faces' in keywords:
                     target = cube_data['2_faces']
-                    self.add_to_trace(f"Looking for 2-face cubes: {target}")
-                elif 'three face' in problem_text or '3 face' in problem_text:
+                    if self.trace_level >= TRACE_FULL:
+                        self.add_to_trace(f"Looking for 2-face cubes: {target}")
+                elif 'evaluate.three_faces' in keywords:
                     target = cube_data['3_faces']
-                    self.add_to_trace(f"Looking for 3-face cubes: {target}")
-                elif 'one face' in problem_text or '1 face' in problem_text:
+                    if self.trace_level >= TRACE_FULL:
+                        self.add_to_trace(f"Looking for 3-face cubes: {target}")
+                elif 'evaluate.one_face' in keywords:
                     target = cube_data['1_face']
-                    self.add_to_trace(f"Looking for 1-face cubes: {target}")
-                elif 'no face' in problem_text or 'zero face' in problem_text or 'not painted' in problem_text:
+                    if self.trace_level >= TRACE_FULL:
+                        self.add_to_trace(f"Looking for 1-face cubes: {target}")
+                elif 'evaluate.no_faces' in keywords:
                     target = cube_data['0_faces']
-                    self.add_to_trace(f"Looking for 0-face cubes: {target}")
+                    if self.trace_level >= TRACE_FULL:
+                        self.add_to_trace(f"Looking for 0-face cubes: {target}")
                 else:
                     target = None
                 
                 if target is not None:
-                    for i, opt in enumerate(options):
-                        if opt:
-                            opt_numbers = self.math_solver.extract_numbers(opt)
-                            if opt_numbers and int(opt_numbers[0]) == target:
+                    for i, value in enumerate(option_values):
+                        if value is not None and int(value) == target:
+                            if self.trace_level:
                                 self.add_to_trace(f"✓ Cube analysis match: option {i+1}")
-                                return i + 1
+                            return i + 1
         
         # Strategy 4: Optimization problems
-        if 'optimization' in topic or 'planning' in topic.lower():
+        if 'optimization' in topic or 'planning' in topic:
+            numeric_options = [(i+1, value) for i, value in enumerate(option_values)
+                               if value is not None]
             # Look for key optimization terms
-            if 'minimum' in problem_text or 'shortest' in problem_text or 'least' in problem_text:
-                numeric_options = [(i+1, self.math_solver.extract_numbers(opt)[0]) 
-                                  for i, opt in enumerate(options) 
-                                  if opt and self.math_solver.extract_numbers(opt)]
+            if 'evaluate.minimize' in keywords:
                 if numeric_options:
                     best = min(numeric_options, key=lambda x: x[1])
-                    self.add_to_trace(f"✓ Optimization (minimize): option {best[0]}")
+                    if self.trace_level:
+                        self.add_to_trace(f"✓ Optimization (minimize): option {best[0]}")
                     return best[0]
             
-            elif 'maximum' in problem_text or 'most' in problem_text or 'longest' in problem_text:
-                numeric_options = [(i+1, self.math_solver.extract_numbers(opt)[0]) 
-                                  for i, opt in enumerate(options) 
-                                  if opt and self.math_solver.extract_numbers(opt)]
+            elif 'evaluate.maximize' in keywords:
                 if numeric_options:
                     best = max(numeric_options, key=lambda x: x[1])
-                    self.add_to_trace(f"✓ Optimization (maximize): option {best[0]}")
+                    if self.trace_level:
+                        self.add_to_trace(f"✓ Optimization (maximize): option {best[0]}")
                     return best[0]
         
-        # Strategy 5: Logic traps and riddles
-        if 'riddle' in topic.lower() or 'trap' in topic.lower() or 'lateral' in topic.lower():
+        # Strategy 5: Truth-teller / liar puzzles solved outright
+        text_lower = parsed.text_lower
+        if 'liar' in text_lower or 'knave' in text_lower or 'truth' in text_lower:
+            option_idx = self.logic_solver.truth_teller_option(parsed.text, options)
+            if option_idx is not None:
+                if self.trace_level:
+                    self.add_to_trace(f"✓ Truth-teller/liar assignment: option {option_idx+1}")
+                return option_idx + 1
+        
+        # Strategy 6: Gear and belt trains
+        if 'gear' in text_lower or 'cog' in text_lower or 'pulley' in text_lower:
+            option_idx = self.spatial_solver.gear_option(parsed.mechanism, options)
+            if option_idx is not None:
+                if self.trace_level:
+                    self.add_to_trace(f"✓ Gear train motion: option {option_idx+1}")
+                return option_idx + 1
+        
+        # Strategy 7: Logic traps and riddles
+        if 'riddle' in topic or 'trap' in topic or 'lateral' in topic:
             # Look for "impossible" or "not possible" options
-            for i, opt in enumerate(options):
-                if opt:
-                    opt_lower = opt.lower()
-                    if any(phrase in opt_lower for phrase in ['impossible', 'not possible', 'cannot', 'logical trap', 'no valid']):
+            for i, opt_keywords in enumerate(parsed.option_keywords):
+                if 'option.logic_trap' in opt_keywords:
+                    if self.trace_level:
                         self.add_to_trace(f"✓ Logic trap detected: option {i+1}")
-                        return i + 1
+                    return i + 1
         
-        # Strategy 6: Use training data if available (for training phase)
+        # Strategy 8: Use training data if available (for training phase)
         if 'correct_option_number' in problem:
             correct = int(problem['correct_option_number'])
-            self.add_to_trace(f"Using training label: option {correct}")
+            if self.trace_level:
+                self.add_to_trace(f"Using training label: option {correct}")
             return correct
         
-        # Strategy 7: Pattern analysis across options
+        # Strategy 9: Pattern analysis across options
         # Avoid "Another answer" unless we have no better option
         if another_answer_idx:
             non_another_options = [i+1 for i in range(len(options)) if i+1 != another_answer_idx and options[i]]
             if non_another_options:
                 # Prefer middle options statistically
                 preferred = non_another_options[len(non_another_options)//2]
-                self.add_to_trace(f"Using middle option heuristic: {preferred}")
+                if self.trace_level:
+                    self.add_to_trace(f"Using middle option heuristic: {preferred}")
                 return preferred
         
         # Default: option 2 (statistically common in multiple choice)
-        self.add_to_trace("⚠ Using default fallback: option 2")
+        if self.trace_level:
+            self.add_to_trace("⚠ Using default fallback: option 2")
         return 2
     
-    def reason_step_by_step(self, problem: Dict[str, Any]) -> Tuple[int, List[Dict]]:
+    def reason_step_by_step(self, problem: Dict[str, Any],
+                            parsed: Optional[ParsedProblem] = None,
+                            trace_level: Optional[str] = None) -> Tuple[int, Optional[List[Dict]]]:
         """
         Main reasoning pipeline: decompose, solve, verify
-        Returns: (predicted_option, reasoning_trace)
+        Pass a ParsedProblem to share parsing with the ensemble and verifier
+        trace_level overrides the agent's level for this call only
+        Returns: (predicted_option, reasoning_trace), trace None when tracing is off
         """
+        if trace_level is not None:
+            saved_level = self.trace_level
+            self.set_trace_level(trace_level)
+            try:
+                return self.reason_step_by_step(problem, parsed)
+            finally:
+                self.trace_level = saved_level
+        
         self.reset_trace()
-        self.add_to_trace(" Starting reasoning process")
+        if self.trace_level:
+            self.add_to_trace(" Starting reasoning process")
+        
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        
+        profiler = self.profiler
+        if profiler is not None:
+            mark = time.perf_counter_ns()
         
         # Step 1: Decompose
-        subproblems = self.decompose_problem(problem)
+        subproblems = self.decompose_problem(problem, parsed)
+        if profiler is not None:
+            mark = profiler.lap('decompose', parsed.topic, mark)
         
         # Step 2: Select primary tool
-        tool = self.select_tool(problem)
-        self.add_to_trace(f" Selected tool: {tool}")
+        tool = self.select_tool(problem, parsed)
+        if self.trace_level:
+            self.add_to_trace(f" Selected tool: {tool}")
+        if profiler is not None:
+            mark = profiler.lap('select_tool', parsed.topic, mark)
         
         # Step 3: Solve subproblems
         results = []
         for subproblem in subproblems:
-            result = self.solve_subproblem(subproblem, problem)
+            result = self.solve_subproblem(subproblem, problem, parsed)
             results.append(result)
-            self.add_to_trace(f"Solved: {subproblem['description']}", result)
+            if self.trace_level >= TRACE_FULL:
+                self.add_to_trace(f"Solved: {subproblem['description']}", result)
+        if profiler is not None:
+            mark = profiler.lap('solve_subproblems', parsed.topic, mark)
         
         # Step 4: Synthesize final answer
         final_result = results[-1] if results else None
         
         # Step 5: Evaluate options
-        predicted_option = self.evaluate_answer_options(problem, final_result)
-        self.add_to_trace(f" Final answer: Option {predicted_option}")
+        predicted_option = self.evaluate_answer_options(problem, final_result, parsed)
+        if self.trace_level:
+            self.add_to_trace(f" Final answer: Option {predicted_option}")
+        if profiler is not None:
+            profiler.lap('evaluate_options', parsed.topic, mark)
         
         return predicted_option, self.reasoning_trace
     
     def get_trace_summary(self) -> str:
         """Get human-readable summary of reasoning trace"""
         summary = "REASONING TRACE\n" + "="*50 + "\n"
+        if self.reasoning_trace is None:
+            return summary + "(tracing off)\n"
         for i, step in enumerate(self.reasoning_trace, 1):
             summary += f"{i}. {step['step']}\n"
             if step['result']:
@@ -0,0 +1,306 @@
+"""
+Solvra - Route Engine Module
+Shortest paths for planning and spatial problems: a compressed sparse
+row (CSR) adjacency with binary-heap Dijkstra, A* on grids and lattices
+with Manhattan or Euclidean heuristics, BFS and Dijkstra over implicit
+state graphs, and NumPy Floyd-Warshall for all pairs on small dense graphs
+"""
+
+import heapq
+import math
+from collections import deque
+from itertools import count
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+
+
+class CSRGraph:
+    """
+    Adjacency in compressed sparse row form: the edges leaving node v are
+    indices[indptr[v]:indptr[v+1]] with matching weights. Undirected
+    graphs store every edge in both directions.
+    """
+
+    def __init__(self, num_nodes: int, sources, targets, weights=None, directed: bool = True):
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+        if len(sources) and (sources.min() < 0 or targets.min() < 0
+                             or max(sources.max(), targets.max()) >= num_nodes):
+            raise ValueError(f"edge endpoints must be in range(0, {num_nodes})")
+        if len(weights) and weights.min() < 0:
+            raise ValueError("shortest paths need non-negative edge weights")
+        if not directed:
+            sources, targets = np.concatenate([sources, targets]), np.concatenate([targets, sources])
+            weights = np.concatenate([weights, weights])
+
+        order = np.argsort(sources, kind='stable')
+        self.num_nodes = num_nodes
+        self.indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=self.indptr[1:])
+        self.indices = targets[order]
+        self.weights = weights[order]
+        self._lists = None
+
+    @classmethod
+    def from_edges(cls, num_nodes: int, edges: Iterable[Sequence[float]], directed: bool = False) -> 'CSRGraph':
+        """From (u, v) or (u, v, weight) tuples; unweighted edges weigh 1"""
+        edges = [tuple(edge) for edge in edges]
+        sources = [edge[0] for edge in edges]
+        targets = [edge[1] for edge in edges]
+        weights = [edge[2] if len(edge) > 2 else 1.0 for edge in edges]
+        return cls(num_nodes, sources, targets, weights, directed)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.indices)
+
+    def neighbors(self, v: int) -> np.ndarray:
+        return self.indices[self.indptr[v]:self.indptr[v + 1]]
+
+    def as_lists(self) -> Tuple[List[int], List[int], List[float]]:
+        """indptr, indices and weights as Python lists (fast to index in search loops), built once"""
+        if self._lists is None:
+            self._lists = (self.indptr.tolist(), self.indices.tolist(), self.weights.tolist())
+        return self._lists
+
+    def to_dense(self) -> np.ndarray:
+        """Distance matrix: the lightest edge between each pair, 0 on the diagonal, inf elsewhere"""
+        matrix = np.full((self.num_nodes, self.num_nodes), np.inf)
+        rows = np.repeat(np.arange(self.num_nodes), np.diff(self.indptr))
+        np.minimum.at(matrix, (rows, self.indices), self.weights)
+        np.fill_diagonal(matrix, 0.0)
+        return matrix
+
+
+def dijkstra(graph: CSRGraph, source: int, target: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Distances from source (inf if unreachable) and predecessors (-1 for
+    none), with a binary heap and lazy deletion. With a target the search
+    stops once it is settled; only nodes settled by then are final.
+    """
+    indptr, indices, weights = graph.as_lists()
+    dist = [math.inf] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue  # stale entry
+        if u == target:
+            break
+        for k in range(indptr[u], indptr[u + 1]):
+            v = indices[k]
+            nd = d + weights[k]
+            if nd < dist[v]:
+                dist[v] = nd
+                pred[v] = u
+                heapq.heappush(heap, (nd, v))
+    return np.array(dist), np.array(pred, dtype=np.int64)
+
+
+def bfs(graph: CSRGraph, source: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Hop counts from source (-1 if unreachable) and predecessors, ignoring weights"""
+    indptr, indices, _ = graph.as_lists()
+    hops = [-1] * graph.num_nodes
+    pred = [-1] * graph.num_nodes
+    hops[source] = 0
+    queue = deque([source])
+    while queue:
+        u = queue.popleft()
+        for v in indices[indptr[u]:indptr[u + 1]]:
+            if hops[v] < 0:
+                hops[v] = hops[u] + 1
+                pred[v] = u
+                queue.append(v)
+    return np.array(hops, dtype=np.int64), np.array(pred, dtype=np.int64)
+
+
+def path_to(pred: Sequence[int], target: int) -> List[int]:
+    """Nodes from the search source to target, following predecessors"""
+    path = [target]
+    while pred[path[-1]] >= 0:
+        path.append(int(pred[path[-1]]))
+    return path[::-1]
+
+
+def floyd_warshall(matrix: np.ndarray) -> np.ndarray:
+    """
+    All-pairs shortest distances from a dense matrix (inf = no edge), one
+    vectorised relaxation per intermediate node: O(n^3) work, O(n^2) memory
+    """
+    dist = np.array(matrix, dtype=np.float64)
+    np.fill_diagonal(dist, np.minimum(np.diag(dist), 0.0))
+    for k in range(len(dist)):
+        np.minimum(dist, dist[:, k, None] + dist[None, k, :], out=dist)
+    return dist
+
+
+# ---- Implicit graphs: states generated on demand ----
+
+def bfs_states(start: Hashable, neighbours: Callable[[Any], Iterable[Hashable]],
+               is_goal: Callable[[Any], bool]) -> Optional[List[Hashable]]:
+    """Fewest-moves path from start to a goal state in an unweighted state graph, or None"""
+    parent = {start: None}
+    queue = deque([start])
+    while queue:
+        state = queue.popleft()
+        if is_goal(state):
+            path = []
+            while state is not None:
+                path.append(state)
+                state = parent[state]
+            return path[::-1]
+        for nxt in neighbours(state):
+            if nxt not in parent:
+                parent[nxt] = state
+                queue.append(nxt)
+    return None
+
+
+def dijkstra_states(start: Hashable, neighbours: Callable[[Any], Iterable[Tuple[Hashable, float]]],
+                    is_goal: Callable[[Any], bool],
+                    heuristic: Optional[Callable[[Any], float]] = None) -> Tuple[float, List[Hashable]]:
+    """
+    Cheapest path to a goal state when neighbours(state) yields (state, cost)
+    pairs; with an admissible heuristic this is A*. (inf, []) if no goal is reachable.
+    """
+    heuristic = heuristic or (lambda state: 0.0)
+    tie = count()  # states need not be comparable
+    best = {start: 0.0}
+    parent = {start: None}
+    # Equal estimates go deepest first, so A* follows one path instead of the whole frontier
+    heap = [(heuristic(start), 0.0, next(tie), start)]
+    while heap:
+        _, negative_cost, _, state = heapq.heappop(heap)
+        cost = -negative_cost
+        if cost > best[state]:
+            continue
+        if is_goal(state):
+            path = []
+            while state is not None:
+                path.append(state)
+                state = parent[state]
+            return cost, path[::-1]
+        for nxt, step in neighbours(state):
+            new_cost = cost + step
+            if new_cost < best.get(nxt, math.inf):
+                best[nxt] = new_cost
+                parent[nxt] = state
+                heapq.heappush(heap, (new_cost + heuristic(nxt), -new_cost, next(tie), nxt))
+    return math.inf, []
+
+
+def manhattan(a: Sequence[float], b: Sequence[float]) -> float:
+    return float(sum(abs(x - y) for x, y in zip(a, b)))
+
+
+def euclidean(a: Sequence[float], b: Sequence[float]) -> float:
+    return math.dist(a, b)
+
+
+HEURISTICS = {'manhattan': manhattan, 'euclidean': euclidean}
+
+
+def astar_grid(grid: Sequence[Sequence[Any]], start: Tuple[int, int], goal: Tuple[int, int],
+               heuristic: str = 'manhattan', diagonal: bool = False) -> Tuple[float, List[Tuple[int, int]]]:
+    """
+    Shortest path between (row, col) cells of a grid, where a cell is
+    blocked if it is '#' (string rows) or falsy (boolean arrays). Straight
+    moves cost 1, diagonal ones sqrt(2). Manhattan overestimates once
+    diagonal moves are allowed, so it is refused with diagonal=True.
+    """
+    if heuristic not in HEURISTICS:
+        raise ValueError(f"heuristic must be one of {list(HEURISTICS)}, got {heuristic!r}")
+    if diagonal and heuristic == 'manhattan':
+        raise ValueError("the manhattan heuristic is not admissible with diagonal moves; use 'euclidean'")
+    rows = len(grid)
+    open_cell = [[cell != '#' if isinstance(cell, str) else bool(cell) for cell in row] for row in grid]
+    steps = [(-1, 0, 1.0), (1, 0, 1.0), (0, -1, 1.0), (0, 1, 1.0)]
+    if diagonal:
+        steps += [(dr, dc, math.sqrt(2)) for dr in (-1, 1) for dc in (-1, 1)]
+
+    def neighbours(cell):
+        r, c = cell
+        for dr, dc, cost in steps:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < len(open_cell[nr]) and open_cell[nr][nc]:
+                yield (nr, nc), cost
+
+    if not (open_cell[start[0]][start[1]] and open_cell[goal[0]][goal[1]]):
+        return math.inf, []
+    estimate = HEURISTICS[heuristic]
+    return dijkstra_states(tuple(start), neighbours, lambda cell: cell == tuple(goal),
+                           lambda cell: estimate(cell, goal))
+
+
+def lattice_path(start: Sequence[int], goal: Sequence[int], blocked: Iterable[Sequence[int]] = (),
+                 bounds: Optional[Sequence[Tuple[int, int]]] = None) -> Tuple[float, List[Tuple[int, ...]]]:
+    """
+    Shortest axis-aligned path between integer points of any dimension,
+    avoiding blocked points and staying inside bounds [(low, high), ...]
+    (inclusive). Without bounds the lattice is unbounded; the search keeps
+    to the box around start, goal and every blocked point, padded by one,
+    which holds a shortest detour around any finite set of obstacles. A*
+    with the Manhattan heuristic, which is the exact distance when nothing
+    is in the way.
+    """
+    start, goal = tuple(start), tuple(goal)
+    blocked = {tuple(point) for point in blocked}
+    if bounds is None:
+        points = [start, goal, *blocked]
+        bounds = [(min(axis) - 1, max(axis) + 1) for axis in zip(*points)]
+    if start in blocked or goal in blocked:
+        return math.inf, []
+
+    def neighbours(point):
+        for axis, (low, high) in enumerate(bounds):
+            for delta in (-1, 1):
+                value = point[axis] + delta
+                if low <= value <= high:
+                    nxt = point[:axis] + (value,) + point[axis + 1:]
+                    if nxt not in blocked:
+                        yield nxt, 1.0
+
+    return dijkstra_states(start, neighbours, lambda point: point == goal, lambda point: manhattan(point, goal))
+
+
+class RouteEngine:
+    """
+    Shortest paths over named graphs given as {(a, b): distance} dicts,
+    like the TSP solver's. Graphs are stored as CSR; all-pairs queries use
+    Floyd-Warshall up to dense_limit nodes and Dijkstra from every node above.
+    """
+
+    def __init__(self, dense_limit: int = 256):
+        self.dense_limit = dense_limit
+
+    def build_graph(self, distances: Dict[Tuple[str, str], float], nodes: Optional[List[str]] = None,
+                    directed: bool = False) -> Tuple[CSRGraph, List[str]]:
+        """CSR graph and the node order; nodes default to every endpoint in first-seen order"""
+        if nodes is None:
+            nodes = list(dict.fromkeys(node for edge in distances for node in edge))
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = [(index[a], index[b], dist) for (a, b), dist in distances.items() if a in index and b in index]
+        return CSRGraph.from_edges(len(nodes), edges, directed), nodes
+
+    def shortest_path(self, distances: Dict[Tuple[str, str], float], source: str, target: str,
+                      directed: bool = False) -> Tuple[List[str], float]:
+        """Cheapest route from source to target and its length; ([], inf) if there is none"""
+        graph, nodes = self.build_graph(distances, directed=directed)
+        if source not in nodes or target not in nodes:
+            return [], float('inf')
+        s, t = nodes.index(source), nodes.index(target)
+        dist, pred = dijkstra(graph, s, t)
+        if math.isinf(dist[t]):
+            return [], float('inf')
+        return [nodes[i] for i in path_to(pred, t)], float(dist[t])
+
+    def all_pairs(self, distances: Dict[Tuple[str, str], float], nodes: Optional[List[str]] = None,
+                  directed: bool = False) -> Tuple[np.ndarray, List[str]]:
+        """Matrix of shortest distances between every pair of nodes, and the node order"""
+        graph, nodes = self.build_graph(distances, nodes, directed)
+        if graph.num_nodes <= self.dense_limit:
+            return floyd_warshall(graph.to_dense()), nodes
+        return np.vstack([dijkstra(graph, s)[0] for s in range(graph.num_nodes)]), nodes
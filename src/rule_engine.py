@@ -0,0 +1,124 @@
+"""
+Solvra - Rule Engine Module
+Forward chaining over "if A and B then C" rules. Rules are parsed once
+into integer atom IDs and indexed by the conditions they wait on; an
+agenda of newly known atoms drives firing, so a run touches each
+(rule, condition) pair at most once: linear in the size of the rule base
+plus the number of firings, however the rules are ordered.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+_RULE = re.compile(r"^\s*if\b(.*?)\bthen\b(.*)$", re.IGNORECASE | re.DOTALL)
+_CONJUNCTION = re.compile(r"\s+and\s+|\s*&&?\s*|\s*,\s*", re.IGNORECASE)
+
+
+def normalize_atom(text: str) -> str:
+    """Lowercased, whitespace-collapsed statement ('The  Sky is blue' -> 'the sky is blue')"""
+    return ' '.join(text.lower().split())
+
+
+def parse_rule(rule: str) -> Optional[Tuple[List[str], str]]:
+    """
+    'If A and B then C' -> (['a', 'b'], 'c'); conditions may also be joined
+    by ',' or '&'. None if the text is not an if-then rule.
+    """
+    match = _RULE.match(rule)
+    if match is None:
+        return None
+    conditions = [normalize_atom(part) for part in _CONJUNCTION.split(match.group(1))]
+    conditions = [condition for condition in conditions if condition]
+    conclusion = normalize_atom(match.group(2))
+    if not conditions or not conclusion:
+        return None
+    return conditions, conclusion
+
+
+class RuleBase:
+    """
+    Compiled rules: atom IDs, each rule's distinct conditions and its
+    conclusion, and for every atom the rules waiting on it. Build once,
+    then run infer() for any number of fact sets.
+    """
+
+    def __init__(self, rules: Iterable[str] = ()):
+        self.atom_ids: Dict[str, int] = {}
+        self.atoms: List[str] = []
+        # rule -> number of distinct conditions, and its conclusion's atom
+        self.condition_counts: List[int] = []
+        self.conclusions: List[int] = []
+        # atom -> rules that have it as a condition
+        self.watchers: List[List[int]] = []
+        self.skipped = 0
+        for rule in rules:
+            self.add_rule(rule)
+
+    def atom(self, text: str) -> int:
+        """ID of an already-normalised atom, interning it if new"""
+        atom_id = self.atom_ids.get(text)
+        if atom_id is None:
+            atom_id = self.atom_ids[text] = len(self.atoms)
+            self.atoms.append(text)
+            self.watchers.append([])
+        return atom_id
+
+    def add_rule(self, rule: str) -> bool:
+        """Compile one rule string; False (and counted as skipped) if it is not an if-then rule"""
+        parsed = parse_rule(rule)
+        if parsed is None:
+            self.skipped += 1
+            return False
+        conditions, conclusion = parsed
+        rule_id = len(self.conclusions)
+        condition_ids = {self.atom(condition) for condition in conditions}
+        for atom_id in condition_ids:
+            self.watchers[atom_id].append(rule_id)
+        self.condition_counts.append(len(condition_ids))
+        self.conclusions.append(self.atom(conclusion))
+        return True
+
+    def infer(self, facts: Iterable[str]) -> Dict[str, object]:
+        """
+        Forward chain from facts. Returns {'known': atoms known at the end,
+        facts first then conclusions in firing order, 'derived': the new
+        conclusions only, 'firings': rules fired}.
+        """
+        known = bytearray(len(self.atoms))
+        unused = set()  # facts no rule mentions
+        order: List[str] = []
+        agenda = deque()
+        for fact in facts:
+            text = normalize_atom(fact)
+            atom_id = self.atom_ids.get(text)
+            if atom_id is None:
+                if text not in unused:
+                    unused.add(text)
+                    order.append(text)
+            elif not known[atom_id]:
+                known[atom_id] = 1
+                order.append(text)
+                agenda.append(atom_id)
+
+        remaining = list(self.condition_counts)
+        derived: List[str] = []
+        firings = 0
+        watchers, conclusions, atoms = self.watchers, self.conclusions, self.atoms
+        while agenda:
+            for rule_id in watchers[agenda.popleft()]:
+                remaining[rule_id] -= 1
+                if remaining[rule_id]:
+                    continue
+                firings += 1
+                conclusion = conclusions[rule_id]
+                if not known[conclusion]:
+                    known[conclusion] = 1
+                    derived.append(atoms[conclusion])
+                    agenda.append(conclusion)
+
+        return {'known': order + derived, 'derived': derived, 'firings': firings}
+
+    def __len__(self) -> int:
+        return len(self.conclusions)
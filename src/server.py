@@ -0,0 +1,392 @@
+"""
+Solvra - Server Module
+Long-lived inference service: an asyncio server on a local TCP or Unix
+socket speaking line-delimited JSON. Requests are gathered into
+micro-batches (bounded by size and wait time) and answered on one worker
+thread that keeps a warm ReasoningAgent, MLEnhancer and EnsemblePredictor.
+
+One JSON object per line in, one per line out:
+    {"id": 7, "topic": "...", "problem_statement": "...", "answer_option_1": "...", ...}
+    -> {"id": 7, "topic": "...", "predicted_option": 2, "confidence": 0.8, ...}
+    {"command": "stats"} -> counters, batch sizes and latency percentiles
+    {"command": "ping"}  -> {"ok": true}
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from preprocess import DataPreprocessor
+from reasoning_agent import ReasoningAgent
+from verifier import ReasoningVerifier
+from ml_enhancer import MLEnhancer, EnsemblePredictor
+from parsed_problem import ParsedProblem
+from latency import LatencyHistogram
+from prediction_cache import PredictionCache, model_fingerprint
+
+
+class InferenceEngine:
+    """
+    Warm agent, ensemble and verifier that answer a batch of raw problems.
+    Components keep per-problem state, so one engine serves one thread.
+    With a PredictionCache, repeated problems are answered from it.
+    """
+
+    def __init__(self, ml_enhancer: Optional[MLEnhancer] = None, data_dir: str = "../data",
+                 prediction_cache: Optional[PredictionCache] = None):
+        self.preprocessor = DataPreprocessor(data_dir=data_dir)
+        self.agent = ReasoningAgent(trace_level='off')  # Answers only; nothing reads the trace
+        self.verifier = ReasoningVerifier()
+        self.ml_enhancer = ml_enhancer
+        self.ensemble = None
+        if ml_enhancer is not None and ml_enhancer.trained:
+            self.ensemble = EnsemblePredictor(ml_enhancer, history_limit=1000)
+        
+        # Keyed like SolvraPipeline.stream_predictions, so the two share entries
+        self.prediction_cache = prediction_cache
+        self.cache_stages = 'ensemble+verifier' if self.ensemble else 'verifier'
+        if prediction_cache is not None:
+            prediction_cache.set_fingerprint(model_fingerprint(ml_enhancer))
+
+    @classmethod
+    def warm(cls, data_dir: str = "../data", ml_model_path: Optional[str] = None,
+             train: bool = True, prediction_cache: Optional[PredictionCache] = None) -> 'InferenceEngine':
+        """Engine with a loaded (ml_model_path) or freshly trained MLEnhancer, or none"""
+        enhancer = None
+        if ml_model_path:
+            enhancer = MLEnhancer.load(ml_model_path)
+        elif train:
+            preprocessor = DataPreprocessor(data_dir=data_dir)
+            preprocessor.load_train_data()
+            enhancer = MLEnhancer()
+            enhancer.train(preprocessor.preprocess_training_data())
+        return cls(enhancer, data_dir=data_dir, prediction_cache=prediction_cache)
+
+    def predict_batch(self, records: List[Any]) -> List[Dict[str, Any]]:
+        """
+        Same answers as SolvraPipeline.stream_predictions, one result dict per
+        record: sequences are classified together and the ML votes come from
+        one predict_batch call. Bad records get an 'error' entry instead.
+        """
+        results = [{} for _ in records]
+        problems, parsed_problems, positions, keys = [], [], [], {}
+        cache = self.prediction_cache
+        for i, record in enumerate(records):
+            try:
+                if not isinstance(record, dict):
+                    raise ValueError(f"expected a JSON object, got {type(record).__name__}")
+                problem = self.preprocessor.prepare_record(record)
+                if cache is not None:
+                    keys[i] = cache.key(problem, self.cache_stages)
+                    hit = cache.get(keys[i])
+                    if hit is not None:
+                        results[i].update({
+                            'topic': problem.get('topic'),
+                            'predicted_option': hit['prediction'],
+                            'confidence': round(hit['confidence'], 4),
+                            'verification': list(hit['verification']),
+                        })
+                        continue
+                parsed_problems.append(ParsedProblem(problem))
+                problems.append(problem)
+                positions.append(i)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                results[i]['error'] = f"{type(e).__name__}: {e}"
+
+        self.agent.prepare_sequence_batch(parsed_problems)
+        answered = []
+        for problem, parsed, i in zip(problems, parsed_problems, positions):
+            try:
+                prediction, trace = self.agent.reason_step_by_step(problem, parsed)
+                answered.append((problem, parsed, i, prediction, trace))
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                results[i]['error'] = f"{type(e).__name__}: {e}"
+
+        confidences = [0.8] * len(answered)
+        predictions = [prediction for _, _, _, prediction, _ in answered]
+        if self.ensemble and answered:
+            votes = self.ensemble.ensemble_predict_batch(
+                [problem for problem, *_ in answered], predictions, confidences,
+                [parsed for _, parsed, *_ in answered]
+            )
+            predictions = [prediction for prediction, _ in votes]
+            confidences = [confidence for _, confidence in votes]
+
+        for (problem, parsed, i, _, trace), prediction, confidence in zip(answered, predictions, confidences):
+            prediction = self.verifier.apply_correction_heuristics(problem, prediction, trace, parsed)
+            results[i].update({
+                'topic': problem.get('topic'),
+                'predicted_option': int(prediction),
+                'confidence': round(float(confidence), 4),
+                'verification': list(self.verifier.warnings),
+            })
+            if cache is not None:
+                cache.put(keys[i], {'prediction': int(prediction), 'confidence': float(confidence),
+                                    'verification': list(self.verifier.warnings)})
+        return results
+
+
+class _Request:
+    """One queued problem and the future its connection is waiting on"""
+    __slots__ = ('record', 'future', 'received_ns')
+
+    def __init__(self, record: Dict[str, Any], future: asyncio.Future, received_ns: int):
+        self.record = record
+        self.future = future
+        self.received_ns = received_ns
+
+
+class MicroBatchServer:
+    """
+    Line-delimited JSON server in front of an InferenceEngine.
+    Requests wait in a bounded queue: when it is full, connections stop
+    being read until there is room, so the socket pushes back on clients.
+    The batcher takes up to max_batch_size requests, waiting at most
+    max_wait_ms after the first, and runs them on a single worker thread.
+    """
+
+    def __init__(self, engine: InferenceEngine, max_batch_size: int = 32, max_wait_ms: float = 5.0,
+                 max_queue: int = 1024, request_timeout: float = 10.0, max_line_bytes: int = 1 << 20):
+        self.engine = engine
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue = max_queue
+        self.request_timeout = request_timeout
+        self.max_line_bytes = max_line_bytes
+
+        # End-to-end per request, time spent queued, and engine time per batch
+        self.latency = LatencyHistogram()
+        self.queue_wait = LatencyHistogram()
+        self.batch_time = LatencyHistogram()
+        self.counters = {'connections': 0, 'requests': 0, 'responses': 0, 'errors': 0,
+                         'timeouts': 0, 'backpressure_waits': 0, 'batches': 0, 'batched_requests': 0}
+
+        self._queue = None
+        self._executor = None
+        self._batcher = None
+        self._server = None
+        self._connections = {}  # handler task -> its StreamWriter
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Listen on a Unix socket if unix_path is given, otherwise on host:port (0 picks a free port)"""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="solvra-inference")
+        self._batcher = asyncio.create_task(self._batch_loop())
+        if unix_path:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=unix_path,
+                                                           limit=self.max_line_bytes)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host, port,
+                                                      limit=self.max_line_bytes)
+        return self._server
+
+    @property
+    def address(self):
+        """(host, port) or Unix socket path the server is listening on"""
+        return self._server.sockets[0].getsockname()
+
+    async def close(self):
+        """Stop accepting, hang up open connections, then stop the batcher and worker thread"""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.counters['connections'] += 1
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        write_lock = asyncio.Lock()
+        pending = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over max_line_bytes: the stream can't be resynchronised
+                    await self._write(writer, write_lock, {'error': f"line longer than {self.max_line_bytes} bytes"})
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+
+                received_ns = time.perf_counter_ns()
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    self.counters['errors'] += 1
+                    await self._write(writer, write_lock, {'error': f"invalid JSON: {e}"})
+                    continue
+
+                if isinstance(record, dict) and 'command' in record:
+                    await self._write(writer, write_lock, self._command(record))
+                    continue
+
+                self.counters['requests'] += 1
+                request = _Request(record, asyncio.get_running_loop().create_future(), received_ns)
+                task = asyncio.create_task(self._respond(request, writer, write_lock))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+                # Backpressure: stop reading this connection until the queue has room
+                if self._queue.full():
+                    self.counters['backpressure_waits'] += 1
+                await self._queue.put(request)
+        except ConnectionError:
+            pass
+        finally:
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+            del self._connections[handler]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, request: _Request, writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        """Wait for one request's result (or its timeout) and write it back"""
+        try:
+            # Cancelling the future on timeout also tells the batcher to skip it
+            result = await asyncio.wait_for(request.future, self.request_timeout)
+        except asyncio.TimeoutError:
+            self.counters['timeouts'] += 1
+            result = {'error': f"timed out after {self.request_timeout:g}s"}
+
+        elapsed_ns = time.perf_counter_ns() - request.received_ns
+        self.latency.record(elapsed_ns)
+        response = {'id': request.record['id']} if isinstance(request.record, dict) and 'id' in request.record else {}
+        response.update(result)
+        response['latency_ms'] = round(elapsed_ns / 1e6, 3)
+        if 'error' in result:
+            self.counters['errors'] += 1
+        self.counters['responses'] += 1
+        try:
+            await self._write(writer, write_lock, response)
+        except ConnectionError:
+            pass  # Client went away; nothing left to tell it
+
+    async def _write(self, writer: asyncio.StreamWriter, write_lock: asyncio.Lock, message: Dict[str, Any]):
+        async with write_lock:
+            writer.write((json.dumps(message, ensure_ascii=False) + "\n").encode('utf-8'))
+            await writer.drain()
+
+    def _command(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        command = message.get('command')
+        if command == 'ping':
+            return {'ok': True}
+        if command == 'stats':
+            return self.stats()
+        return {'error': f"unknown command: {command!r}"}
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            live = [request for request in batch if not request.future.done()]
+            if not live:
+                continue
+            start_ns = time.perf_counter_ns()
+            for request in live:
+                self.queue_wait.record(start_ns - request.received_ns)
+            try:
+                results = await loop.run_in_executor(self._executor, self.engine.predict_batch,
+                                                     [request.record for request in live])
+            except Exception as e:
+                results = [{'error': f"{type(e).__name__}: {e}"}] * len(live)
+            self.batch_time.record(time.perf_counter_ns() - start_ns)
+            self.counters['batches'] += 1
+            self.counters['batched_requests'] += len(live)
+
+            for request, result in zip(live, results):
+                if not request.future.done():
+                    request.future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters, queue depth, mean batch size and latency percentiles"""
+        batches = self.counters['batches']
+        return {
+            **self.counters,
+            'queue_depth': self._queue.qsize() if self._queue is not None else 0,
+            'mean_batch_size': round(self.counters['batched_requests'] / batches, 2) if batches else 0.0,
+            'latency': self.latency.summary(),
+            'queue_wait': self.queue_wait.summary(),
+            'batch_time': self.batch_time.summary(),
+            **({'prediction_cache': self.engine.prediction_cache.stats()}
+               if self.engine.prediction_cache is not None else {}),
+        }
+
+
+async def serve(server: MicroBatchServer, host: str, port: int, unix_path: Optional[str]):
+    """Run until interrupted, then print the final stats"""
+    await server.start(host, port, unix_path)
+    print(f" Solvra server listening on {server.address}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        print(json.dumps(server.stats(), indent=2))
+        if server.engine.prediction_cache is not None:
+            server.engine.prediction_cache.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solvra micro-batching inference server")
+    parser.add_argument('--host', default="127.0.0.1", help="TCP host (default: localhost only)")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port")
+    parser.add_argument('--unix', metavar='PATH', help="Listen on a Unix socket instead of TCP")
+    parser.add_argument('--data-dir', default="../data", help="Directory holding train.csv")
+    parser.add_argument('--ml-model', metavar='PATH', help="Load a saved MLEnhancer instead of training")
+    parser.add_argument('--no-train', action='store_true', help="Run without the ML enhancer")
+    parser.add_argument('--max-batch', type=int, default=32, help="Largest micro-batch")
+    parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                        help="Longest wait for a micro-batch to fill after its first request")
+    parser.add_argument('--max-queue', type=int, default=1024,
+                        help="Queued requests before connections stop being read")
+    parser.add_argument('--timeout', type=float, default=10.0, help="Per-request timeout in seconds")
+    parser.add_argument('--cache', metavar='PATH', help="SQLite prediction cache shared with main.py --cache")
+    parser.add_argument('--cache-size', type=int, default=10_000, help="In-memory LRU entries")
+    args = parser.parse_args()
+
+    cache = PredictionCache(args.cache, capacity=args.cache_size) if args.cache else None
+    engine = InferenceEngine.warm(args.data_dir, args.ml_model, train=not args.no_train,
+                                  prediction_cache=cache)
+    server = MicroBatchServer(engine, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms,
+                              max_queue=args.max_queue, request_timeout=args.timeout)
+    try:
+        asyncio.run(serve(server, args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
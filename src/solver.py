@@ -5,11 +5,17 @@ Each solver is specialized for a specific type of reasoning problem
 """
 
 import re
-import sympy as sp
-from sympy import symbols, Eq, solve, simplify
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 import numpy as np
-from itertools import permutations, combinations
+from itertools import combinations
+from collections import OrderedDict
+from tsp_engine import TSPEngine
+from rule_engine import RuleBase
+from truth_engine import TruthEngine, TruthPuzzle, asked_role
+from linear_engine import LinearSystemEngine
+from sequence_engine import SequenceEngine
+from mechanism_engine import MechanismProblem
+from route_engine import RouteEngine, dijkstra_states, lattice_path
 
 
 class MathSolver:
@@ -23,6 +29,9 @@ class MathSolver:
             'divide': lambda a, b: a / b if b != 0 else None,
             'percentage': lambda part, whole: (part / whole * 100) if whole != 0 else None
         }
+        self.tsp_engine = TSPEngine()
+        self.linear_engine = LinearSystemEngine()
+        self.route_engine = RouteEngine()
     
     def extract_numbers(self, text: str) -> List[float]:
         """Extract numbers from text"""
@@ -34,19 +43,9 @@ class MathSolver:
         """
         Solve a system of linear equations
         Example: ['x + y = 10', '2*x - y = 5']
+        Linear systems are solved with NumPy; nonlinear ones fall back to sympy
         """
-        try:
-            syms = symbols(' '.join(variables))
-            eqs = []
-            
-            for eq_str in equations:
-                left, right = eq_str.split('=')
-                eqs.append(Eq(sp.sympify(left), sp.sympify(right)))
-            
-            solution = solve(eqs, syms)
-            return {str(var): float(val) for var, val in solution.items()}
-        except Exception as e:
-            return {}
+        return self.linear_engine.solve(equations, variables)
     
     def calculate_rate_problems(self, rates: List[Tuple[float, str]], time: float) -> float:
         """
@@ -81,34 +80,66 @@ class MathSolver:
     def traveling_salesman_simple(self, distances: Dict[Tuple[str, str], float], 
                                    cities: List[str]) -> Tuple[List[str], float]:
         """
-        Simple TSP solver for small number of cities
-        Returns best route and total distance
+        TSP solver: exact Held-Karp DP for small tours, heuristic for large ones
+        Returns best route and total distance (missing edges count as infinite)
+        """
+        return self.tsp_engine.solve(distances, cities)
+    
+    def shortest_path(self, distances: Dict[Tuple[str, str], float],
+                      source: str, target: str) -> Tuple[List[str], float]:
         """
-        min_distance = float('inf')
-        best_route = None
+        Shortest route between two places over undirected road distances
+        (Dijkstra on a CSR graph); ([], inf) if they are not connected
+        """
+        return self.route_engine.shortest_path(distances, source, target)
+    
+    def all_pairs_shortest_paths(self, distances: Dict[Tuple[str, str], float],
+                                 places: List[str]) -> Dict[Tuple[str, str], float]:
+        """Shortest distance between every pair of places, as {(a, b): distance}"""
+        matrix, places = self.route_engine.all_pairs(distances, places)
+        return {(a, b): matrix[i, j].item() for i, a in enumerate(places) for j, b in enumerate(places)}
+    
+    def crossing_time(self, times: List[float], capacity: int = 2) -> float:
+        """
+        Least total time to get everyone across a bridge or river when at
+        most `capacity` cross together at the slowest one's pace and someone
+        must bring the torch (or boat) back. Searched as a state graph of
+        (who is across, which side the torch is on).
+        """
+        everyone = (1 << len(times)) - 1
         
-        # Try all permutations
-        for perm in permutations(cities[1:]):
-            route = [cities[0]] + list(perm) + [cities[0]]
-            distance = 0
-            
-            for i in range(len(route) - 1):
-                key = (route[i], route[i+1])
-                reverse_key = (route[i+1], route[i])
-                
-                if key in distances:
-                    distance += distances[key]
-                elif reverse_key in distances:
-                    distance += distances[reverse_key]
-                else:
-                    distance = float('inf')
-                    break
-            
-            if distance < min_distance:
-                min_distance = distance
-                best_route = route
+        def moves(state):
+            across, torch_across = state
+            side = across if torch_across else everyone & ~across
+            members = [i for i in range(len(times)) if side >> i & 1]
+            for size in range(1, capacity + 1):
+                for group in combinations(members, size):
+                    mask = sum(1 << i for i in group)
+                    yield (across & ~mask if torch_across else across | mask, not torch_across), \
+                        max(times[i] for i in group)
         
-        return best_route, min_distance
+        cost, _ = dijkstra_states((0, False), moves, lambda state: state[0] == everyone)
+        return cost
+    
+    def crossing_time_from_text(self, text: str) -> Optional[float]:
+        """
+        crossing_time for a bridge / river crossing puzzle stated in text:
+        one crossing time per person ("takes 1 minute", "in 2 minutes") and
+        the group size ("two people at a time"). None if it is not one.
+        """
+        text_lower = text.lower()
+        if not re.search(r'\bcross', text_lower) or not re.search(r'\b(?:bridge|river|boat)\b', text_lower):
+            return None
+        capacity = re.search(r'\b(two|three|2|3) (?:people|persons)\b', text_lower)
+        if capacity is None:
+            return None
+        # Everyone's time is listed in one sentence; other durations (a torch's battery) are not
+        listed = [re.findall(r'(\d+(?:\.\d+)?) minutes?\b', sentence)
+                  for sentence in re.split(r'(?<=[.!?])\s+', text_lower)]
+        times = [float(t) for t in max(listed, key=len)]
+        if not 2 <= len(times) <= 12:
+            return None
+        return self.crossing_time(times, {'two': 2, 'three': 3}.get(capacity.group(1)) or int(capacity.group(1)))
 
 
 class LogicSolver:
@@ -121,38 +152,71 @@ class LogicSolver:
             'truth_teller': 'truth',
             'liar': 'lie'
         }
+        self.truth_engine = TruthEngine()
+        self.truth_solution_limit = 4096
+        self.rule_cache_size = 32
+        self._rule_bases: 'OrderedDict[Tuple[str, ...], RuleBase]' = OrderedDict()
     
-    def solve_truth_teller_liar(self, statements: List[Dict], question: str) -> str:
+    def solve_truth_teller_liar(self, statements: List[Dict], question: str = '') -> List[Dict[str, str]]:
         """
-        Classic truth-teller and liar problems
-        statements: [{'person': 'A', 'says': 'statement', 'type': 'unknown'}]
+        Classic truth-teller and liar (knights and knaves) problems
+        statements: [{'person': 'A', 'says': 'B is a liar'}]
+        Returns every consistent assignment as {person: 'truth-teller' | 'liar'};
+        [] if the statements contradict each other or cannot be read
         """
-        # If you ask either person "what would the other say", both point to wrong door
-        # So choose the opposite
-        return "Choose opposite of what they indicate"
+        puzzle = TruthPuzzle.from_statements([(s['person'], s['says']) for s in statements])
+        if puzzle is None:
+            return []
+        return [puzzle.describe(mask) for mask in self.truth_engine.solve(puzzle)]
     
-    def logical_deduction(self, facts: List[str], rules: List[str]) -> List[str]:
+    def truth_teller_option(self, text: str, options: List[str]) -> Optional[int]:
         """
-        Simple forward-chaining logical deduction
+        Index of the answer option a truth-teller / liar puzzle settles:
+        the only option true in every consistent assignment, or, when there
+        is no unique assignment, the "cannot be determined" option. None if
+        the text is not such a puzzle or nothing matches.
         """
-        conclusions = set(facts)
-        changed = True
+        puzzle = TruthPuzzle.from_text(text)
+        if puzzle is None:
+            return None
+        solutions = self.truth_engine.solve(puzzle, limit=self.truth_solution_limit)
         
-        while changed:
-            changed = False
-            for rule in rules:
-                # Simple if-then rules
-                if 'if' in rule.lower() and 'then' in rule.lower():
-                    parts = rule.lower().split('then')
-                    condition = parts[0].replace('if', '').strip()
-                    conclusion = parts[1].strip()
-                    
-                    if condition in [f.lower() for f in conclusions]:
-                        if conclusion not in [c.lower() for c in conclusions]:
-                            conclusions.add(conclusion)
-                            changed = True
+        asked = asked_role(text)
+        entailed = []
+        for i, option in enumerate(options):
+            expr = puzzle.parse_option(option, asked) if option else None
+            if expr is not None and self.truth_engine.entails(expr, solutions):
+                entailed.append(i)
+        if len(entailed) == 1:
+            return entailed[0]
         
-        return list(conclusions)
+        if len(solutions) != 1:
+            for i, option in enumerate(options):
+                if option and re.search(r"cannot be determined|impossible|not enough|paradox|contradict",
+                                        option, re.IGNORECASE):
+                    return i
+        return None
+    
+    def logical_deduction(self, facts: List[str], rules: List[str]) -> List[str]:
+        """
+        Forward-chaining logical deduction over "if A [and B ...] then C" rules
+        Returns the facts followed by every conclusion, in the order derived
+        (conclusions are lowercased)
+        """
+        result = self.rule_base(rules).infer(facts)
+        return list(dict.fromkeys(facts)) + result['derived']
+    
+    def rule_base(self, rules: List[str]) -> RuleBase:
+        """Compiled RuleBase for a rule list, kept in a small LRU so repeated rule sets parse once"""
+        key = tuple(rules)
+        rule_base = self._rule_bases.get(key)
+        if rule_base is None:
+            rule_base = self._rule_bases[key] = RuleBase(rules)
+            while len(self._rule_bases) > self.rule_cache_size:
+                self._rule_bases.popitem(last=False)
+        else:
+            self._rule_bases.move_to_end(key)
+        return rule_base
 
 
 class SpatialSolver:
@@ -199,14 +263,60 @@ class SpatialSolver:
         return result
     
     def shortest_path_grid(self, start: Tuple[int, int, int], 
-                          end: Tuple[int, int, int]) -> float:
+                          end: Tuple[int, int, int],
+                          blocked: Optional[List[Tuple[int, int, int]]] = None,
+                          bounds: Optional[List[Tuple[int, int]]] = None) -> float:
         """
-        Shortest surface path on a 3D grid (ant on cube problem)
+        Fewest unit steps between grid points (ant on cube problem), going
+        around blocked points and staying inside bounds [(low, high)] per axis.
+        A* with the Manhattan heuristic; inf if the end cannot be reached.
         """
-        # Manhattan distance in 3D
-        distance = sum(abs(a - b) for a, b in zip(start, end))
+        distance, _ = lattice_path(start, end, blocked or (), bounds)
         return distance
     
+    def cube_edge_walk(self, text: str) -> Optional[float]:
+        """
+        Shortest walk along the edges of a cube (or its N x N x N grid of
+        small cubes) to the diagonally opposite corner, in edges or in
+        length units. None if the text does not ask for one.
+        """
+        text_lower = text.lower()
+        if 'cube' not in text_lower or 'opposite corner' not in text_lower \
+                or not re.search(r'\b(?:at|from) (?:one|a) corner', text_lower) \
+                or not re.search(r'along (?:the |its )?edges', text_lower):
+            return None
+        grid = re.search(r'(\d+)\s*x\s*\1\s*x\s*\1', text_lower)
+        n = int(grid.group(1)) if grid else 1
+        steps = self.shortest_path_grid((0, 0, 0), (n, n, n), bounds=[(0, n)] * 3)
+        question = re.split(r'(?<=[.!])\s+', text_lower)[-1]
+        if re.search(r'how many edges|number of edges|edges traversed', question):
+            return steps
+        length = re.search(r'(?:edge|side)s?(?: of the cube)? (?:measures?|has a length of|of length|is|of) '
+                           r'(\d+(?:\.\d+)?)', text_lower)
+        return steps * float(length.group(1)) / n if length else None
+    
+    def gear_motion(self, problem: Union[str, MechanismProblem]) -> Optional[Dict[str, Any]]:
+        """
+        How the gear a problem asks about moves: {'part', 'jammed', 'amount',
+        'direction' ('clockwise' / 'counterclockwise' / None)}. problem is the
+        text or a MechanismProblem already read from it. None if the text
+        does not describe a connected gear or belt train.
+        """
+        mechanism = MechanismProblem.from_text(problem) if isinstance(problem, str) else problem
+        if mechanism is None:
+            return None
+        answer = mechanism.answer()
+        direction = {1: 'clockwise', -1: 'counterclockwise'}.get(answer['direction'])
+        return {'part': mechanism.target, 'jammed': answer['jammed'],
+                'amount': answer['amount'], 'direction': direction}
+    
+    def gear_option(self, problem: Union[str, MechanismProblem], options: List[str]) -> Optional[int]:
+        """Index of the only answer option matching the gear train's motion (text or MechanismProblem), else None"""
+        mechanism = MechanismProblem.from_text(problem) if isinstance(problem, str) else problem
+        if mechanism is None:
+            return None
+        return mechanism.match_option([option if isinstance(option, str) else '' for option in options])
+    
     def room_navigation(self, moves: List[str]) -> str:
         """
         Track direction after a series of room moves
@@ -230,7 +340,7 @@ class SequenceSolver:
     """Handles sequence problems: patterns, progressions, series"""
     
     def __init__(self):
-        pass
+        self.sequence_engine = SequenceEngine()
     
     def identify_arithmetic_sequence(self, numbers: List[float]) -> Optional[float]:
         """Check if sequence is arithmetic and return common difference"""
@@ -277,78 +387,48 @@ class SequenceSolver:
     
     def predict_next(self, numbers: List[float]) -> Optional[float]:
         """Predict next number in sequence with advanced pattern detection"""
-        if len(numbers) < 2:
-            return None
-        
-        # Try arithmetic
-        diff = self.identify_arithmetic_sequence(numbers)
-        if diff is not None:
-            return numbers[-1] + diff
-        
-        # Try geometric
-        ratio = self.identify_geometric_sequence(numbers)
-        if ratio is not None:
-            return numbers[-1] * ratio
+        return self.predict_next_batch([numbers])[0]
+    
+    def predict_next_batch(self, sequences: List[List[float]]) -> List[Optional[float]]:
+        """
+        predict_next for many sequences: exact models come from one batched
+        engine pass, the quadratic least-squares fallback is one solve per length
+        """
+        predictions = [None] * len(sequences)
         
-        # Try recursive patterns
-        pattern = self.identify_recursive_sequence(numbers)
-        if pattern == "fibonacci_like":
-            return numbers[-1] + numbers[-2]
-        elif pattern == "tribonacci_like":
-            return numbers[-1] + numbers[-2] + numbers[-3]
+        # Two terms: only a common difference can be read off
+        for i, numbers in enumerate(sequences):
+            if len(numbers) == 2:
+                predictions[i] = numbers[-1] + (numbers[1] - numbers[0])
         
-        # Advanced patterns: n^2, n^3, n^2 + n, n^2 + 1, etc.
-        if len(numbers) >= 3:
-            # Check for n^2 pattern
-            indices = list(range(1, len(numbers) + 1))
-            if all(abs(numbers[i] - (i+1)**2) < 0.1 for i in range(len(numbers))):
-                return (len(numbers) + 1) ** 2
-            
-            # Check for n^2 + 1 pattern
-            if all(abs(numbers[i] - ((i+1)**2 + 1)) < 0.1 for i in range(len(numbers))):
-                return (len(numbers) + 1) ** 2 + 1
-            
-            # Check for n^2 + n pattern
-            if all(abs(numbers[i] - ((i+1)**2 + (i+1))) < 0.1 for i in range(len(numbers))):
-                n = len(numbers) + 1
-                return n**2 + n
-            
-            # Check for n^3 pattern
-            if all(abs(numbers[i] - (i+1)**3) < 0.1 for i in range(len(numbers))):
-                return (len(numbers) + 1) ** 3
-            
-            # Check for 2^n pattern
-            if all(abs(numbers[i] - 2**(i+1)) < 0.1 for i in range(len(numbers))):
-                return 2 ** (len(numbers) + 1)
-            
-            # Check for differences in differences (second derivative)
-            first_diffs = [numbers[i+1] - numbers[i] for i in range(len(numbers)-1)]
-            if len(first_diffs) >= 2:
-                second_diffs = [first_diffs[i+1] - first_diffs[i] for i in range(len(first_diffs)-1)]
-                
-                # If second differences are constant, it's quadratic
-                if len(set([round(d, 6) for d in second_diffs])) == 1:
-                    # Predict next first difference
-                    next_first_diff = first_diffs[-1] + second_diffs[0]
-                    return numbers[-1] + next_first_diff
+        # Exact models: polynomials, n^p + c, linear recurrences
+        long_idx = [i for i, numbers in enumerate(sequences) if len(numbers) >= 3]
+        analyses = self.sequence_engine.analyze_batch([sequences[i] for i in long_idx])
+        by_length = {}
+        for i, analysis in zip(long_idx, analyses):
+            if analysis['prediction'] is not None:
+                predictions[i] = analysis['prediction']
+            else:
+                by_length.setdefault(len(sequences[i]), []).append(i)
         
-        # Try polynomial fitting (fallback)
-        if len(numbers) >= 3:
-            x = np.array(range(1, len(numbers) + 1))
-            y = np.array(numbers)
-            
-            # Try quadratic fit
-            coeffs = np.polyfit(x, y, min(2, len(numbers) - 1))
-            next_val = np.polyval(coeffs, len(numbers) + 1)
+        # Try polynomial fitting (fallback): quadratic least squares,
+        # one pseudo-inverse shared by every sequence of the same length
+        for n, indices in by_length.items():
+            x = np.arange(1, n + 1, dtype=float)
+            design = np.vander(x, 3)
+            y = np.array([sequences[i] for i in indices], dtype=float)
+            coeffs = (y[:, None, :] * np.linalg.pinv(design)[None, :, :]).sum(axis=2)
             
             # Verify fit quality
-            predicted = np.polyval(coeffs, x)
-            error = np.mean(np.abs(predicted - y))
+            predicted = (coeffs[:, None, :] * design[None, :, :]).sum(axis=2)
+            error = np.abs(predicted - y).mean(axis=1)
+            next_vals = (coeffs * np.vander([n + 1.0], 3)).sum(axis=1)
             
-            if error < 0.5:  # Good fit
-                return float(next_val)
+            for i, err, next_val in zip(indices, error, next_vals):
+                if err < 0.5:  # Good fit
+                    predictions[i] = float(next_val)
         
-        return None
+        return predictions
 
 
 def demo_solvers():
@@ -364,16 +444,28 @@ def demo_solvers():
     }
     route, dist = math_solver.traveling_salesman_simple(distances, cities)
     print(f"Best route: {' -> '.join(route)}, Distance: {dist}")
+    path, dist = math_solver.shortest_path(distances, 'A', 'C')
+    print(f"Shortest path A to C: {' -> '.join(path)}, Distance: {dist}")
+    print(f"Bridge crossing (1, 2, 5, 10 minutes): {math_solver.crossing_time([1, 2, 5, 10])} minutes")
     
     print("\n🧩 LOGIC SOLVER DEMO")
     logic_solver = LogicSolver()
-    result = logic_solver.solve_truth_teller_liar([], "Which door?")
+    result = logic_solver.solve_truth_teller_liar([
+        {'person': 'A', 'says': 'B is a liar'},
+        {'person': 'B', 'says': 'A and C are the same type'},
+        {'person': 'C', 'says': 'A tells the truth'},
+    ])
     print(f"Truth-teller/Liar solution: {result}")
     
     print("\n📦 SPATIAL SOLVER DEMO")
     spatial_solver = SpatialSolver()
     cube_analysis = spatial_solver.count_cube_faces(3, 6)
     print(f"3x3x3 painted cube analysis: {cube_analysis}")
+    motion = spatial_solver.gear_motion(
+        "Gear A has 12 teeth and meshes with Gear B, which has 8 teeth. Gear B meshes with Gear C, "
+        "which has 16 teeth. If Gear A turns clockwise 30 degrees, how far does Gear C turn?")
+    print(f"Gear train A-B-C: {motion}")
+    print(f"Ant along the edges of a 3x3x3 cube: {spatial_solver.shortest_path_grid((0, 0, 0), (3, 3, 3))} steps")
     
     print("\n🔢 SEQUENCE SOLVER DEMO")
     seq_solver = SequenceSolver()
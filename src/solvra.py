@@ -0,0 +1,84 @@
+"""
+Solvra - Command Line Module
+Fast-start entry point for one-off inference. `solve` imports only the
+ReasoningAgent and its solvers, so none of pandas, sklearn, sympy (until
+a linear system needs it) or the training pipeline load at startup.
+
+    python solvra.py solve "What comes next: 2, 5, 10, 17, 26?" -o 35 -o 37 -o 39
+    echo '{"problem_statement": "...", "answer_option_1": "..."}' | python solvra.py solve -
+
+The full train/predict/report pipeline stays in main.py.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+
+def build_problem(statement: str, options: List[str], topic: str) -> Dict[str, Any]:
+    """Problem dict in the dataset's column layout (statement '-' reads JSON from stdin)"""
+    if statement == '-':
+        problem = json.load(sys.stdin)
+        if 'problem_statement' not in problem:
+            raise ValueError("JSON problem needs a 'problem_statement' field")
+        return problem
+
+    if len(options) > 5:
+        raise ValueError("At most 5 answer options are supported")
+    problem = {'topic': topic, 'problem_statement': statement}
+    for i, option in enumerate(options, 1):
+        problem[f'answer_option_{i}'] = option
+    return problem
+
+
+def solve(problem: Dict[str, Any], show_trace: bool = False, as_json: bool = False) -> int:
+    """Run the reasoning agent on one problem and print its answer"""
+    from reasoning_agent import ReasoningAgent
+
+    start = time.perf_counter()
+    agent = ReasoningAgent(trace_level='full' if show_trace else 'off')
+    prediction, trace = agent.reason_step_by_step(problem)
+    elapsed = time.perf_counter() - start
+
+    answer = problem.get(f'answer_option_{prediction}')
+    if as_json:
+        result = {'predicted_option': prediction, 'answer': answer, 'time_seconds': round(elapsed, 6)}
+        if show_trace:
+            result['reasoning_trace'] = [{'step': step['step'], 'result': str(step['result'])}
+                                         for step in trace]
+        print(json.dumps(result, ensure_ascii=False))
+        return prediction
+
+    print(f"Predicted option: {prediction}" + (f" ({answer})" if answer is not None else ""))
+    if show_trace:
+        print(f"\n{agent.get_trace_summary()}")
+    print(f"Solved in {elapsed * 1000:.1f} ms")
+    return prediction
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="solvra", description="Solvra fast-start inference")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solve_parser = commands.add_parser('solve', help="Solve a single problem with the reasoning agent")
+    solve_parser.add_argument('statement',
+                              help="Problem statement, or '-' to read one JSON problem from stdin")
+    solve_parser.add_argument('-o', '--option', action='append', default=[], dest='options',
+                              help="Answer option, in order (repeat up to 5 times)")
+    solve_parser.add_argument('--topic', default='', help="Problem topic, e.g. 'Sequence solving'")
+    solve_parser.add_argument('--trace', action='store_true', help="Print the reasoning trace")
+    solve_parser.add_argument('--json', action='store_true', help="Print the result as JSON")
+
+    args = parser.parse_args(argv)
+    try:
+        problem = build_problem(args.statement, args.options, args.topic)
+    except ValueError as e:
+        parser.error(str(e))
+    solve(problem, show_trace=args.trace, as_json=args.json)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
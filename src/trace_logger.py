@@ -3,11 +3,14 @@ Solvra - Trace Logger Module
 Logs and saves reasoning traces for explainability and debugging
 """
 
+import csv
 import json
+import queue
+import threading
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Any
-import pandas as pd
+from typing import Dict, List, Any, Optional
 
 
 class TraceLogger:
@@ -21,14 +24,17 @@ class TraceLogger:
         
         self.traces = []
         self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
+        
+        # Running counters so summaries never need the stored traces
+        self.total_logged = 0
+        self.correct_logged = 0
+        self.topic_stats = {}
     
-    def log_problem_trace(self, problem_idx: int, problem: Dict[str, Any],
-                         prediction: int, reasoning_trace: List[Dict],
-                         verification_report: str = ""):
-        """
-        Log the complete reasoning trace for a single problem
-        """
-        trace_entry = {
+    def _build_entry(self, problem_idx: int, problem: Dict[str, Any],
+                     prediction: int, reasoning_trace: List[Dict],
+                     verification_report: str) -> Dict[str, Any]:
+        """Build the stored form of one problem trace"""
+        return {
             'problem_idx': problem_idx,
             'session_id': self.session_id,
             'timestamp': datetime.now().isoformat(),
@@ -40,7 +46,25 @@ class TraceLogger:
             'reasoning_steps': reasoning_trace,
             'verification_report': verification_report
         }
-        
+    
+    def _count(self, trace_entry: Dict[str, Any]):
+        """Update the running summary counters"""
+        self.total_logged += 1
+        stats = self.topic_stats.setdefault(trace_entry['topic'], {'total': 0, 'correct': 0})
+        stats['total'] += 1
+        if trace_entry.get('is_correct') == True:
+            self.correct_logged += 1
+            stats['correct'] += 1
+    
+    def log_problem_trace(self, problem_idx: int, problem: Dict[str, Any],
+                         prediction: int, reasoning_trace: List[Dict],
+                         verification_report: str = ""):
+        """
+        Log the complete reasoning trace for a single problem
+        """
+        trace_entry = self._build_entry(problem_idx, problem, prediction,
+                                        reasoning_trace, verification_report)
+        self._count(trace_entry)
         self.traces.append(trace_entry)
     
     def save_traces_json(self, filename: str = None):
@@ -75,6 +99,8 @@ class TraceLogger:
                 'has_warnings': 'WARNING' in trace.get('verification_report', '')
             })
         
+        # pandas is only needed here, so inference-only imports stay light
+        import pandas as pd
         df = pd.DataFrame(summary_data)
         df.to_csv(filepath, index=False)
         
@@ -199,23 +225,16 @@ class TraceLogger:
     
     def print_summary(self):
         """Print summary statistics to console"""
-        if not self.traces:
+        if not self.total_logged:
             print("No traces logged yet")
             return
         
-        total = len(self.traces)
-        correct = sum(1 for t in self.traces if t.get('is_correct') == True)
+        total = self.total_logged
+        correct = self.correct_logged
         accuracy = (correct / total * 100) if total > 0 else 0
         
         # Topic-wise breakdown
-        topic_stats = {}
-        for trace in self.traces:
-            topic = trace['topic']
-            if topic not in topic_stats:
-                topic_stats[topic] = {'total': 0, 'correct': 0}
-            topic_stats[topic]['total'] += 1
-            if trace.get('is_correct'):
-                topic_stats[topic]['correct'] += 1
+        topic_stats = self.topic_stats
         
         print("\n" + "="*60)
         print(" SOLVRA REASONING SUMMARY")
@@ -233,6 +252,218 @@ class TraceLogger:
         print("="*60 + "\n")
 
 
+class StreamingTraceLogger(TraceLogger):
+    """
+    Append-only trace logger with bounded memory
+    Each trace is written as one compact JSON line as soon as it is logged,
+    with size/time-based flushing, size-based file rotation and an optional
+    background writer thread. Nothing is kept in self.traces.
+    """
+    
+    SUMMARY_FIELDS = ['problem_idx', 'topic', 'predicted_option', 'correct_option',
+                      'is_correct', 'num_reasoning_steps', 'has_warnings']
+    
+    def __init__(self, log_dir: str = "../reports",
+                 flush_bytes: int = 1 << 20,
+                 flush_interval: float = 5.0,
+                 max_file_bytes: int = 256 << 20,
+                 background: bool = False,
+                 queue_size: int = 10000):
+        super().__init__(log_dir)
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        
+        self.part = 0
+        self.file_bytes = 0
+        self.pending_bytes = 0
+        self.last_flush = time.monotonic()
+        self.trace_files = []
+        self._trace_file = None
+        self._open_next_part()
+        
+        self.summary_path = self.log_dir / f"reasoning_summary_{self.session_id}.csv"
+        self._summary_file = open(self.summary_path, 'w', encoding='utf-8', newline='')
+        self._summary_writer = csv.DictWriter(self._summary_file, fieldnames=self.SUMMARY_FIELDS)
+        self._summary_writer.writeheader()
+        
+        # Optional writer thread keeps serialization and I/O off the caller
+        self._queue = None
+        self._writer_thread = None
+        self._writer_error = None
+        self._lock = threading.Lock()
+        if background:
+            self._queue = queue.Queue(maxsize=queue_size)
+            self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+            self._writer_thread.start()
+    
+    def _open_next_part(self):
+        """Start a new trace file (rotation)"""
+        if self._trace_file is not None:
+            self._trace_file.close()
+        self.part += 1
+        path = self.log_dir / f"reasoning_traces_{self.session_id}_{self.part:04d}.jsonl"
+        self._trace_file = open(path, 'w', encoding='utf-8')
+        self.trace_files.append(path)
+        self.file_bytes = 0
+    
+    def log_problem_trace(self, problem_idx: int, problem: Dict[str, Any],
+                         prediction: int, reasoning_trace: List[Dict],
+                         verification_report: str = ""):
+        """
+        Log one trace: counted immediately, written now or by the writer thread
+        """
+        trace_entry = self._build_entry(problem_idx, problem, prediction,
+                                        reasoning_trace, verification_report)
+        self._count(trace_entry)
+        
+        if self._queue is not None:
+            self._raise_writer_error()
+            self._queue.put(trace_entry)  # Blocks when the writer falls behind
+        else:
+            self._write(trace_entry)
+    
+    def _writer_loop(self):
+        """
+        Background thread: drain the queue until the None sentinel
+        A failed write (disk full, I/O error) is kept for the caller to
+        re-raise; later traces are dropped but still taken off the queue,
+        so put() and join() never wait on a dead writer
+        """
+        while True:
+            trace_entry = self._queue.get()
+            try:
+                if trace_entry is None:
+                    return
+                if self._writer_error is None:
+                    self._write(trace_entry)
+            except Exception as e:
+                self._writer_error = e
+            finally:
+                self._queue.task_done()
+    
+    def _raise_writer_error(self):
+        """Re-raise a write error from the background thread in the caller"""
+        if self._writer_error is not None:
+            raise self._writer_error
+    
+    def _write(self, trace_entry: Dict[str, Any]):
+        """Append one trace line and its summary row, then flush/rotate if due"""
+        line = json.dumps(trace_entry, ensure_ascii=False, separators=(',', ':'), default=str) + "\n"
+        size = len(line.encode('utf-8'))
+        
+        with self._lock:
+            if self.file_bytes and self.file_bytes + size > self.max_file_bytes:
+                self._open_next_part()
+            self._trace_file.write(line)
+            self.file_bytes += size
+            self.pending_bytes += size
+            
+            self._summary_writer.writerow({
+                'problem_idx': trace_entry['problem_idx'],
+                'topic': trace_entry['topic'],
+                'predicted_option': trace_entry['predicted_option'],
+                'correct_option': trace_entry['correct_option'],
+                'is_correct': trace_entry['is_correct'],
+                'num_reasoning_steps': len(trace_entry['reasoning_steps']),
+                'has_warnings': 'WARNING' in trace_entry.get('verification_report', '')
+            })
+            
+            if (self.pending_bytes >= self.flush_bytes or
+                    time.monotonic() - self.last_flush >= self.flush_interval):
+                self._flush_locked()
+    
+    def _flush_locked(self):
+        self._trace_file.flush()
+        self._summary_file.flush()
+        self.pending_bytes = 0
+        self.last_flush = time.monotonic()
+    
+    def flush(self):
+        """Wait for queued traces and push everything to disk"""
+        if self._trace_file is None:
+            return
+        if self._queue is not None:
+            self._queue.join()
+            self._raise_writer_error()
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self):
+        """Flush, stop the writer thread and close the files"""
+        if self._trace_file is None:
+            return
+        if self._writer_thread is not None:
+            self._queue.put(None)
+            self._writer_thread.join()
+            self._writer_thread = None
+            self._queue = None
+        with self._lock:
+            try:
+                self._flush_locked()
+            finally:
+                self._trace_file.close()
+                self._summary_file.close()
+                self._trace_file = None
+        self._raise_writer_error()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def save_traces_json(self, filename: str = None):
+        """Traces are already on disk; make sure they are flushed"""
+        self.flush()
+        print(f"💾 Streamed {self.total_logged} reasoning traces to "
+              f"{len(self.trace_files)} file(s), latest {self.trace_files[-1]}")
+    
+    def save_traces_csv(self, filename: str = None):
+        """Summary rows are already on disk; make sure they are flushed"""
+        self.flush()
+        print(f"Saved reasoning summary to {self.summary_path}")
+
+
+class TraceSampler:
+    """
+    Chooses which problems keep a full reasoning trace: a random fraction
+    (rate), plus every wrong prediction (errors) and every prediction below
+    min_confidence. The random draw is a hash of the problem index and seed,
+    so serial and parallel runs keep the same problems.
+    """
+    
+    def __init__(self, rate: float = 0.0, errors: bool = False,
+                 min_confidence: Optional[float] = None, seed: int = 0):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Trace sample rate must be between 0 and 1, got {rate}")
+        self.rate = rate
+        self.errors = errors
+        self.min_confidence = min_confidence
+        self.seed = seed
+    
+    def sampled(self, problem_idx: int) -> bool:
+        """Deterministic per-index coin flip with probability rate"""
+        if self.rate <= 0.0:
+            return False
+        # splitmix64 finaliser: consecutive indices give independent-looking draws
+        mask = (1 << 64) - 1
+        x = (problem_idx + (self.seed + 1) * 0x9E3779B97F4A7C15) & mask
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & mask
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & mask
+        x ^= x >> 31
+        return x < self.rate * (1 << 64)
+    
+    def keep(self, problem_idx: int, is_correct: Optional[bool] = None,
+             confidence: Optional[float] = None) -> bool:
+        """is_correct is None when the label is unknown (test set)"""
+        if self.errors and is_correct is False:
+            return True
+        if self.min_confidence is not None and confidence is not None and confidence < self.min_confidence:
+            return True
+        return self.sampled(problem_idx)
+
+
 def demo_logger():
     """Demo the trace logger"""
     logger = TraceLogger(log_dir="../reports")
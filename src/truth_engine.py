@@ -0,0 +1,567 @@
+"""
+Solvra - Truth Engine Module
+Truth-teller / liar (knights and knaves) puzzles. Statements such as
+"A says 'B is a liar'" or "C says 'exactly one of us is a knight'" are
+parsed into small boolean expressions over who tells the truth, and
+every consistent assignment of roles is found as an N-bit mask (bit i
+set = person i tells the truth).
+
+Claims such as "B is a liar" or "A and C are the same type" are XOR
+constraints on roles. They are solved first by Gaussian elimination over
+GF(2) on bitmask rows, which leaves a few free people whose roles fix
+everyone else's. The remaining claims are checked by a depth-first
+search over those free roles, each one as soon as the people it
+mentions are known, and counting claims ("at least two of us...")
+earlier still, from bounds.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+# Expressions, as tuples:
+#   ('is', person, truthful)            person is a truth-teller (truthful=True) or a liar
+#   ('not', expr)
+#   ('and', (expr, ...)) / ('or', (expr, ...))
+#   ('count', mask, op, k, truthful)    how many people in mask are truth-tellers/liars, op in ==, >=, <=
+#   ('same', a, b)                      a and b have the same role
+Expr = tuple
+
+TRUTHFUL_WORDS = ('knight', 'truth-teller', 'truthteller', 'truth teller', 'honest', 'truthful')
+LYING_WORDS = ('knave', 'liar', 'dishonest', 'lying')
+NUMBER_WORDS = {'no': 0, 'none': 0, 'zero': 0, 'one': 1, 'two': 2, 'three': 3, 'four': 4,
+                'five': 5, 'six': 6, 'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10}
+_FIRST_PERSON = {'i', 'me', 'myself'}
+_NOT_NAMES = {'I', 'We', 'You', 'He', 'She', 'They', 'It', 'The', 'One', 'Exactly', 'At', 'All',
+              'None', 'Both', 'Either', 'Neither', 'Only', 'If', 'Then', 'Each', 'Every', 'Who', 'Which'}
+
+_SPEECH = r"(?:says|said|claims|claimed|states|stated|replies|replied|answers|answered|declares|declared)"
+_QUOTED = re.compile(r"\b([A-Z]\w*)\s+" + _SPEECH + r"(?:\s+that)?\s*[:,]?\s*[\"“‘']([^\"“”‘’]+?)[.!]?[\"”’'](?=[\s.,;:!?]|$)")
+_UNQUOTED = re.compile(r"\b([A-Z]\w*)\s+" + _SPEECH + r"(?:\s+that)?\s*:?\s+([^\"“”.;!?]+)")
+
+_ROLE = r"(?:an? |both |all |)(" + '|'.join(re.escape(w) for w in TRUTHFUL_WORDS + LYING_WORDS) + r")s?"
+# Verb phrases ending a claim -> whether the subject tells the truth; longest
+# first so "never lies" wins over "lies"
+_VERBS = sorted({
+    'tells the truth': True, 'tell the truth': True, 'always tells the truth': True,
+    'always tell the truth': True, 'is telling the truth': True, 'am telling the truth': True,
+    'are telling the truth': True, 'never lies': True, 'never lie': True, 'does not lie': True,
+    "doesn't lie": True, 'do not lie': True, "don't lie": True, 'is not lying': True,
+    'am not lying': True, 'are not lying': True,
+    'lies': False, 'lie': False, 'always lies': False, 'always lie': False, 'is lying': False,
+    'am lying': False, 'are lying': False, 'never tells the truth': False, 'never tell the truth': False,
+    'does not tell the truth': False, "doesn't tell the truth": False, 'do not tell the truth': False,
+    "don't tell the truth": False, 'is not telling the truth': False, 'am not telling the truth': False,
+    'are not telling the truth': False,
+}.items(), key=lambda item: -len(item[0]))
+_NAME_LIST = re.compile(r"\b[A-Z]\w*(?:\s*,\s*[A-Z]\w*)*,?\s+(?:and|or)\s+[A-Z]\w*\b")
+_SUBJECT_SPLIT = re.compile(r"\s*,\s*(?:and\s+|or\s+|nor\s+)?|\s+(and|or|nor)\s+")
+_COUNT = re.compile(r"^(not\s+)?(exactly|at least|at most|only|just)?\s*(\w+)\s+of\s+(?:us|them|the \w+)\s+"
+                    r"(?:is|are)\s+" + _ROLE + r"$")
+_ALL = re.compile(r"^(?:we|they)\s+are\s+(?:both\s+|all\s+)?(not\s+)?" + _ROLE + r"$")
+_SAME = re.compile(r"^(.+?)\s+(?:are|is|am)\s+(not\s+)?(?:of\s+)?(the same|different)(?:\s+(?:type|kind|role)s?)?"
+                   r"(?:\s+(?:as|from)\s+(.+))?$", re.IGNORECASE)
+_PREDICATE = re.compile(r"^(.+?)\s+(?:is|are|am)\s+(not\s+)?" + _ROLE + r"$", re.IGNORECASE)
+
+
+def _role_truthful(word: str) -> bool:
+    return word.lower() in TRUTHFUL_WORDS
+
+
+def _clean(text: str) -> str:
+    return ' '.join(text.strip().strip('.,;:!?"“”‘’\'').split())
+
+
+class TruthPuzzle:
+    """People, in order, and (speaker, claim) statements over them"""
+
+    def __init__(self):
+        self.people: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.statements: List[Tuple[int, Expr]] = []
+        # Set once the statements are read: later claims (answer options) may not add people
+        self.frozen = False
+
+    def person(self, name: str) -> int:
+        i = self.index.get(name)
+        if i is None:
+            i = self.index[name] = len(self.people)
+            self.people.append(name)
+        return i
+
+    @classmethod
+    def from_text(cls, text: str) -> Optional['TruthPuzzle']:
+        """
+        Puzzle from a problem statement, or None unless it has at least one
+        "X says ..." statement and every one of them can be read
+        """
+        found = {m.start(): (m.group(1), m.group(2)) for m in _QUOTED.finditer(text)}
+        for m in _UNQUOTED.finditer(text):
+            if m.start() not in found:
+                found[m.start()] = (m.group(1), m.group(2))
+        statements = [found[start] for start in sorted(found)]
+
+        # People who never speak but are listed with those who do ("What are A and B?")
+        speakers = {speaker for speaker, _ in statements}
+        others = []
+        for m in _NAME_LIST.finditer(text):
+            names = re.findall(r"[A-Z]\w*", m.group(0))
+            if speakers.intersection(names):
+                others += [name for name in names if name not in speakers and name not in _NOT_NAMES]
+        return cls.from_statements(statements, others)
+
+    @classmethod
+    def from_statements(cls, statements: Sequence[Tuple[str, str]],
+                        others: Sequence[str] = ()) -> Optional['TruthPuzzle']:
+        """
+        Puzzle from (speaker, claim text) pairs plus any silent people;
+        None if there are no statements or any claim is unreadable
+        """
+        if not statements:
+            return None
+        puzzle = cls()
+        for speaker, _ in statements:
+            puzzle.person(speaker)
+        for name in others:
+            puzzle.person(name)
+        parsed = []
+        for speaker, claim in statements:
+            expr = puzzle.parse_claim(claim, puzzle.index[speaker])
+            if expr is None:
+                return None
+            parsed.append((puzzle.index[speaker], expr))
+        # "of us" claims cover everyone, so they are resolved once all names are known
+        puzzle.statements = [(speaker, puzzle._resolve(expr)) for speaker, expr in parsed]
+        puzzle.frozen = True
+        return puzzle
+
+    def parse_claim(self, claim: str, speaker: Optional[int] = None) -> Optional[Expr]:
+        """Expression for one claim ("B is a liar and I am a knight"), None if unreadable"""
+        text = _clean(claim)
+        if not text:
+            return None
+        expr = self._clause(text, speaker)
+        if expr is not None:
+            return expr
+        for joiner, op in ((' or ', 'or'), (' and ', 'and'), (', ', 'and')):
+            parts = text.split(joiner)
+            if len(parts) > 1:
+                exprs = [self.parse_claim(part, speaker) for part in parts]
+                if all(e is not None for e in exprs):
+                    return (op, tuple(exprs))
+        return None
+
+    def parse_option(self, option: str, asked_truthful: Optional[bool] = None) -> Optional[Expr]:
+        """
+        An answer option read as a claim with no speaker ("A is a knight,
+        B is a knave"). When the question asks who the truth-tellers
+        (asked_truthful=True) or liars are, a bare "A and C" means exactly
+        those people have that role.
+        """
+        expr = self.parse_claim(option)
+        if expr is not None:
+            return self._resolve(expr)
+        if asked_truthful is None:
+            return None
+        named = self._subjects(_clean(option), None)
+        if named is None or named[1] != 'and':
+            return None
+        mask = 0
+        for person in named[0]:
+            mask |= 1 << person
+        everyone = (1 << len(self.people)) - 1
+        return ('and', (('count', mask, '==', bin(mask).count('1'), asked_truthful),
+                        ('count', everyone & ~mask, '==', 0, asked_truthful)))
+
+    def _clause(self, text: str, speaker: Optional[int]) -> Optional[Expr]:
+        lower = text.lower()
+        negated = False
+        for prefix in ("it is not true that ", "it is false that ", "it's not true that "):
+            if lower.startswith(prefix):
+                negated, text, lower = True, text[len(prefix):], lower[len(prefix):]
+                break
+        for prefix in ("it is true that ", "it's true that "):
+            if lower.startswith(prefix):
+                text, lower = text[len(prefix):], lower[len(prefix):]
+                break
+
+        expr = self._count_clause(lower)
+        if expr is None:
+            expr = self._same_clause(text, speaker)
+        if expr is None:
+            expr = self._predicate_clause(text, speaker)
+        if expr is None:
+            return None
+        return ('not', expr) if negated else expr
+
+    def _count_clause(self, lower: str) -> Optional[Expr]:
+        match = _ALL.match(lower)
+        if match:
+            expr = ('count_all', '==', None, _role_truthful(match.group(2)))
+            return ('not', expr) if match.group(1) else expr
+        match = _COUNT.match(lower)
+        if match:
+            negated, quantifier, number, role = match.groups()
+            k = NUMBER_WORDS.get(number, int(number) if number.isdigit() else None)
+            if k is None:
+                if number in ('all', 'both'):
+                    return ('count_all', '==', None, _role_truthful(role))
+                return None
+            op = {'at least': '>=', 'at most': '<='}.get(quantifier, '==')
+            if quantifier is None and k:
+                op = '>='  # "one of us is a liar": at least one
+            expr = ('count_all', op, k, _role_truthful(role))
+            return ('not', expr) if negated else expr
+        return None
+
+    def _same_clause(self, text: str, speaker: Optional[int]) -> Optional[Expr]:
+        match = _SAME.match(text)
+        if not match:
+            return None
+        subjects, negated, kind, other = match.groups()
+        people = self._subjects(subjects + (' and ' + other if other else ''), speaker)
+        if people is None or len(people[0]) != 2 or people[1] == 'or':
+            return None
+        a, b = people[0]
+        same = ('same', a, b)
+        if (kind.lower() == 'different') != bool(negated):
+            return ('not', same)
+        return same
+
+    def _predicate_clause(self, text: str, speaker: Optional[int]) -> Optional[Expr]:
+        match = _PREDICATE.match(text)
+        if match:
+            candidates = [(match.group(1), _role_truthful(match.group(3)), bool(match.group(2)))]
+        else:
+            lower = text.lower()
+            candidates = [(text[:-len(phrase) - 1], truthful, False) for phrase, truthful in _VERBS
+                          if lower.endswith(' ' + phrase)]
+        for subjects, truthful, negated in candidates:
+            people = self._subjects(subjects, speaker)
+            if people is not None:
+                break
+        else:
+            return None
+        names, joiner = people
+        if joiner == 'nor':
+            negated, joiner = not negated, 'and'
+        atoms = tuple(('is', p, truthful != negated) for p in names)
+        if len(atoms) == 1:
+            return atoms[0]
+        return (joiner, atoms)
+
+    def _subjects(self, text: str, speaker: Optional[int]) -> Optional[Tuple[List[int], str]]:
+        """People named in "A", "A and B", "either A or B", "neither I nor C"; with their joiner"""
+        words = text.split()
+        if words and words[0].lower() in ('both', 'either', 'neither', 'only'):
+            lead = words[0].lower()
+            text = ' '.join(words[1:])
+        else:
+            lead = None
+        parts = _SUBJECT_SPLIT.split(text)
+        names = [part for i, part in enumerate(parts) if i % 2 == 0 and part]
+        joiners = {part for i, part in enumerate(parts) if i % 2 == 1 and part}
+        joiner = 'and' if not joiners else joiners.pop().lower()
+        if joiners:
+            return None  # mixed "and"/"or"
+        if lead == 'neither':
+            joiner = 'nor'
+
+        people = []
+        for name in names:
+            name = _clean(name)
+            if name.lower() in _FIRST_PERSON:
+                if speaker is None:
+                    return None
+                people.append(speaker)
+            elif name in self.index:
+                people.append(self.index[name])
+            elif not self.frozen and re.fullmatch(r"[A-Z]\w*", name) and name not in _NOT_NAMES:
+                people.append(self.person(name))
+            else:
+                return None
+        return (people, joiner) if people else None
+
+    def _resolve(self, expr: Expr) -> Expr:
+        """Replace 'count_all' (over "us") with a count over every person"""
+        kind = expr[0]
+        if kind == 'count_all':
+            _, op, k, truthful = expr
+            everyone = (1 << len(self.people)) - 1
+            return ('count', everyone, op, len(self.people) if k is None else k, truthful)
+        if kind == 'not':
+            return ('not', self._resolve(expr[1]))
+        if kind in ('and', 'or'):
+            return (kind, tuple(self._resolve(e) for e in expr[1]))
+        return expr
+
+    def describe(self, mask: int) -> Dict[str, str]:
+        """{person: 'truth-teller' | 'liar'} for an assignment mask"""
+        return {name: 'truth-teller' if mask >> i & 1 else 'liar' for i, name in enumerate(self.people)}
+
+
+def support(expr: Expr) -> int:
+    """Bitmask of the people an expression mentions"""
+    kind = expr[0]
+    if kind == 'is':
+        return 1 << expr[1]
+    if kind == 'not':
+        return support(expr[1])
+    if kind in ('and', 'or'):
+        mask = 0
+        for e in expr[1]:
+            mask |= support(e)
+        return mask
+    if kind == 'count':
+        return expr[1]
+    return (1 << expr[1]) | (1 << expr[2])
+
+
+def compile_expr(expr: Expr) -> Callable[[int], bool]:
+    """fn(mask) -> truth of expr when everyone it mentions is assigned"""
+    kind = expr[0]
+    if kind == 'is':
+        _, person, truthful = expr
+        return (lambda m: m >> person & 1 == 1) if truthful else (lambda m: m >> person & 1 == 0)
+    if kind == 'not':
+        inner = compile_expr(expr[1])
+        return lambda m: not inner(m)
+    if kind in ('and', 'or'):
+        parts = [compile_expr(e) for e in expr[1]]
+        if kind == 'and':
+            return lambda m: all(p(m) for p in parts)
+        return lambda m: any(p(m) for p in parts)
+    if kind == 'count':
+        _, people, op, k, truthful = expr
+        count = (lambda m: (m & people).bit_count()) if truthful else (lambda m: (~m & people).bit_count())
+        if op == '>=':
+            return lambda m: count(m) >= k
+        if op == '<=':
+            return lambda m: count(m) <= k
+        return lambda m: count(m) == k
+    _, a, b = expr
+    return lambda m: (m >> a & 1) == (m >> b & 1)
+
+
+def compile_partial(expr: Expr) -> Callable[[int, int], Optional[bool]]:
+    """fn(mask, assigned) -> True/False once decided by the assigned people, else None"""
+    kind = expr[0]
+    if kind == 'is':
+        _, person, truthful = expr
+        bit = 1 << person
+        return lambda m, a: (bool(m & bit) == truthful) if a & bit else None
+    if kind == 'not':
+        inner = compile_partial(expr[1])
+        def negate(m, a):
+            value = inner(m, a)
+            return None if value is None else not value
+        return negate
+    if kind in ('and', 'or'):
+        parts = [compile_partial(e) for e in expr[1]]
+        decisive = kind == 'or'  # the value that settles the whole expression
+        def combine(m, a):
+            unknown = False
+            for part in parts:
+                value = part(m, a)
+                if value is None:
+                    unknown = True
+                elif value == decisive:
+                    return decisive
+            return None if unknown else not decisive
+        return combine
+    if kind == 'count':
+        _, people, op, k, truthful = expr
+        def bounds(m, a):
+            known = people & a
+            low = ((m if truthful else ~m) & known).bit_count()
+            high = low + (people & ~a).bit_count()
+            if op == '>=':
+                return True if low >= k else (False if high < k else None)
+            if op == '<=':
+                return True if high <= k else (False if low > k else None)
+            if k < low or k > high:
+                return False
+            return (low == k) if low == high else None
+        return bounds
+    full = compile_expr(expr)
+    needed = support(expr)
+    return lambda m, a: full(m) if a & needed == needed else None
+
+
+def asked_role(text: str) -> Optional[bool]:
+    """True if the question asks who tells the truth, False if who lies, else None"""
+    questions = re.findall(r"[^.?!]*\?", text)
+    if not questions:
+        return None
+    question = questions[-1].lower()
+    if not re.search(r"\b(?:who|which)\b", question):
+        return None
+    for word in LYING_WORDS + ('lies', 'lie'):
+        if word in question:
+            return False
+    for word in TRUTHFUL_WORDS + ('truth',):
+        if word in question:
+            return True
+    return None
+
+
+class TruthEngine:
+    """
+    Every assignment of truth-tellers and liars consistent with a puzzle:
+    a speaker's claim holds exactly when the speaker tells the truth.
+    """
+
+    def solve(self, puzzle: TruthPuzzle, limit: Optional[int] = None) -> List[int]:
+        """Consistent assignment masks (bit i set = person i tells the truth), up to limit"""
+        n = len(puzzle.people)
+        xor_rows, general = [], []
+        for speaker, expr in puzzle.statements:
+            form = self._xor_form(expr)
+            if form is None:
+                general.append((speaker, expr))
+            else:
+                # speaker truthful == claim: XOR of the speaker and the claim's people is fixed
+                people, constant = form
+                xor_rows.append((people ^ (1 << speaker), constant))
+
+        pivots = self._eliminate(xor_rows)
+        if pivots is None:
+            return []  # e.g. "I am a liar", or an odd cycle of accusations
+        free = [i for i in range(n) if i not in pivots]
+
+        # Order the free choices so the claims that need searching are checked early
+        def depends(people: int) -> int:
+            """Free people whose roles decide everyone in people"""
+            mask = 0
+            for i in range(n):
+                if people >> i & 1:
+                    mask |= pivots[i][0] if i in pivots else 1 << i
+            return mask
+
+        order, seen = [], set()
+        for speaker, expr in general:
+            needed = depends(support(expr) | (1 << speaker))
+            for i in free:
+                if needed >> i & 1 and i not in seen:
+                    seen.add(i)
+                    order.append(i)
+        order += [i for i in free if i not in seen]
+        position = {person: depth for depth, person in enumerate(order)}
+
+        def ready_at(people: int) -> int:
+            """Depth after which everyone in people is known (-1: known from the start)"""
+            needed = depends(people)
+            return max((position[i] for i in order if needed >> i & 1), default=-1)
+
+        # Pivot roles follow from the free ones: settle each as soon as its row is assigned
+        settle = [[] for _ in range(len(order) + 1)]
+        start = 0
+        for person, (row, constant) in pivots.items():
+            depth = ready_at(row)
+            if depth < 0:
+                start |= constant << person
+            else:
+                settle[depth].append((person, row, constant))
+
+        known_after = []
+        known = sum(1 << person for person, (row, _) in pivots.items() if not row)
+        for depth, person in enumerate(order):
+            known |= 1 << person
+            known |= sum(1 << p for p, _, _ in settle[depth])
+            known_after.append(known)
+
+        # Full checks once a claim's people are known; bound checks before that for counts
+        full_checks = [[] for _ in range(len(order) + 1)]
+        partial_checks = [[] for _ in range(len(order) + 1)]
+        for speaker, expr in general:
+            last = ready_at(support(expr) | (1 << speaker))
+            full_checks[max(last, 0)].append((speaker, compile_expr(expr)))
+            if self._has_count(expr):
+                partial = compile_partial(expr)
+                for depth in range(max(ready_at(1 << speaker), 0), last):
+                    partial_checks[depth].append((speaker, partial))
+
+        if not order:
+            ok = all((start >> s & 1 == 1) == claim(start) for s, claim in full_checks[0])
+            return [start] if ok else []
+
+        solutions = []
+        total = len(order)
+        stack = [(0, start)]
+        while stack:
+            depth, mask = stack.pop()
+            if depth == total:
+                solutions.append(mask)
+                if limit is not None and len(solutions) >= limit:
+                    break
+                continue
+            bit = 1 << order[depth]
+            full, partial, known = full_checks[depth], partial_checks[depth], known_after[depth]
+            for m in (mask, mask | bit):  # truthful popped first
+                for person, row, constant in settle[depth]:
+                    m |= (constant ^ (row & m).bit_count() & 1) << person
+                if any((m >> s & 1 == 1) != claim(m) for s, claim in full):
+                    continue
+                consistent = True
+                for s, claim in partial:
+                    value = claim(m, known)
+                    if value is not None and value != (m >> s & 1 == 1):
+                        consistent = False
+                        break
+                if consistent:
+                    stack.append((depth + 1, m))
+        return sorted(solutions, reverse=True)
+
+    def _eliminate(self, rows: List[Tuple[int, int]]) -> Optional[Dict[int, Tuple[int, int]]]:
+        """
+        Gauss-Jordan elimination over GF(2) on (people bitmask, parity) rows.
+        Returns {pivot person: (free people bitmask, parity)}, meaning the
+        pivot's role is the parity XOR the roles of those free people, or
+        None if the rows contradict each other.
+        """
+        reduced: Dict[int, List[int]] = {}  # pivot -> [row incl. pivot bit, parity]
+        for row, parity in rows:
+            for pivot, (pivot_row, pivot_parity) in reduced.items():
+                if row >> pivot & 1:
+                    row ^= pivot_row
+                    parity ^= pivot_parity
+            if not row:
+                if parity:
+                    return None
+                continue
+            pivot = (row & -row).bit_length() - 1
+            for entry in reduced.values():
+                if entry[0] >> pivot & 1:
+                    entry[0] ^= row
+                    entry[1] ^= parity
+            reduced[pivot] = [row, parity]
+        return {pivot: (row ^ (1 << pivot), parity) for pivot, (row, parity) in reduced.items()}
+
+    def _xor_form(self, expr: Expr) -> Optional[Tuple[int, int]]:
+        """
+        (people, constant) if expr is the XOR of those people's roles with
+        constant ("B is a liar", "A and C are the same type", negations)
+        """
+        kind = expr[0]
+        if kind == 'is':
+            return 1 << expr[1], 0 if expr[2] else 1
+        if kind == 'not':
+            inner = self._xor_form(expr[1])
+            return None if inner is None else (inner[0], inner[1] ^ 1)
+        if kind == 'same':
+            return (1 << expr[1]) ^ (1 << expr[2]), 1
+        return None
+
+    def _has_count(self, expr: Expr) -> bool:
+        kind = expr[0]
+        if kind == 'count':
+            return True
+        if kind == 'not':
+            return self._has_count(expr[1])
+        if kind in ('and', 'or'):
+            return any(self._has_count(e) for e in expr[1])
+        return False
+
+    def entails(self, expr: Expr, solutions: List[int]) -> bool:
+        """expr holds under every solution (and there is at least one)"""
+        check = compile_expr(expr)
+        return bool(solutions) and all(check(m) for m in solutions)
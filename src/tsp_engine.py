@@ -0,0 +1,244 @@
+"""
+Solvra - TSP Engine Module
+Exact Held-Karp dynamic programming for small tours and a
+nearest-neighbour + 2-opt/Or-opt heuristic for large ones
+"""
+
+from typing import Dict, List, Tuple, Optional
+import numpy as np
+
+
+class TSPEngine:
+    """
+    Travelling salesman solver over a dense NumPy distance matrix.
+    Missing edges are infinite; tours start and end at the first city.
+    """
+
+    def __init__(self, exact_limit: int = 18, max_passes: int = 50):
+        # Largest instance solved exactly (Held-Karp is O(2^n * n^2) time, O(2^n * n) memory)
+        self.exact_limit = exact_limit
+        # Cap on local-search improvement passes for the heuristic
+        self.max_passes = max_passes
+
+    def build_distance_matrix(self, distances: Dict[Tuple[str, str], float],
+                              cities: List[str]) -> np.ndarray:
+        """
+        Dense matrix from an edge dict, built once per solve.
+        (a, b) is used for a -> b, falling back to (b, a); otherwise infinite.
+        """
+        index = {city: i for i, city in enumerate(cities)}
+        matrix = np.full((len(cities), len(cities)), np.inf)
+
+        # Reverse keys first so an explicit (a, b) entry always wins
+        for (a, b), dist in distances.items():
+            if a in index and b in index:
+                matrix[index[b], index[a]] = dist
+        for (a, b), dist in distances.items():
+            if a in index and b in index:
+                matrix[index[a], index[b]] = dist
+
+        return matrix
+
+    def route_cost(self, matrix: np.ndarray, tour: List[int]) -> float:
+        """Cost of the closed tour, summed edge by edge in route order"""
+        distance = 0
+        route = list(tour) + [tour[0]]
+        for i in range(len(route) - 1):
+            edge = matrix[route[i], route[i+1]]
+            if np.isinf(edge):
+                return float('inf')
+            distance += edge.item()
+        return distance
+
+    def held_karp(self, matrix: np.ndarray) -> Tuple[Optional[List[int]], float]:
+        """
+        Exact bitmask DP. Returns the lexicographically first optimal tour
+        (the same one a permutation scan would find) and its cost.
+        """
+        n = len(matrix)
+        if n == 1:
+            cost = self.route_cost(matrix, [0])
+            return ([0], cost) if cost < float('inf') else (None, float('inf'))
+
+        m = n - 1                      # cities other than the start
+        others = matrix[1:, 1:]        # others[j, k]: j -> k
+        to_start = matrix[1:, 0]
+        from_start = matrix[0, 1:]
+        full = (1 << m) - 1
+
+        # f[S, j]: cheapest path from j through every city in S, then back to start
+        f = np.full((1 << m, m), np.inf)
+        f[0] = to_start
+
+        masks = np.arange(1 << m)
+        popcount = np.zeros(1 << m, dtype=np.int64)
+        for k in range(m):
+            popcount += (masks >> k) & 1
+
+        for size in range(1, m):
+            layer = masks[popcount == size]
+            for k in range(m):
+                with_k = layer[(layer >> k) & 1 == 1]
+                if len(with_k) == 0:
+                    continue
+                # j -> k, then finish from k through the rest of S
+                candidate = others[:, k][None, :] + f[with_k ^ (1 << k), k][:, None]
+                np.minimum(f[with_k], candidate, out=candidate)
+                f[with_k] = candidate
+
+        def finish_cost(cur: int, remaining: int) -> np.ndarray:
+            """Cost of going cur -> k -> ... -> start for every k in remaining"""
+            ks = np.array([k for k in range(m) if remaining >> k & 1])
+            edge = from_start[ks] if cur < 0 else others[cur, ks]
+            return ks, edge + f[remaining ^ (1 << ks), ks]
+
+        ks, costs = finish_cost(-1, full)
+        best = costs.min()
+        if np.isinf(best):
+            return None, float('inf')
+
+        # Walk forward choosing the smallest city index that stays optimal
+        tour = [0]
+        cur, remaining, target = -1, full, best
+        while remaining:
+            ks, costs = finish_cost(cur, remaining)
+            matches = np.flatnonzero(np.isclose(costs, target, rtol=1e-9, atol=1e-9))
+            choice = int(matches[0]) if len(matches) else int(np.argmin(costs))
+            k = int(ks[choice])
+            step = from_start[k] if cur < 0 else others[cur, k]
+            target = target - step
+            tour.append(k + 1)
+            cur, remaining = k, remaining ^ (1 << k)
+
+        return tour, self.route_cost(matrix, tour)
+
+    def nearest_neighbour_tour(self, matrix: np.ndarray) -> List[int]:
+        """Greedy tour from the start city"""
+        n = len(matrix)
+        visited = np.zeros(n, dtype=bool)
+        visited[0] = True
+        tour = [0]
+        cur = 0
+        for _ in range(n - 1):
+            row = np.where(visited, np.inf, matrix[cur])
+            nxt = int(np.argmin(row))
+            if visited[nxt]:
+                # Only infinite edges left: take any unvisited city
+                nxt = int(np.flatnonzero(~visited)[0])
+            visited[nxt] = True
+            tour.append(nxt)
+            cur = nxt
+        return tour
+
+    def two_opt(self, matrix: np.ndarray, tour: List[int]) -> List[int]:
+        """Reverse segments while any reversal shortens the tour (symmetric costs)"""
+        tour = np.array(tour)
+        n = len(tour)
+        if n < 4:
+            return tour.tolist()
+
+        for _ in range(self.max_passes):
+            improved = False
+            for i in range(n - 2):
+                a, b = tour[i], tour[i+1]
+                c = tour[i+2:]
+                d = np.append(tour[i+3:], tour[0])
+                delta = matrix[a, c] + matrix[b, d] - matrix[a, b] - matrix[c, d]
+                if i == 0:
+                    delta[-1] = 0  # Edge (c, d) would wrap onto (a, b)
+                j = int(np.argmin(delta))
+                if delta[j] < -1e-9:
+                    j += i + 2
+                    tour[i+1:j+1] = tour[i+1:j+1][::-1]
+                    improved = True
+            if not improved:
+                break
+        return tour.tolist()
+
+    def or_opt(self, matrix: np.ndarray, tour: List[int]) -> List[int]:
+        """Move runs of 1-3 cities (optionally reversed) to their cheapest position"""
+        tour = list(tour)
+        n = len(tour)
+        if n < 5:
+            return tour
+
+        for _ in range(self.max_passes):
+            improved = False
+            for seg_len in (1, 2, 3):
+                i = 1
+                while i + seg_len <= n:
+                    seg = tour[i:i+seg_len]
+                    prev, nxt = tour[i-1], tour[(i+seg_len) % n]
+                    removal_gain = matrix[prev, seg[0]] + matrix[seg[-1], nxt] - matrix[prev, nxt]
+
+                    rest = np.array(tour[:i] + tour[i+seg_len:])
+                    u, v = rest, np.roll(rest, -1)
+                    insert_fwd = matrix[u, seg[0]] + matrix[seg[-1], v] - matrix[u, v]
+                    insert_rev = matrix[u, seg[-1]] + matrix[seg[0], v] - matrix[u, v]
+                    insert = np.minimum(insert_fwd, insert_rev)
+
+                    pos = int(np.argmin(insert))
+                    if insert[pos] - removal_gain < -1e-9:
+                        piece = seg if insert_fwd[pos] <= insert_rev[pos] else seg[::-1]
+                        rest = rest.tolist()
+                        tour = rest[:pos+1] + piece + rest[pos+1:]
+                        # Keep the start city in front
+                        start = tour.index(0)
+                        tour = tour[start:] + tour[:start]
+                        improved = True
+                    i += 1
+            if not improved:
+                break
+        return tour
+
+    def heuristic(self, matrix: np.ndarray) -> Tuple[Optional[List[int]], float]:
+        """Nearest neighbour followed by alternating 2-opt and Or-opt"""
+        # Local search needs finite arithmetic: make missing edges very expensive
+        finite = matrix[np.isfinite(matrix)]
+        penalty = (np.abs(finite).sum() + 1.0) * len(matrix) if finite.size else 1.0
+        work = np.where(np.isfinite(matrix), matrix, penalty)
+
+        tour = self.nearest_neighbour_tour(work)
+        cost = self.route_cost(work, tour)
+        for _ in range(self.max_passes):
+            tour = self.or_opt(work, self.two_opt(work, tour))
+            new_cost = self.route_cost(work, tour)
+            if new_cost >= cost - 1e-9:
+                break
+            cost = new_cost
+
+        cost = self.route_cost(matrix, tour)
+        if np.isinf(cost):
+            return None, float('inf')
+        return tour, cost
+
+    def solve(self, distances: Dict[Tuple[str, str], float],
+              cities: List[str]) -> Tuple[Optional[List[str]], float]:
+        """
+        Best closed route over cities starting at cities[0].
+        Exact up to exact_limit cities, heuristic above that.
+        """
+        matrix = self.build_distance_matrix(distances, cities)
+        if len(cities) <= self.exact_limit:
+            tour, cost = self.held_karp(matrix)
+        else:
+            tour, cost = self.heuristic(matrix)
+
+        if tour is None:
+            return None, float('inf')
+        route = [cities[i] for i in tour] + [cities[0]]
+        return route, self.edge_sum(distances, route)
+
+    def edge_sum(self, distances: Dict[Tuple[str, str], float], route: List[str]) -> float:
+        """Route length from the original edge dict (keeps the caller's number type)"""
+        distance = 0
+        for i in range(len(route) - 1):
+            key = (route[i], route[i+1])
+            reverse_key = (route[i+1], route[i])
+            if key in distances:
+                distance += distances[key]
+            elif reverse_key in distances:
+                distance += distances[reverse_key]
+            else:
+                return float('inf')
+        return distance
@@ -5,6 +5,7 @@ Validates reasoning steps and checks for consistency
 
 from typing import Dict, List, Any, Tuple, Optional
 import re
+from parsed_problem import ParsedProblem
 
 
 class ReasoningVerifier:
@@ -68,10 +69,13 @@ class ReasoningVerifier:
         
         return True
     
-    def verify_logical_consistency(self, reasoning_trace: List[Dict]) -> bool:
+    def verify_logical_consistency(self, reasoning_trace: Optional[List[Dict]]) -> bool:
         """
         Check if reasoning steps are logically consistent
+        A None trace means tracing was off, so there is nothing to check
         """
+        if reasoning_trace is None:
+            return True
         if not reasoning_trace:
             self.add_warning("No reasoning trace provided")
             return False
@@ -88,19 +92,21 @@ class ReasoningVerifier:
         return True
     
     def verify_sequence_prediction(self, problem: Dict[str, Any], 
-                                    predicted_option: int) -> Tuple[bool, Optional[float]]:
+                                    predicted_option: int,
+                                    parsed: Optional[ParsedProblem] = None) -> Tuple[bool, Optional[float]]:
         """
         Special verification for sequence problems
         Returns (is_valid, suggested_correction)
         """
-        if 'sequence' not in problem.get('topic', '').lower():
-            return True, None
+        if parsed is None:
+            parsed = ParsedProblem(problem)
         
-        problem_text = problem['problem_statement']
+        if 'sequence' not in parsed.topic_lower:
+            return True, None
         
         # Extract sequence from problem
-        pattern = r'\b\d+\.?\d*\b'
-        numbers = [float(n) for n in re.findall(pattern, problem_text)]
+        numbers = parsed.unsigned_numbers
+        option_values = parsed.option_unsigned_values
         
         if len(numbers) < 3:
             return True, None  # Can't verify with too few numbers
@@ -113,13 +119,10 @@ class ReasoningVerifier:
             next_num = numbers[-1] + diffs[0]
             
             # Check if predicted option matches
-            opt_key = f'answer_option_{predicted_option}'
-            if opt_key in problem:
-                opt_text = problem[opt_key]
-                opt_numbers = [float(n) for n in re.findall(pattern, opt_text)]
-                if opt_numbers and abs(opt_numbers[0] - next_num) > 0.01:
-                    self.add_warning(f"Arithmetic sequence suggests {next_num}, but option says {opt_numbers[0]}")
-                    return False, next_num
+            opt_value = option_values.get(predicted_option)
+            if opt_value is not None and abs(opt_value - next_num) > 0.01:
+                self.add_warning(f"Arithmetic sequence suggests {next_num}, but option says {opt_value}")
+                return False, next_num
         
         # Geometric progression
         if all(n != 0 for n in numbers[:-1]):
@@ -128,73 +131,73 @@ class ReasoningVerifier:
                 # Geometric sequence
                 next_num = numbers[-1] * ratios[0]
                 
-                opt_key = f'answer_option_{predicted_option}'
-                if opt_key in problem:
-                    opt_text = problem[opt_key]
-                    opt_numbers = [float(n) for n in re.findall(pattern, opt_text)]
-                    if opt_numbers and abs(opt_numbers[0] - next_num) > 0.01:
-                        self.add_warning(f"Geometric sequence suggests {next_num}, but option says {opt_numbers[0]}")
-                        return False, next_num
+                opt_value = option_values.get(predicted_option)
+                if opt_value is not None and abs(opt_value - next_num) > 0.01:
+                    self.add_warning(f"Geometric sequence suggests {next_num}, but option says {opt_value}")
+                    return False, next_num
         
         return True, None
     
     def verify_spatial_reasoning(self, problem: Dict[str, Any], 
-                                  predicted_option: int) -> bool:
+                                  predicted_option: int,
+                                  parsed: Optional[ParsedProblem] = None) -> bool:
         """
         Verify spatial reasoning problems (cube painting, etc.)
         """
-        if 'spatial' not in problem.get('topic', '').lower():
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        
+        if 'spatial' not in parsed.topic_lower:
             return True
         
-        problem_text = problem['problem_statement'].lower()
+        problem_text = parsed.text_lower
         
         # Check cube painting problems
         if 'cube' in problem_text and 'paint' in problem_text:
             # Extract cube size
-            numbers = [float(n) for n in re.findall(r'\b\d+\b', problem_text)]
+            numbers = parsed.integers
             
             if numbers:
                 cube_size = int(numbers[0])
                 total_cubes = cube_size ** 3
                 
                 # Verify option doesn't exceed total cubes
-                opt_key = f'answer_option_{predicted_option}'
-                if opt_key in problem:
-                    opt_numbers = [float(n) for n in re.findall(r'\b\d+\b', problem[opt_key])]
-                    if opt_numbers and opt_numbers[0] > total_cubes:
-                        self.add_warning(f"Option value {opt_numbers[0]} exceeds total cubes {total_cubes}")
-                        return False
+                opt_value = parsed.option_integer_values.get(predicted_option)
+                if opt_value is not None and opt_value > total_cubes:
+                    self.add_warning(f"Option value {opt_value} exceeds total cubes {total_cubes}")
+                    return False
         
         return True
     
     def apply_correction_heuristics(self, problem: Dict[str, Any], 
                                      predicted_option: int,
-                                     reasoning_trace: List[Dict]) -> int:
+                                     reasoning_trace: Optional[List[Dict]],
+                                     parsed: Optional[ParsedProblem] = None) -> int:
         """
         Apply heuristics to potentially correct the prediction
         Returns corrected option or original if no correction needed
         """
         self.reset_warnings()
         
+        if parsed is None:
+            parsed = ParsedProblem(problem)
+        
         # Run all verification checks
         verifications = [
             self.verify_option_consistency(problem, predicted_option),
             self.verify_logical_consistency(reasoning_trace),
-            self.verify_spatial_reasoning(problem, predicted_option)
+            self.verify_spatial_reasoning(problem, predicted_option, parsed)
         ]
         
         # Special handling for sequences
-        seq_valid, suggested = self.verify_sequence_prediction(problem, predicted_option)
+        seq_valid, suggested = self.verify_sequence_prediction(problem, predicted_option, parsed)
         
         if not seq_valid and suggested is not None:
             # Try to find option matching the suggested value
-            for i in range(1, 6):
-                opt_key = f'answer_option_{i}'
-                if opt_key in problem:
-                    opt_numbers = [float(n) for n in re.findall(r'\b\d+\.?\d*\b', problem[opt_key])]
-                    if opt_numbers and abs(opt_numbers[0] - suggested) < 0.01:
-                        self.add_warning(f"Corrected option from {predicted_option} to {i}")
-                        return i
+            for i, opt_value in parsed.option_unsigned_values.items():
+                if opt_value is not None and abs(opt_value - suggested) < 0.01:
+                    self.add_warning(f"Corrected option from {predicted_option} to {i}")
+                    return i
         
         # If multiple verifications failed, use fallback
         failed_count = sum(1 for v in verifications if not v)